@@ -0,0 +1,116 @@
+"""
+Benchmark: Google Sheets values -> DataFrame parsing.
+
+Compares the previous row-by-row `values_to_dataframe` (per-row padded list +
+per-cell indexing through keep_idx) and `slice_values_from_header` (lowercase
+every cell of every row) against the block-based versions in
+`transform.gsheets_to_df`, on synthetic Gross & Net shaped sheets with blank
+header cells, duplicate names and ragged rows.
+
+    python scripts/bench_gsheets_parse.py
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import List
+
+import pandas as pd
+
+from weekly_summary.transform.gsheets_to_df import GSheetsParseError, slice_values_from_header, values_to_dataframe
+
+SIZES = [100, 1_000, 10_000, 100_000]
+REPEAT = 5
+HEADER = [
+    "SKU", "ASIN", "Mini SKU", "", "Selling Price", "Price Before PD", "Cost", "Cost",
+    "Freight Cost / Packaging", "FBA commision", "Pick and Pack", "", "Placement Service Fee",
+    "Notes", "Status", "Owner",
+]
+
+
+def _legacy_values_to_dataframe(values: List[List[str]]) -> pd.DataFrame:
+    header_str = ["" if h is None else str(h) for h in values[0]]
+    keep_idx = [i for i, h in enumerate(header_str) if h.strip() != ""]
+    header_kept = [header_str[i].strip() for i in keep_idx]
+
+    data_rows = []
+    for row in values[1:]:
+        row = [] if row is None else row
+        padded = list(row) + [""] * (len(header_str) - len(row))
+        data_rows.append([padded[i] for i in keep_idx])
+
+    df = pd.DataFrame(data_rows, columns=header_kept)
+    seen: dict[str, int] = {}
+    new_cols = []
+    for c in df.columns:
+        if c not in seen:
+            seen[c] = 0
+            new_cols.append(c)
+        else:
+            seen[c] += 1
+            new_cols.append(f"{c}__{seen[c]}")
+    df.columns = new_cols
+    return df
+
+
+def _legacy_slice(values: List[List[str]], required_header: str) -> List[List[str]]:
+    needle = required_header.strip().lower()
+    for idx, row in enumerate(values):
+        if not row:
+            continue
+        lowered = [str(cell).strip().lower() for cell in row if cell is not None]
+        if needle in lowered:
+            return values[idx:]
+    raise GSheetsParseError(f"Required header '{required_header}' not found.")
+
+
+def _make_values(n_rows: int, seed: int = 11) -> List[List[str]]:
+    rng = random.Random(seed)
+    rows: List[List[str]] = [HEADER]
+    for i in range(n_rows):
+        row = [
+            f"SKU-{i:06d}", f"B0{rng.randrange(10**8):08d}", f"m{i}", "",
+            f"${rng.uniform(5, 90):,.2f}", f"${rng.uniform(5, 90):,.2f}", f"{rng.uniform(1, 40):.2f}", "",
+            f"{rng.uniform(0, 5):.2f}", f"{rng.uniform(0, 9):.2f}", f"{rng.uniform(2, 6):.2f}", "", "0.35",
+            "note " * rng.randrange(0, 3), "Active", "ops",
+        ]
+        # Sheets trims trailing blanks; some rows run past the header
+        cut = rng.choice([len(row), len(row), 14, 9, 3])
+        row = row[:cut] + (["extra"] if rng.random() < 0.02 else [])
+        rows.append(row)
+    return rows
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    print(f"{'rows':>8} {'to_df legacy':>13} {'to_df block':>12} {'speedup':>8} {'slice legacy':>13} {'slice new':>10} {'speedup':>8}")
+    for n in SIZES:
+        values = _make_values(n)
+        pd.testing.assert_frame_equal(_legacy_values_to_dataframe(values), values_to_dataframe(values))
+
+        # Worst case for header search: preamble rows before a header near the end
+        preamble = values[1:] + [["Mini SKU:", "Qty per Master:"]]
+        assert _legacy_slice(preamble, "Mini SKU:") == slice_values_from_header(preamble, "Mini SKU:")
+
+        repeat = REPEAT if n < 100_000 else 2
+        t_old = _best_of(lambda: _legacy_values_to_dataframe(values), repeat)
+        t_new = _best_of(lambda: values_to_dataframe(values), repeat)
+        s_old = _best_of(lambda: _legacy_slice(preamble, "Mini SKU:"), repeat)
+        s_new = _best_of(lambda: slice_values_from_header(preamble, "Mini SKU:"), repeat)
+        print(
+            f"{n:>8} {t_old:>13.4f} {t_new:>12.4f} {t_old / t_new:>7.1f}x "
+            f"{s_old:>13.4f} {s_new:>10.4f} {s_old / s_new:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: Restock report reader.
+
+Compares the previous reader (three full decodes + a second cp1252 parse of
+all columns as strings) against the single-pass projected reader in
+`transform.restock_inventory`, on the archived raw reports.
+
+    python scripts/bench_restock_reader.py
+"""
+
+from __future__ import annotations
+
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from weekly_summary.transform.restock_inventory import (
+    _detect_delimiter,
+    normalize_restock_inventory,
+    read_restock_raw,
+)
+
+RAW_DIR = Path("data") / "raw" / "amazon" / "restock_inventory"
+REPEAT = 20
+TILES = [50, 200]  # latest report's body repeated, to approximate a full-catalogue export
+
+
+def _legacy_read(path: Path) -> pd.DataFrame:
+    raw_bytes = path.read_bytes()
+
+    decoded_text: str | None = None
+    for enc in ("utf-8-sig", "cp1252", "utf-8"):
+        try:
+            decoded_text = raw_bytes.decode(enc)
+            break
+        except UnicodeDecodeError:
+            continue
+
+    if decoded_text is None:
+        decoded_text = raw_bytes.decode("utf-8", errors="replace")
+
+    first_lines = "\n".join([ln for ln in decoded_text.splitlines() if ln.strip()][:5])
+    delim = _detect_delimiter(first_lines)
+    return pd.read_csv(path, sep=delim, dtype=str, encoding="cp1252", low_memory=False)
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _compare(path: Path, label: str, repeat: int) -> tuple[float, float]:
+    legacy = normalize_restock_inventory(_legacy_read(path))
+    single = normalize_restock_inventory(read_restock_raw(path).df)
+    pd.testing.assert_frame_equal(legacy, single)
+
+    t_legacy = _best_of(lambda: normalize_restock_inventory(_legacy_read(path)), repeat)
+    t_single = _best_of(lambda: normalize_restock_inventory(read_restock_raw(path).df), repeat)
+    print(f"{label:<46} {len(single):>6} {t_legacy:>10.4f} {t_single:>10.4f} {t_legacy / t_single:>7.1f}x")
+    return t_legacy, t_single
+
+
+def _tiled_copy(path: Path, tiles: int, out_dir: Path) -> Path:
+    header, body = path.read_bytes().split(b"\n", 1)
+    body = body.rstrip(b"\r\n") + b"\n"
+    out = out_dir / f"tiled_x{tiles}.txt"
+    out.write_bytes(header + b"\n" + body * tiles)
+    return out
+
+
+def main() -> None:
+    files = sorted(RAW_DIR.glob("*/restock_inventory_raw_*"))
+    if not files:
+        raise SystemExit(f"No archived restock reports under {RAW_DIR}")
+
+    print(f"{'file':<46} {'rows':>6} {'legacy_s':>10} {'single_s':>10} {'speedup':>8}")
+    total_legacy = total_single = 0.0
+    for path in files:
+        t_legacy, t_single = _compare(path, f"{path.parent.name}/{path.name}", REPEAT)
+        total_legacy += t_legacy
+        total_single += t_single
+    print(f"{'total':<46} {'':>6} {total_legacy:>10.4f} {total_single:>10.4f} {total_legacy / total_single:>7.1f}x")
+
+    # Rows are repeated, so normalized row counts stay the same; only parse volume grows
+    with tempfile.TemporaryDirectory() as tmp:
+        for tiles in TILES:
+            tiled = _tiled_copy(files[-1], tiles, Path(tmp))
+            _compare(tiled, f"{files[-1].parent.name} tiled x{tiles}", 3)
+
+if __name__ == "__main__":
+    main()
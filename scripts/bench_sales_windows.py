@@ -0,0 +1,128 @@
+"""
+Benchmark: SKU sales-window assembly.
+
+Compares the previous per-window chained outer merge against the
+stack-once / pivot-once assembly in `transform.sales_windows`.
+
+    python scripts/bench_sales_windows.py
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from weekly_summary.transform.loc_keys import build_loc_key_resolver
+from weekly_summary.transform.sales_windows import WINDOW_COLS, _finalize_window_columns, assemble_sku_windows
+
+SIZES = [1_000, 50_000, 500_000]  # total SKU-window rows across all 8 windows
+
+
+def _normalize_mapping(asin_sku_map: pd.DataFrame) -> pd.DataFrame:
+    m = asin_sku_map.rename(columns={"ASIN": "child_asin", "SKU": "mapped_sku"}).copy()
+    m["child_asin"] = m["child_asin"].astype(str).str.strip().str.replace(r"(?i)-loc$", "", regex=True)
+    m["mapped_sku"] = m["mapped_sku"].astype(str).str.strip().str.replace(r"(?i)-loc$", "", regex=True)
+    m = m[(m["child_asin"].str.len() > 0) & (m["mapped_sku"].str.len() > 0)]
+    return m.drop_duplicates(subset=["child_asin"], keep="first")
+
+
+def _apply_loc_output_keys(df: pd.DataFrame) -> pd.DataFrame:
+    out = df.copy()
+    out["child_asin"] = out["child_asin"].astype(str).str.strip()
+    out["mapped_sku"] = out["mapped_sku"].astype(str).str.strip()
+    out["amazon_sku"] = out["amazon_sku"].astype(str).str.strip()
+    out["Units"] = pd.to_numeric(out["Units"], errors="coerce").fillna(0.0)
+
+    loc_mask = out["amazon_sku"].str.upper().str.endswith("-LOC")
+    out["asin"] = out["child_asin"]
+    out["sku"] = out["mapped_sku"]
+    out.loc[loc_mask, "asin"] = out.loc[loc_mask, "asin"] + "-loc"
+    out.loc[loc_mask, "sku"] = out.loc[loc_mask, "sku"] + "-LOC"
+    return out[["asin", "sku", "Units"]]
+
+
+def _pivot_assemble(rows_by_window: list[pd.DataFrame], asin_sku_map: pd.DataFrame) -> pd.DataFrame:
+    resolver = build_loc_key_resolver(asin_sku_map)
+    return assemble_sku_windows(rows_by_window, resolver=resolver, window_names=WINDOW_COLS)
+
+
+def _legacy_assemble(rows_by_window: list[pd.DataFrame], asin_sku_map: pd.DataFrame) -> pd.DataFrame:
+    """The pre-pivot implementation: regex mapping, then a join + outer merge per window."""
+    mapping = _normalize_mapping(asin_sku_map)
+    out: pd.DataFrame | None = None
+
+    for name, df_rows in zip(WINDOW_COLS, rows_by_window):
+        df_rows = df_rows.copy()
+        df_rows["child_asin"] = df_rows["child_asin"].astype(str).str.strip()
+        df_rows["amazon_sku"] = df_rows["amazon_sku"].astype(str).str.strip()
+        df_rows["Units"] = pd.to_numeric(df_rows["Units"], errors="coerce").fillna(0.0)
+
+        df = df_rows.merge(mapping, on="child_asin", how="left")
+        df = df[df["mapped_sku"].notna() & (df["mapped_sku"].astype(str).str.len() > 0)].copy()
+        df_win = (
+            _apply_loc_output_keys(df)
+            .groupby(["sku", "asin"], as_index=False)["Units"]
+            .sum()
+            .rename(columns={"Units": name})
+        )
+        out = df_win if out is None else out.merge(df_win, on=["sku", "asin"], how="outer")
+
+    assert out is not None
+    return _finalize_window_columns(out)
+
+
+def _synthetic(total_rows: int, seed: int = 7) -> tuple[list[pd.DataFrame], pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    per_window = max(1, total_rows // len(WINDOW_COLS))
+    n_asins = max(10, per_window // 2)
+
+    asins = np.array([f"B{i:09d}" for i in range(n_asins)], dtype=object)
+    mapping = pd.DataFrame({"ASIN": asins, "SKU": [f"SKU-{i}" for i in range(n_asins)]})
+
+    rows_by_window = []
+    for _ in WINDOW_COLS:
+        idx = rng.integers(0, n_asins, size=per_window)
+        is_loc = rng.random(per_window) < 0.1
+        amazon_sku = np.where(is_loc, "AMZ-" + asins[idx] + "-LOC", "AMZ-" + asins[idx])
+        rows_by_window.append(
+            pd.DataFrame(
+                {
+                    "child_asin": asins[idx],
+                    "amazon_sku": amazon_sku,
+                    "Units": rng.integers(0, 50, size=per_window).astype(float),
+                }
+            )
+        )
+    return rows_by_window, mapping
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    print(f"{'rows':>9} {'legacy_s':>10} {'pivot_s':>10} {'speedup':>8}")
+    for n in SIZES:
+        rows_by_window, mapping = _synthetic(n)
+        repeat = 5 if n <= 50_000 else 2
+
+        legacy = _legacy_assemble(rows_by_window, mapping)
+        pivot = _pivot_assemble(rows_by_window, mapping)
+        pd.testing.assert_frame_equal(
+            legacy.reset_index(drop=True), pivot.reset_index(drop=True), check_dtype=False
+        )
+
+        t_legacy = _best_of(lambda: _legacy_assemble(rows_by_window, mapping), repeat)
+        t_pivot = _best_of(lambda: _pivot_assemble(rows_by_window, mapping), repeat)
+        print(f"{n:>9} {t_legacy:>10.4f} {t_pivot:>10.4f} {t_legacy / t_pivot:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
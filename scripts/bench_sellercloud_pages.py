@@ -0,0 +1,117 @@
+"""
+Benchmark: SellerCloud saved-view page processing.
+
+Compares the previous path (keep every raw item of every page, then build a
+list of row dicts, drop_duplicates and sort) against the streaming reduction in
+`extract.sellercloud.pull_inventory_by_view`, where each page is reduced to
+typed (sku, qty) buffers as it arrives and its JSON is released. Pages are
+synthetic but shaped like real view items and decoded from JSON per page, as
+they would be off the wire.
+
+    python scripts/bench_sellercloud_pages.py
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import time
+import tracemalloc
+from typing import Callable, Iterator
+
+import pandas as pd
+
+from weekly_summary.extract.sellercloud.pull_inventory_by_view import SkuQtyAccumulator, _item_sku, _reduce_page
+
+PAGE_SIZE = 50
+VIEW_SIZES = [5_000, 25_000, 100_000]
+REPEAT = 3
+
+
+def _make_pages(n_items: int, seed: int = 7) -> list[bytes]:
+    """Encoded pages; ~1/3 of rows repeat a SKU (channel variants), ~1/5 are zero qty."""
+    rng = random.Random(seed)
+    n_skus = max(1, n_items * 2 // 3)
+    items = []
+    for i in range(n_items):
+        sku = f"WS-{rng.randrange(n_skus):06d}"
+        items.append(
+            {
+                "ID": f"{sku}-{i}",
+                "ShadowOf": sku if rng.random() < 0.8 else None,
+                "ManufacturerSKU": sku,
+                "ProductName": f"Product {sku} " + "x" * rng.randrange(20, 80),
+                "InventoryAvailableQty": 0 if rng.random() < 0.2 else rng.randrange(1, 500),
+                "PhysicalQty": rng.randrange(0, 500),
+                "CompanyID": 1,
+                "Channels": [{"Channel": "Amazon", "Enabled": True}],
+            }
+        )
+    return [
+        json.dumps({"Items": items[i : i + PAGE_SIZE], "TotalResults": n_items}).encode("utf-8")
+        for i in range(0, n_items, PAGE_SIZE)
+    ]
+
+
+def _legacy(pages: list[bytes]) -> pd.DataFrame:
+    all_items = []
+    for raw in pages:
+        all_items.extend(json.loads(raw)["Items"])
+
+    rows = []
+    for item in all_items:
+        qty = int(item.get("InventoryAvailableQty") or 0)
+        if qty <= 0:
+            continue
+        sku = _item_sku(item)
+        if not sku:
+            continue
+        rows.append({"SKU": sku, "Welles190Qty": qty})
+
+    df = pd.DataFrame(rows, columns=["SKU", "Welles190Qty"])
+    df = df.drop_duplicates(subset=["SKU"], keep="first")
+    return df.sort_values("SKU").reset_index(drop=True)
+
+
+def _streaming(pages: list[bytes]) -> pd.DataFrame:
+    acc = SkuQtyAccumulator()
+    for raw in pages:
+        items = json.loads(raw)["Items"]
+        acc.add(_reduce_page(items), len(items))
+    return acc.to_frame()
+
+
+def _measure(fn: Callable[[list[bytes]], pd.DataFrame], pages: list[bytes]) -> tuple[float, float]:
+    """(best seconds, peak traced MiB)."""
+    best = float("inf")
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        fn(pages)
+        best = min(best, time.perf_counter() - t0)
+
+    tracemalloc.start()
+    fn(pages)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / (1024 * 1024)
+
+
+def _sizes() -> Iterator[tuple[int, list[bytes]]]:
+    for n in VIEW_SIZES:
+        yield n, _make_pages(n)
+
+
+def main() -> None:
+    print(f"{'items':>8} {'legacy it/s':>12} {'stream it/s':>12} {'speedup':>8} {'legacy MiB':>11} {'stream MiB':>11}")
+    for n, pages in _sizes():
+        pd.testing.assert_frame_equal(_legacy(pages), _streaming(pages))
+        t_legacy, m_legacy = _measure(_legacy, pages)
+        t_stream, m_stream = _measure(_streaming, pages)
+        print(
+            f"{n:>8} {n / t_legacy:>12,.0f} {n / t_stream:>12,.0f} {t_legacy / t_stream:>7.1f}x "
+            f"{m_legacy:>11.1f} {m_stream:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,9 @@
-import os
-
 from dotenv import load_dotenv
 
-from weekly_summary.extract.google_sheets import build_sheets_service, read_range
+from weekly_summary.extract.google_sheets import read_range_chunked
 from weekly_summary.transform.gsheets_to_df import values_to_dataframe
 from weekly_summary.transform.gross_net_clean import clean_gross_net_df
-from weekly_summary.transform.gross_net_select import select_gross_net_mapping
+from weekly_summary.transform.gross_net_select import REQUIRED_COLS, select_gross_net_mapping
 
 
 SPREADSHEET_ID = "1lJvclI4hgSYRpBTmVMJjQLfKmLzD7xCDqD_BuzYEt-0"
@@ -15,17 +13,16 @@ RANGE_NAME = "AMZ US!A1:P"  # adjust later if ASIN/SKU are outside A:P
 def main() -> None:
     load_dotenv()
 
-    sa_path = os.environ["GOOGLE_SERVICE_ACCOUNT_JSON"]
-    service = build_sheets_service(sa_path)
-
-    values = read_range(service, SPREADSHEET_ID, RANGE_NAME)
+    # Open-ended range: fetched in parallel row blocks, each retried on its own
+    values = read_range_chunked(SPREADSHEET_ID, RANGE_NAME)
 
     # Drop leading empty rows (sometimes Sheets returns blank header padding)
     while values and (not values[0] or all(str(x).strip() == "" for x in values[0])):
         values = values[1:]
 
     df_raw = values_to_dataframe(values)
-    df_clean = clean_gross_net_df(df_raw)
+    # Only the mapping columns are cleaned
+    df_clean = clean_gross_net_df(df_raw, columns=REQUIRED_COLS)
 
     mapping = select_gross_net_mapping(df_clean).copy()
 
@@ -1,28 +1,20 @@
-import os
 from dotenv import load_dotenv
 
-from weekly_summary.extract.google_sheets import build_sheets_service, read_range
+from weekly_summary.extract.google_sheets import read_projected_ranges
+from weekly_summary.helpers.asin_sku_mapping import MASTER_CARTON_HEADER, MASTER_CARTON_RANGE
 from weekly_summary.transform.gsheets_to_df import values_to_dataframe, slice_values_from_header
 
 
 
 def main() -> None:
     load_dotenv()
-    sa_path = os.environ["GOOGLE_SERVICE_ACCOUNT_JSON"]
 
-    # Weights & Dims spreadsheet
-    spreadsheet_id = "1J4hIViDyNEIBmZsrR1yGoK-a70Mhh0kRtUcnJZ7qEck"
-
-    # Master Carton tab:
+    # Weights & Dims spreadsheet, Master Carton tab:
     # B = SKU, I = Qty per carton
-    # We'll pull a wider range so we can reliably select columns by name.
-    range_name = "Master Carton!A1:Z60"
-
-
-    service = build_sheets_service(sa_path)
-    values = read_range(service, spreadsheet_id, range_name)
+    # Columns are located by header name, then only those two are fetched.
+    values = read_projected_ranges([MASTER_CARTON_RANGE])[MASTER_CARTON_RANGE]
 
-    values = slice_values_from_header(values, "Mini SKU:")
+    values = slice_values_from_header(values, MASTER_CARTON_HEADER)
 
     print("Header row: ", values[0])
 
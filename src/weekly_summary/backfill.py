@@ -0,0 +1,327 @@
+"""
+Re-parse the raw report archive under data/raw/amazon into the cache/history stores.
+
+    python -m weekly_summary.backfill [--workers N] [--kinds restock,sales_traffic] [--force]
+
+Parsing runs in a process pool (workers are recycled every --max-tasks-per-child
+files so memory stays bounded). All writes happen in this process, in archive
+order, so re-runs are idempotent and files whose sha256 is already recorded are
+skipped before any parsing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+from weekly_summary.cache.restock_snapshots import ingested_file_hashes, put_restock_snapshot
+from weekly_summary.cache.sqlite_cache import (
+    CacheKey,
+    _iso_to_dt,
+    get_cache_status,
+    known_payload_hashes,
+    put_cached_parsed,
+)
+from weekly_summary.cache.ttl_policy import ttl_seconds_for_range
+from weekly_summary.transform.restock_history import (
+    file_sha256,
+    find_restock_raw_files,
+    parse_restock_snapshot,
+    snapshot_date_for,
+)
+
+RAW_ROOT = Path("data") / "raw" / "amazon"
+DEFAULT_DB_PATH = Path("data") / "cache" / "spapi_reports.sqlite"
+SALES_TRAFFIC_DIRS = ("sales_traffic", "sales_traffic_daily")
+SALES_TRAFFIC_REPORT_TYPE = "GET_SALES_AND_TRAFFIC_REPORT"
+
+KINDS = ("restock", "sales_traffic")
+
+
+@dataclass(frozen=True)
+class BackfillJob:
+    kind: str  # restock | sales_traffic
+    path: Path
+    sha256: str
+    size_bytes: int
+
+
+@dataclass(frozen=True)
+class ParsedDocument:
+    job: BackfillJob
+    rows: Any  # restock: DataFrame of normalized rows; sales_traffic: list of row dicts
+    key: Optional[CacheKey] = None  # sales_traffic only
+    error: Optional[str] = None
+
+
+@dataclass
+class BackfillStats:
+    discovered: int = 0
+    skipped: int = 0
+    written: int = 0
+    failed: int = 0
+    rows: int = 0
+    bytes_parsed: int = 0
+    elapsed_s: float = 0.0
+
+    def summary(self) -> str:
+        secs = max(self.elapsed_s, 1e-9)
+        return (
+            f"{self.written} written, {self.skipped} skipped, {self.failed} failed "
+            f"of {self.discovered} files in {self.elapsed_s:.2f}s | "
+            f"{self.written / secs:.1f} files/s, {self.rows / secs:,.0f} rows/s, "
+            f"{self.bytes_parsed / secs / 1e6:.2f} MB/s"
+        )
+
+
+# --------------------------------------------------------------------------------------
+# Discovery (parent process)
+# --------------------------------------------------------------------------------------
+
+
+def find_sales_traffic_raw_files(raw_root: Path = RAW_ROOT) -> list[Path]:
+    out: list[Path] = []
+    for d in SALES_TRAFFIC_DIRS:
+        out.extend(p for p in (raw_root / d).glob("*/*") if p.is_file())
+    return sorted(out)
+
+
+def discover_jobs(
+    db_path: Path,
+    *,
+    raw_root: Path = RAW_ROOT,
+    kinds: tuple[str, ...] = KINDS,
+    force: bool = False,
+) -> tuple[list[BackfillJob], int]:
+    """
+    Returns (jobs to parse, number of files skipped because their hash is already stored).
+    Duplicate files (same hash) inside the archive are only parsed once.
+    """
+    candidates: list[tuple[str, Path]] = []
+    known: set[str] = set()
+
+    if "restock" in kinds:
+        candidates.extend(("restock", p) for p in find_restock_raw_files(raw_root / "restock_inventory"))
+        if not force:
+            known |= ingested_file_hashes(db_path)
+    if "sales_traffic" in kinds:
+        candidates.extend(("sales_traffic", p) for p in find_sales_traffic_raw_files(raw_root))
+        if not force:
+            known |= known_payload_hashes(db_path, report_type=SALES_TRAFFIC_REPORT_TYPE)
+
+    jobs: list[BackfillJob] = []
+    skipped = 0
+    seen: set[str] = set()
+    for kind, path in candidates:
+        sha = file_sha256(path)
+        if sha in known or sha in seen:
+            skipped += 1
+            continue
+        seen.add(sha)
+        jobs.append(BackfillJob(kind=kind, path=path, sha256=sha, size_bytes=path.stat().st_size))
+
+    return jobs, skipped
+
+
+# --------------------------------------------------------------------------------------
+# Parsing (worker processes) — must stay top-level / picklable
+# --------------------------------------------------------------------------------------
+
+
+def _sales_traffic_key(spec: dict[str, Any]) -> CacheKey:
+    options = spec.get("reportOptions") or {}
+    marketplaces = spec.get("marketplaceIds") or []
+    if not marketplaces or "asinGranularity" not in options:
+        raise ValueError(f"reportSpecification missing marketplaceIds/asinGranularity: {spec}")
+
+    return CacheKey(
+        report_type=spec.get("reportType") or SALES_TRAFFIC_REPORT_TYPE,
+        marketplace_id=marketplaces[0],
+        data_start_date=str(spec["dataStartTime"])[:10],
+        data_end_date=str(spec["dataEndTime"])[:10],
+        report_options_json=json.dumps(options, separators=(",", ":"), sort_keys=True),
+    )
+
+
+def _parse_sales_traffic(path: Path) -> tuple[CacheKey, list[dict[str, Any]]]:
+    # Imported here so restock-only runs don't pay for the SP-API client import
+    from weekly_summary.extract.amazon.sales_traffic_by_window import _parse_rows_by_child_asin_and_sku
+    from weekly_summary.extract.amazon.sales_traffic_units import _parse_units_rows
+
+    payload = json.loads(path.read_bytes().decode("utf-8", errors="replace").strip())
+    key = _sales_traffic_key(payload.get("reportSpecification") or {})
+
+    # Same parser (and therefore the same cached row shape) as the live pull for that granularity
+    if json.loads(key.report_options_json)["asinGranularity"] == "SKU":
+        df = _parse_rows_by_child_asin_and_sku(payload)
+    else:
+        df = _parse_units_rows(payload)
+
+    return key, df.to_dict(orient="records")
+
+
+def parse_job(job: BackfillJob) -> ParsedDocument:
+    try:
+        if job.kind == "restock":
+            return ParsedDocument(job=job, rows=parse_restock_snapshot(job.path))
+        if job.kind == "sales_traffic":
+            key, rows = _parse_sales_traffic(job.path)
+            return ParsedDocument(job=job, rows=rows, key=key)
+        raise ValueError(f"Unknown backfill kind: {job.kind}")
+    except Exception as e:
+        return ParsedDocument(job=job, rows=None, error=f"{type(e).__name__}: {e}")
+
+
+# --------------------------------------------------------------------------------------
+# Writing (parent process)
+# --------------------------------------------------------------------------------------
+
+
+def _mtime_utc_iso(path: Path) -> str:
+    ts = datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
+    return ts.replace(microsecond=0).isoformat()
+
+
+def _ttl_seconds_from_pull(key: CacheKey, pulled_at: datetime) -> Optional[int]:
+    """
+    TTL (from now) for a document pulled at pulled_at: finality is decided by how
+    old the data was when it was pulled, not by how old it is today. An archived
+    pull of unsettled data gets its recheck TTL counted from the pull, so it is
+    usually expired on arrival.
+    """
+    ttl = ttl_seconds_for_range(
+        key.report_type,
+        start_date=date.fromisoformat(key.data_start_date),
+        end_date=date.fromisoformat(key.data_end_date),
+        today=pulled_at.date(),
+    )
+    if ttl is None:
+        return None
+    return int((pulled_at - datetime.now(timezone.utc)).total_seconds()) + ttl
+
+
+def write_parsed(db_path: Path, doc: ParsedDocument) -> Optional[int]:
+    """Store a parsed document; returns rows written, or None if the cache already has a newer pull."""
+    job = doc.job
+
+    if job.kind == "restock":
+        return put_restock_snapshot(
+            db_path,
+            snapshot_date=snapshot_date_for(job.path),
+            rows=doc.rows,
+            file_sha256=job.sha256,
+            source_path=job.path.as_posix(),
+        )
+
+    key = doc.key
+    assert key is not None
+    # The archive file's mtime is the best record of when it was pulled
+    pulled_at_utc = _mtime_utc_iso(job.path)
+    pulled_at = datetime.fromisoformat(pulled_at_utc)
+
+    existing = get_cache_status(db_path, key=key)
+    if existing is not None and existing["status"] == "OK" and existing["pulled_at_utc"]:
+        if _iso_to_dt(existing["pulled_at_utc"]) > pulled_at:
+            return None
+
+    put_cached_parsed(
+        db_path,
+        key=key,
+        parsed_obj={"rows": doc.rows},
+        ttl_seconds=_ttl_seconds_from_pull(key, pulled_at),
+        pulled_at_utc=pulled_at_utc,
+        payload_sha256=job.sha256,
+        row_count=len(doc.rows),
+        # An archived document is not a re-pull; logging it would skew the revision ages
+        record_revision=False,
+    )
+    return len(doc.rows)
+
+
+def run_backfill(
+    *,
+    db_path: Path = DEFAULT_DB_PATH,
+    raw_root: Path = RAW_ROOT,
+    kinds: tuple[str, ...] = KINDS,
+    workers: Optional[int] = None,
+    max_tasks_per_child: int = 25,
+    force: bool = False,
+) -> BackfillStats:
+    t0 = time.perf_counter()
+    jobs, skipped = discover_jobs(db_path, raw_root=raw_root, kinds=kinds, force=force)
+    stats = BackfillStats(discovered=len(jobs) + skipped, skipped=skipped)
+
+    if not jobs:
+        stats.elapsed_s = time.perf_counter() - t0
+        print(f"Backfill: nothing to do. {stats.summary()}")
+        return stats
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    print(f"Backfill: parsing {len(jobs)} file(s) with {workers} worker(s)...")
+
+    def _consume(doc: ParsedDocument) -> None:
+        if doc.error is not None:
+            stats.failed += 1
+            print(f"  FAILED {doc.job.path}: {doc.error}")
+            return
+        rows = write_parsed(db_path, doc)
+        if rows is None:
+            stats.skipped += 1
+            print(f"  SKIPPED {doc.job.path}: the cache holds a newer pull of the same key")
+            return
+        stats.rows += rows
+        stats.written += 1
+        stats.bytes_parsed += doc.job.size_bytes
+
+    # Bounded in-flight window, consumed in submission order: parsed frames never pile up
+    # in the parent, and a later file for the same date/key always lands last.
+    max_in_flight = workers * 2
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=max_tasks_per_child) as pool:
+        pending: deque[Future[ParsedDocument]] = deque()
+        for job in jobs:
+            pending.append(pool.submit(parse_job, job))
+            if len(pending) >= max_in_flight:
+                _consume(pending.popleft().result())
+        while pending:
+            _consume(pending.popleft().result())
+
+    stats.elapsed_s = time.perf_counter() - t0
+    print(f"Backfill: {stats.summary()}")
+    return stats
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Re-parse archived raw reports into the cache/history stores.")
+    parser.add_argument("--db-path", type=Path, default=DEFAULT_DB_PATH)
+    parser.add_argument("--raw-root", type=Path, default=RAW_ROOT)
+    parser.add_argument("--kinds", default=",".join(KINDS), help=f"comma-separated subset of {KINDS}")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-tasks-per-child", type=int, default=25)
+    parser.add_argument("--force", action="store_true", help="re-parse files even if their hash is recorded")
+    args = parser.parse_args(argv)
+
+    kinds = tuple(k.strip() for k in args.kinds.split(",") if k.strip())
+    unknown = [k for k in kinds if k not in KINDS]
+    if unknown:
+        parser.error(f"unknown kinds: {unknown}")
+
+    run_backfill(
+        db_path=args.db_path,
+        raw_root=args.raw_root,
+        kinds=kinds,
+        workers=args.workers,
+        max_tasks_per_child=args.max_tasks_per_child,
+        force=args.force,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence
+
+import pandas as pd
+
+from weekly_summary.cache.sheets_cache import _frame_from_json, _frame_to_json
+from weekly_summary.cache.sqlite_cache import _connect, _utc_now_iso
+
+DEFAULT_ARTIFACTS_PATH = Path("data") / "cache" / "pipeline_artifacts.sqlite"
+
+
+@dataclass(frozen=True)
+class Artifact:
+    stage: str
+    key_sha256: str       # what the frame was computed from (stage, version, fingerprint, inputs)
+    content_sha256: str   # what the frame is; downstream keys are built from this
+    df: pd.DataFrame
+    from_store: bool = False
+    created_at_utc: Optional[str] = None
+
+
+def _sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def stage_key(stage: str, *, version: str, fingerprint: Optional[str], input_shas: Sequence[str]) -> str:
+    """Key of a stage run: same stage code, same source fingerprint, same input contents."""
+    return _sha256_text(json.dumps([stage, version, fingerprint, list(input_shas)], separators=(",", ":")))
+
+
+def _encode(df: pd.DataFrame) -> tuple[str, str]:
+    frame_json = _frame_to_json(df)
+    attrs_json = json.dumps(df.attrs, sort_keys=True, default=str)
+    return frame_json, attrs_json
+
+
+def frame_sha256(df: pd.DataFrame) -> str:
+    """Content hash of a frame (columns, dtypes, values and attrs)."""
+    frame_json, attrs_json = _encode(df)
+    return _sha256_text(frame_json + "\n" + attrs_json)
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def init_artifact_db(db_path: Path) -> None:
+    with _connect(db_path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pipeline_artifacts (
+              stage TEXT NOT NULL,
+              key_sha256 TEXT NOT NULL,
+              content_sha256 TEXT NOT NULL,
+              frame_json TEXT NOT NULL,
+              attrs_json TEXT NOT NULL,
+              created_at_utc TEXT NOT NULL,
+              PRIMARY KEY (stage, key_sha256)
+            )
+            """
+        )
+        conn.commit()
+
+
+def get_artifact(db_path: Path, *, stage: str, key_sha256: str) -> Optional[Artifact]:
+    init_artifact_db(db_path)
+    with _connect(db_path) as conn:
+        row = conn.execute(
+            """
+            SELECT content_sha256, frame_json, attrs_json, created_at_utc
+            FROM pipeline_artifacts
+            WHERE stage = ? AND key_sha256 = ?
+            """,
+            (stage, key_sha256),
+        ).fetchone()
+
+    if not row:
+        return None
+
+    df = _frame_from_json(row["frame_json"])
+    df.attrs.update(json.loads(row["attrs_json"]))
+    return Artifact(
+        stage=stage,
+        key_sha256=key_sha256,
+        content_sha256=row["content_sha256"],
+        df=df,
+        from_store=True,
+        created_at_utc=row["created_at_utc"],
+    )
+
+
+def put_artifact(db_path: Path, *, stage: str, key_sha256: str, df: pd.DataFrame) -> Artifact:
+    init_artifact_db(db_path)
+    frame_json, attrs_json = _encode(df)
+    content_sha = _sha256_text(frame_json + "\n" + attrs_json)
+    created_at = _utc_now_iso()
+    with _connect(db_path) as conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO pipeline_artifacts (
+              stage, key_sha256, content_sha256, frame_json, attrs_json, created_at_utc
+            ) VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (stage, key_sha256, content_sha, frame_json, attrs_json, created_at),
+        )
+        conn.commit()
+
+    return Artifact(stage=stage, key_sha256=key_sha256, content_sha256=content_sha, df=df, created_at_utc=created_at)
+
+
+def prune_artifacts(db_path: Path, *, keep_since_utc: str) -> int:
+    """Delete artifacts created before keep_since_utc (ISO); returns rows removed."""
+    init_artifact_db(db_path)
+    with _connect(db_path) as conn:
+        cur = conn.execute("DELETE FROM pipeline_artifacts WHERE created_at_utc < ?", (keep_since_utc,))
+        conn.commit()
+        return cur.rowcount
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from weekly_summary.cache.sqlite_cache import CacheKey, _connect, _utc_now_iso
+
+# PENDING -> REQUESTED (report_id known) -> DONE | FAILED
+STATUSES = ("PENDING", "REQUESTED", "DONE", "FAILED")
+
+
+@dataclass(frozen=True)
+class BackfillCheckpoint:
+    key: CacheKey
+    status: str
+    attempts: int = 0
+    report_id: Optional[str] = None
+    document_id: Optional[str] = None
+    row_count: Optional[int] = None
+    last_error: Optional[str] = None
+    updated_at_utc: Optional[str] = None
+
+
+def init_backfill_checkpoint_db(db_path: Path) -> None:
+    with _connect(db_path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS spapi_backfill_jobs (
+              report_type TEXT NOT NULL,
+              marketplace_id TEXT NOT NULL,
+              data_start_date TEXT NOT NULL,
+              data_end_date TEXT NOT NULL,
+              report_options_json TEXT NOT NULL,
+
+              status TEXT NOT NULL,
+              attempts INTEGER NOT NULL DEFAULT 0,
+              report_id TEXT,
+              document_id TEXT,
+              row_count INTEGER,
+              last_error TEXT,
+              updated_at_utc TEXT NOT NULL,
+
+              PRIMARY KEY (report_type, marketplace_id, data_start_date, data_end_date, report_options_json)
+            )
+            """
+        )
+        conn.commit()
+
+
+def get_checkpoints(db_path: Path, *, report_type: str, marketplace_id: str) -> dict[CacheKey, BackfillCheckpoint]:
+    init_backfill_checkpoint_db(db_path)
+    with _connect(db_path) as conn:
+        rows = conn.execute(
+            """
+            SELECT * FROM spapi_backfill_jobs
+            WHERE report_type = ? AND marketplace_id = ?
+            """,
+            (report_type, marketplace_id),
+        ).fetchall()
+
+    out: dict[CacheKey, BackfillCheckpoint] = {}
+    for r in rows:
+        key = CacheKey(
+            report_type=r["report_type"],
+            marketplace_id=r["marketplace_id"],
+            data_start_date=r["data_start_date"],
+            data_end_date=r["data_end_date"],
+            report_options_json=r["report_options_json"],
+        )
+        out[key] = BackfillCheckpoint(
+            key=key,
+            status=r["status"],
+            attempts=r["attempts"],
+            report_id=r["report_id"],
+            document_id=r["document_id"],
+            row_count=r["row_count"],
+            last_error=r["last_error"],
+            updated_at_utc=r["updated_at_utc"],
+        )
+    return out
+
+
+def put_checkpoint(db_path: Path, *, checkpoint: BackfillCheckpoint) -> None:
+    if checkpoint.status not in STATUSES:
+        raise ValueError(f"Unknown backfill status: {checkpoint.status}")
+
+    init_backfill_checkpoint_db(db_path)
+    key = checkpoint.key
+    with _connect(db_path) as conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO spapi_backfill_jobs (
+              report_type, marketplace_id, data_start_date, data_end_date, report_options_json,
+              status, attempts, report_id, document_id, row_count, last_error, updated_at_utc
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                key.report_type,
+                key.marketplace_id,
+                key.data_start_date,
+                key.data_end_date,
+                key.report_options_json,
+                checkpoint.status,
+                checkpoint.attempts,
+                checkpoint.report_id,
+                checkpoint.document_id,
+                checkpoint.row_count,
+                (checkpoint.last_error or "")[:2000] or None,
+                _utc_now_iso(),
+            ),
+        )
+        conn.commit()
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from weekly_summary.cache.sqlite_cache import _connect, _utc_now_iso
+
+# Stored column -> normalized Restock column (transform.restock_inventory.RESTOCK_QTY_COLS)
+SNAPSHOT_QTY_COLS = {
+    "available": "inventory_available",
+    "fc_transfer": "fc_transfer",
+    "fc_processing": "fc_processing",
+    "inbound": "inbound",
+    "working": "inbound_working",
+    "shipped": "inbound_shipped",
+    "receiving": "inbound_receiving",
+}
+
+
+@dataclass(frozen=True)
+class IngestedRestockFile:
+    file_sha256: str
+    snapshot_date: str  # YYYY-MM-DD
+    source_path: str
+    row_count: int
+    ingested_at_utc: Optional[str] = None
+
+
+def init_restock_snapshot_db(db_path: Path) -> None:
+    qty_defs = ",\n              ".join(f"{c} INTEGER NOT NULL" for c in SNAPSHOT_QTY_COLS)
+    with _connect(db_path) as conn:
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS restock_snapshots (
+              snapshot_date TEXT NOT NULL,
+              asin TEXT NOT NULL,
+              merchant_sku TEXT NOT NULL,
+              {qty_defs},
+              file_sha256 TEXT NOT NULL,
+              PRIMARY KEY (snapshot_date, asin, merchant_sku)
+            ) WITHOUT ROWID
+            """
+        )
+        # PK serves date and date+asin lookups; this one serves per-ASIN history
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_restock_snapshots_asin_date
+            ON restock_snapshots (asin, snapshot_date)
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS restock_ingested_files (
+              file_sha256 TEXT NOT NULL PRIMARY KEY,
+              snapshot_date TEXT NOT NULL,
+              source_path TEXT NOT NULL,
+              row_count INTEGER NOT NULL,
+              ingested_at_utc TEXT NOT NULL
+            )
+            """
+        )
+        conn.commit()
+
+
+def ingested_file_hashes(db_path: Path) -> set[str]:
+    init_restock_snapshot_db(db_path)
+    with _connect(db_path) as conn:
+        rows = conn.execute("SELECT file_sha256 FROM restock_ingested_files").fetchall()
+    return {r["file_sha256"] for r in rows}
+
+
+def put_restock_snapshot(
+    db_path: Path,
+    *,
+    snapshot_date: str,
+    rows: pd.DataFrame,
+    file_sha256: str,
+    source_path: str,
+) -> int:
+    """
+    Replace the snapshot for snapshot_date with `rows` (normalized Restock rows:
+    asin, merchant_sku + RESTOCK_QTY_COLS) and record the file as ingested, in one
+    transaction. Duplicate (asin, merchant_sku) lines are summed.
+
+    Returns the number of snapshot rows written.
+    """
+    init_restock_snapshot_db(db_path)
+
+    qty_src = list(SNAPSHOT_QTY_COLS.values())
+    df = rows.groupby(["asin", "merchant_sku"], as_index=False, sort=False)[qty_src].sum()
+
+    payload = [
+        (snapshot_date, asin, sku, *map(int, qty), file_sha256)
+        for asin, sku, *qty in df[["asin", "merchant_sku", *qty_src]].itertuples(index=False, name=None)
+    ]
+
+    cols = ["snapshot_date", "asin", "merchant_sku", *SNAPSHOT_QTY_COLS, "file_sha256"]
+    placeholders = ", ".join("?" for _ in cols)
+
+    with _connect(db_path) as conn:
+        conn.execute("DELETE FROM restock_snapshots WHERE snapshot_date = ?", (snapshot_date,))
+        conn.executemany(
+            f"INSERT INTO restock_snapshots ({', '.join(cols)}) VALUES ({placeholders})",
+            payload,
+        )
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO restock_ingested_files (
+              file_sha256, snapshot_date, source_path, row_count, ingested_at_utc
+            ) VALUES (?, ?, ?, ?, ?)
+            """,
+            (file_sha256, snapshot_date, source_path, len(payload), _utc_now_iso()),
+        )
+        conn.commit()
+
+    return len(payload)
+
+
+def list_ingested_files(db_path: Path) -> list[IngestedRestockFile]:
+    init_restock_snapshot_db(db_path)
+    with _connect(db_path) as conn:
+        rows = conn.execute(
+            """
+            SELECT file_sha256, snapshot_date, source_path, row_count, ingested_at_utc
+            FROM restock_ingested_files
+            ORDER BY snapshot_date, ingested_at_utc
+            """
+        ).fetchall()
+    return [IngestedRestockFile(**dict(r)) for r in rows]
+
+
+def load_restock_snapshots(
+    db_path: Path,
+    *,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    asins: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """
+    Snapshot rows (snapshot_date, asin, merchant_sku + SNAPSHOT_QTY_COLS) filtered by
+    inclusive date range and/or ASINs, ordered by date, asin, merchant_sku.
+    """
+    init_restock_snapshot_db(db_path)
+
+    where: list[str] = []
+    params: list[str] = []
+    if start_date is not None:
+        where.append("snapshot_date >= ?")
+        params.append(start_date)
+    if end_date is not None:
+        where.append("snapshot_date <= ?")
+        params.append(end_date)
+    if asins is not None:
+        asin_list = list(asins)
+        if not asin_list:
+            return pd.DataFrame(columns=["snapshot_date", "asin", "merchant_sku", *SNAPSHOT_QTY_COLS])
+        where.append(f"asin IN ({', '.join('?' for _ in asin_list)})")
+        params.extend(asin_list)
+
+    sql = f"SELECT snapshot_date, asin, merchant_sku, {', '.join(SNAPSHOT_QTY_COLS)} FROM restock_snapshots"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY snapshot_date, asin, merchant_sku"
+
+    with _connect(db_path) as conn:
+        return pd.read_sql_query(sql, conn, params=params)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from weekly_summary.cache.sqlite_cache import _connect, _iso_to_dt, _utc_now
+
+# Column layout of a cached view result (same as pull_190_welles_inventory)
+VIEW_COLUMNS = ("SKU", "Welles190Qty")
+
+
+@dataclass(frozen=True)
+class ViewCacheKey:
+    server_id: str
+    view_id: int
+    warehouse_id: str = ""  # "" when the warehouse is fixed by the saved view itself
+
+
+@dataclass(frozen=True)
+class ViewCacheInfo:
+    """Freshness metadata attached to a view result as df.attrs["sellercloud_cache"]."""
+
+    from_cache: bool
+    fetched_at_utc: str
+    age_s: int
+    ttl_s: int
+    row_count: int
+
+
+def init_view_cache_db(db_path: Path) -> None:
+    with _connect(db_path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sellercloud_view_cache (
+              server_id TEXT NOT NULL,
+              view_id INTEGER NOT NULL,
+              warehouse_id TEXT NOT NULL,
+              fetched_at_utc TEXT NOT NULL,
+              row_count INTEGER NOT NULL,
+              payload_json TEXT NOT NULL,   -- {"SKU": [...], "Welles190Qty": [...]}
+              PRIMARY KEY (server_id, view_id, warehouse_id)
+            )
+            """
+        )
+        conn.commit()
+
+
+def get_cached_view(
+    db_path: Path,
+    *,
+    key: ViewCacheKey,
+    ttl_s: int,
+) -> Optional[pd.DataFrame]:
+    """
+    Cached view result if it is younger than ttl_s, else None.
+
+    The returned frame carries ViewCacheInfo (as a dict) in df.attrs["sellercloud_cache"].
+    """
+    if ttl_s <= 0:
+        return None
+
+    init_view_cache_db(db_path)
+    with _connect(db_path) as conn:
+        row = conn.execute(
+            """
+            SELECT fetched_at_utc, row_count, payload_json
+            FROM sellercloud_view_cache
+            WHERE server_id = ? AND view_id = ? AND warehouse_id = ?
+            """,
+            (key.server_id, key.view_id, key.warehouse_id),
+        ).fetchone()
+
+    if not row:
+        return None
+
+    age = _utc_now() - _iso_to_dt(row["fetched_at_utc"])
+    if age >= timedelta(seconds=ttl_s) or age < timedelta(0):
+        return None
+
+    payload = json.loads(row["payload_json"])
+    df = pd.DataFrame({col: payload[col] for col in VIEW_COLUMNS}, columns=list(VIEW_COLUMNS))
+    df["Welles190Qty"] = df["Welles190Qty"].astype("int64")
+    info = ViewCacheInfo(
+        from_cache=True,
+        fetched_at_utc=row["fetched_at_utc"],
+        age_s=int(age.total_seconds()),
+        ttl_s=int(ttl_s),
+        row_count=int(row["row_count"]),
+    )
+    df.attrs["sellercloud_cache"] = asdict(info)
+    return df
+
+
+def put_cached_view(db_path: Path, *, key: ViewCacheKey, df: pd.DataFrame, ttl_s: int) -> pd.DataFrame:
+    """Store a freshly fetched view result; returns df with its freshness metadata attached."""
+    init_view_cache_db(db_path)
+    fetched_at = _utc_now().isoformat()
+    payload = {
+        "SKU": df["SKU"].astype(str).tolist(),
+        "Welles190Qty": [int(q) for q in df["Welles190Qty"]],
+    }
+    with _connect(db_path) as conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO sellercloud_view_cache (
+              server_id, view_id, warehouse_id, fetched_at_utc, row_count, payload_json
+            ) VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (key.server_id, key.view_id, key.warehouse_id, fetched_at, len(df), json.dumps(payload)),
+        )
+        conn.commit()
+
+    info = ViewCacheInfo(
+        from_cache=False,
+        fetched_at_utc=fetched_at,
+        age_s=0,
+        ttl_s=int(ttl_s),
+        row_count=len(df),
+    )
+    df.attrs["sellercloud_cache"] = asdict(info)
+    return df
+
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import pandas as pd
+
+from weekly_summary.cache.sqlite_cache import _connect, _utc_now_iso
+
+DEFAULT_SHEETS_CACHE_PATH = Path("data") / "cache" / "gsheets.sqlite"
+
+
+@dataclass(frozen=True)
+class SheetFrameKey:
+    spreadsheet_id: str
+    range_name: str
+    kind: str  # which parsed artifact, e.g. "asin_sku" or "master_carton"
+    parser_version: str = "1"  # bump when the parse for `kind` changes; a stored mismatch is a miss
+
+
+@dataclass(frozen=True)
+class CachedSheetFrame:
+    key: SheetFrameKey
+    modified_time: Optional[str]  # Drive modifiedTime of the spreadsheet when read
+    content_sha256: str           # hash of the raw values the frame was parsed from
+    df: pd.DataFrame
+    updated_at_utc: Optional[str] = None
+
+
+def values_sha256(values: list[list[Any]]) -> str:
+    """Stable fingerprint of raw Sheets values."""
+    return hashlib.sha256(json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")).hexdigest()
+
+
+def _frame_to_json(df: pd.DataFrame) -> str:
+    return json.dumps(
+        {
+            "columns": list(df.columns),
+            "dtypes": {c: str(t) for c, t in df.dtypes.items()},
+            # Missing values (NaN / pd.NA) as JSON null so nullable dtypes restore cleanly
+            "data": {c: df[c].astype(object).where(df[c].notna(), None).tolist() for c in df.columns},
+        },
+        default=str,
+    )
+
+
+def _frame_from_json(text: str) -> pd.DataFrame:
+    payload = json.loads(text)
+    df = pd.DataFrame(payload["data"], columns=payload["columns"])
+    for col, dtype in payload["dtypes"].items():
+        try:
+            df[col] = df[col].astype(dtype)
+        except (TypeError, ValueError):
+            pass  # keep the JSON-inferred dtype
+    return df
+
+
+def init_sheets_cache_db(db_path: Path) -> None:
+    with _connect(db_path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS gsheets_frame_cache (
+              spreadsheet_id TEXT NOT NULL,
+              range_name TEXT NOT NULL,
+              kind TEXT NOT NULL,
+              modified_time TEXT,
+              content_sha256 TEXT NOT NULL,
+              frame_json TEXT NOT NULL,
+              parser_version TEXT NOT NULL,
+              updated_at_utc TEXT NOT NULL,
+              PRIMARY KEY (spreadsheet_id, range_name, kind)
+            )
+            """
+        )
+        conn.commit()
+
+
+def get_cached_sheet_frame(db_path: Path, *, key: SheetFrameKey) -> Optional[CachedSheetFrame]:
+    init_sheets_cache_db(db_path)
+    with _connect(db_path) as conn:
+        row = conn.execute(
+            """
+            SELECT modified_time, content_sha256, frame_json, parser_version, updated_at_utc
+            FROM gsheets_frame_cache
+            WHERE spreadsheet_id = ? AND range_name = ? AND kind = ?
+            """,
+            (key.spreadsheet_id, key.range_name, key.kind),
+        ).fetchone()
+
+    # Parsed by different code: neither the frame nor its content hash can be reused
+    if not row or row["parser_version"] != key.parser_version:
+        return None
+
+    return CachedSheetFrame(
+        key=key,
+        modified_time=row["modified_time"],
+        content_sha256=row["content_sha256"],
+        df=_frame_from_json(row["frame_json"]),
+        updated_at_utc=row["updated_at_utc"],
+    )
+
+
+def put_cached_sheet_frame(
+    db_path: Path,
+    *,
+    key: SheetFrameKey,
+    df: pd.DataFrame,
+    content_sha256: str,
+    modified_time: Optional[str],
+) -> None:
+    init_sheets_cache_db(db_path)
+    with _connect(db_path) as conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO gsheets_frame_cache (
+              spreadsheet_id, range_name, kind, modified_time, content_sha256, frame_json,
+              parser_version, updated_at_utc
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                key.spreadsheet_id,
+                key.range_name,
+                key.kind,
+                modified_time,
+                content_sha256,
+                _frame_to_json(df),
+                key.parser_version,
+                _utc_now_iso(),
+            ),
+        )
+        conn.commit()
+
+
+def init_header_cache_db(db_path: Path) -> None:
+    with _connect(db_path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS gsheets_header_cache (
+              spreadsheet_id TEXT NOT NULL,
+              sheet_name TEXT NOT NULL,
+              header TEXT NOT NULL,
+              header_row INTEGER NOT NULL,   -- 1-based row of the header
+              positions_json TEXT NOT NULL,  -- {stripped header cell: 0-based column index}
+              data_rows INTEGER NOT NULL,    -- rows below the header at the last read
+              updated_at_utc TEXT NOT NULL,
+              PRIMARY KEY (spreadsheet_id, sheet_name, header)
+            )
+            """
+        )
+        conn.commit()
+
+
+def get_cached_header(
+    db_path: Path, *, spreadsheet_id: str, sheet_name: str, header: str
+) -> Optional[tuple[int, dict[str, int], int]]:
+    """(1-based header row, column positions, data rows) last seen for a projected tab, or None."""
+    init_header_cache_db(db_path)
+    with _connect(db_path) as conn:
+        row = conn.execute(
+            """
+            SELECT header_row, positions_json, data_rows
+            FROM gsheets_header_cache
+            WHERE spreadsheet_id = ? AND sheet_name = ? AND header = ?
+            """,
+            (spreadsheet_id, sheet_name, header),
+        ).fetchone()
+    if not row:
+        return None
+    positions = {k: int(v) for k, v in json.loads(row["positions_json"]).items()}
+    return int(row["header_row"]), positions, int(row["data_rows"])
+
+
+def put_cached_header(
+    db_path: Path,
+    *,
+    spreadsheet_id: str,
+    sheet_name: str,
+    header: str,
+    header_row: Optional[int],
+    positions: Optional[dict[str, int]] = None,
+    data_rows: int = 0,
+) -> None:
+    """Store a tab's header location; header_row=None forgets it (header not found)."""
+    init_header_cache_db(db_path)
+    with _connect(db_path) as conn:
+        if header_row is None:
+            conn.execute(
+                "DELETE FROM gsheets_header_cache WHERE spreadsheet_id = ? AND sheet_name = ? AND header = ?",
+                (spreadsheet_id, sheet_name, header),
+            )
+        else:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO gsheets_header_cache (
+                  spreadsheet_id, sheet_name, header, header_row, positions_json, data_rows, updated_at_utc
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    spreadsheet_id,
+                    sheet_name,
+                    header,
+                    header_row,
+                    json.dumps(positions or {}),
+                    data_rows,
+                    _utc_now_iso(),
+                ),
+            )
+        conn.commit()
@@ -106,6 +106,32 @@ def init_db(db_path: Path) -> None:
             ON spapi_parsed_cache(expires_at_utc)
             """
         )
+
+        # One row per re-pull of a key that already had an OK entry.
+        # Used to measure how late Amazon still revises values (see cache/ttl_policy.py).
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS spapi_revision_log (
+              report_type TEXT NOT NULL,
+              marketplace_id TEXT NOT NULL,
+              data_start_date TEXT NOT NULL,
+              data_end_date TEXT NOT NULL,
+              report_options_json TEXT NOT NULL,
+
+              checked_at_utc TEXT NOT NULL,
+              age_days INTEGER NOT NULL,           -- checked_at date - data_end_date
+              previous_sha256 TEXT NOT NULL,       -- hash of previous parsed_json
+              new_sha256 TEXT NOT NULL,            -- hash of new parsed_json
+              changed INTEGER NOT NULL             -- 1 if parsed values differ
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_spapi_revision_log_report_age
+            ON spapi_revision_log(report_type, age_days)
+            """
+        )
         conn.commit()
 
 
@@ -166,12 +192,38 @@ def get_cache_status(db_path: Path, *, key: CacheKey) -> Optional[dict[str, Any]
         }
 
 
-def get_cached_parsed(db_path: Path, *, key: CacheKey) -> Optional[dict[str, Any]]:
+def _pulled_after_settle(pulled_at_utc: Optional[str], data_end_date: str, settle_days: int) -> bool:
+    """True if the entry was pulled at least settle_days after the last day it covers."""
+    if not pulled_at_utc:
+        return False
+    try:
+        pulled_on = _iso_to_dt(pulled_at_utc).date()
+        end_date = datetime.fromisoformat(data_end_date).date()
+    except Exception:
+        return False
+    return (pulled_on - end_date).days >= settle_days
+
+
+def get_cached_parsed(
+    db_path: Path,
+    *,
+    key: CacheKey,
+    final_after_days: Optional[int] = None,
+    settled_only: bool = False,
+) -> Optional[dict[str, Any]]:
+    """
+    Return the cached parsed object for key, or None if missing / ERROR / expired.
+
+    final_after_days: if set, an entry pulled at least that many days after its
+    data_end_date is treated as final and returned even past expires_at_utc
+    (covers entries written before the no-expiry policy for settled data).
+    settled_only: return only such final entries (requires final_after_days).
+    """
     init_db(db_path)
     with _connect(db_path) as conn:
         row = conn.execute(
             """
-            SELECT status, parsed_json, expires_at_utc
+            SELECT status, parsed_json, expires_at_utc, pulled_at_utc
             FROM spapi_parsed_cache
             WHERE report_type = ?
               AND marketplace_id = ?
@@ -192,7 +244,12 @@ def get_cached_parsed(db_path: Path, *, key: CacheKey) -> Optional[dict[str, Any
             return None
         if row["status"] != "OK":
             return None
-        if _is_expired(row["expires_at_utc"]):
+        settled = final_after_days is not None and _pulled_after_settle(
+            row["pulled_at_utc"], key.data_end_date, final_after_days
+        )
+        if settled_only and not settled:
+            return None
+        if _is_expired(row["expires_at_utc"]) and not settled:
             return None
 
         parsed_json = row["parsed_json"]
@@ -222,6 +279,104 @@ def _sha256_hex(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
 
+def _is_metric(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _comparable_values(previous: Any, new: Any) -> tuple[str, str]:
+    """
+    What a revision check compares, as JSON: each version's metric values
+    summed per row key, over only the fields both versions carry. A parser
+    change that adds a field (e.g. parentAsin) or reorders rows is then not
+    logged as a data revision. Objects without a "rows" list compare whole.
+    """
+    prev_rows = previous.get("rows") if isinstance(previous, dict) else None
+    new_rows = new.get("rows") if isinstance(new, dict) else None
+    if not isinstance(prev_rows, list) or not isinstance(new_rows, list):
+        return json.dumps(previous, sort_keys=True), json.dumps(new, sort_keys=True)
+
+    def _fields(rows: list[Any]) -> set[str]:
+        return {f for r in rows if isinstance(r, dict) for f in r}
+
+    shared = sorted(_fields(prev_rows) & _fields(new_rows))
+    every_row = [r for r in prev_rows + new_rows if isinstance(r, dict)]
+    metrics = [f for f in shared if all(_is_metric(r[f]) for r in every_row if r.get(f) is not None)]
+    keys = [f for f in shared if f not in metrics]
+
+    def _totals(rows: list[Any]) -> str:
+        totals: dict[str, list[float]] = {}
+        for r in rows:
+            if not isinstance(r, dict):
+                continue
+            row_key = json.dumps([str(r.get(f)) for f in keys])
+            sums = totals.setdefault(row_key, [0.0] * len(metrics))
+            for i, f in enumerate(metrics):
+                sums[i] += float(r.get(f) or 0.0)
+        rounded = {k: [round(v, 6) for v in sums] for k, sums in totals.items()}
+        return json.dumps([keys, metrics, rounded], sort_keys=True)
+
+    return _totals(prev_rows), _totals(new_rows)
+
+
+def _record_revision_check(
+    conn: sqlite3.Connection,
+    *,
+    key: CacheKey,
+    new_parsed_json: str,
+    checked_at: datetime,
+) -> None:
+    """If key already has an OK entry, log whether the re-pulled metric values changed."""
+    prev = conn.execute(
+        """
+        SELECT parsed_json
+        FROM spapi_parsed_cache
+        WHERE report_type = ?
+          AND marketplace_id = ?
+          AND data_start_date = ?
+          AND data_end_date = ?
+          AND report_options_json = ?
+          AND status = 'OK'
+        """,
+        (
+            key.report_type,
+            key.marketplace_id,
+            key.data_start_date,
+            key.data_end_date,
+            key.report_options_json,
+        ),
+    ).fetchone()
+    if not prev or not prev["parsed_json"]:
+        return
+
+    previous_values, new_values = _comparable_values(
+        json.loads(prev["parsed_json"]), json.loads(new_parsed_json)
+    )
+    previous_sha = _sha256_hex(previous_values.encode("utf-8"))
+    new_sha = _sha256_hex(new_values.encode("utf-8"))
+    age_days = (checked_at.date() - datetime.fromisoformat(key.data_end_date).date()).days
+
+    conn.execute(
+        """
+        INSERT INTO spapi_revision_log (
+          report_type, marketplace_id, data_start_date, data_end_date, report_options_json,
+          checked_at_utc, age_days, previous_sha256, new_sha256, changed
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            key.report_type,
+            key.marketplace_id,
+            key.data_start_date,
+            key.data_end_date,
+            key.report_options_json,
+            checked_at.isoformat(),
+            age_days,
+            previous_sha,
+            new_sha,
+            int(previous_sha != new_sha),
+        ),
+    )
+
+
 def put_cached_parsed(
     db_path: Path,
     *,
@@ -233,7 +388,16 @@ def put_cached_parsed(
     document_id: Optional[str] = None,
     raw_bytes: Optional[bytes] = None,
     row_count: Optional[int] = None,
+    payload_sha256: Optional[str] = None,
+    record_revision: bool = True,
 ) -> None:
+    """
+    payload_sha256 may be passed instead of raw_bytes when the caller already
+    hashed the document (e.g. backfill from archived raw files).
+
+    record_revision=False skips the revision log; use it when the write is not
+    a fresh re-pull (e.g. an archived document), so its age would be wrong.
+    """
     init_db(db_path)
 
     created_at = _utc_now()
@@ -241,9 +405,12 @@ def put_cached_parsed(
     if ttl_seconds is not None:
         expires_at = (created_at + timedelta(seconds=int(ttl_seconds))).isoformat()
 
-    payload_sha = _sha256_hex(raw_bytes) if raw_bytes is not None else None
+    payload_sha = _sha256_hex(raw_bytes) if raw_bytes is not None else payload_sha256
+    parsed_json = json.dumps(parsed_obj, separators=(",", ":"), sort_keys=True)
 
     with _connect(db_path) as conn:
+        if record_revision:
+            _record_revision_check(conn, key=key, new_parsed_json=parsed_json, checked_at=created_at)
         conn.execute(
             """
             INSERT OR REPLACE INTO spapi_parsed_cache (
@@ -260,7 +427,7 @@ def put_cached_parsed(
                 key.data_end_date,
                 key.report_options_json,
                 "OK",
-                json.dumps(parsed_obj, separators=(",", ":"), sort_keys=True),
+                parsed_json,
                 None,
                 created_at.isoformat(),
                 pulled_at_utc,
@@ -274,6 +441,21 @@ def put_cached_parsed(
         conn.commit()
 
 
+def known_payload_hashes(db_path: Path, *, report_type: str) -> set[str]:
+    """sha256 of every raw document already parsed into an OK entry for report_type."""
+    init_db(db_path)
+    with _connect(db_path) as conn:
+        rows = conn.execute(
+            """
+            SELECT DISTINCT payload_sha256
+            FROM spapi_parsed_cache
+            WHERE report_type = ? AND status = 'OK' AND payload_sha256 IS NOT NULL
+            """,
+            (report_type,),
+        ).fetchall()
+    return {r["payload_sha256"] for r in rows}
+
+
 def put_cache_error(
     db_path: Path,
     *,
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any, Optional
+
+from weekly_summary.cache.sqlite_cache import CacheKey, _connect, get_cached_parsed, init_db
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+
+@dataclass(frozen=True)
+class FinalityPolicy:
+    """
+    Cache TTL / finality rules for one SP-API report type.
+
+    settle_days:
+        Once a range's last day is at least this many days old, Amazon no longer
+        revises it. Such entries are immutable and cached with no expiry.
+    recheck_schedule:
+        (max_age_days, ttl_seconds) pairs for ranges that are not settled yet,
+        checked in order; age is today - data_end_date.
+    error_ttl_seconds:
+        How long a failed pull blocks a retry of the same key.
+    revision_sample_rate:
+        Fraction of settled keys re-pulled anyway (per key, per day) so the
+        revision log keeps measuring whether settle_days still holds.
+    """
+    settle_days: int
+    recheck_schedule: tuple[tuple[int, int], ...]
+    error_ttl_seconds: int = 15 * 60
+    revision_sample_rate: float = 0.02
+
+
+# Sales & Traffic numbers move for the first couple of days (late orders,
+# cancellations); by day 3 they are stable. Tune with suggest_settle_days().
+POLICIES: dict[str, FinalityPolicy] = {
+    "GET_SALES_AND_TRAFFIC_REPORT": FinalityPolicy(
+        settle_days=3,
+        recheck_schedule=((1, 6 * HOUR), (3, 24 * HOUR)),
+    ),
+}
+
+DEFAULT_POLICY = FinalityPolicy(settle_days=7, recheck_schedule=((7, 24 * HOUR),))
+
+
+def policy_for(report_type: str) -> FinalityPolicy:
+    return POLICIES.get(report_type, DEFAULT_POLICY)
+
+
+def is_settled(report_type: str, *, end_date: date, today: Optional[date] = None) -> bool:
+    today = today or date.today()
+    return (today - end_date).days >= policy_for(report_type).settle_days
+
+
+def ttl_seconds_for_range(
+    report_type: str,
+    *,
+    start_date: date,
+    end_date: date,
+    today: Optional[date] = None,
+) -> Optional[int]:
+    """
+    TTL for a freshly pulled range. None means no expiry (range is settled).
+
+    Only end_date matters: a range is as unsettled as its most recent day.
+    start_date is accepted so callers pass the full key.
+    """
+    today = today or date.today()
+    policy = policy_for(report_type)
+    age_days = (today - end_date).days
+
+    if age_days >= policy.settle_days:
+        return None
+
+    for max_age_days, ttl_seconds in policy.recheck_schedule:
+        if age_days <= max_age_days:
+            return ttl_seconds
+
+    return policy.recheck_schedule[-1][1]
+
+
+def sampled_for_revision_check(key: CacheKey, *, today: Optional[date] = None) -> bool:
+    """
+    Whether a settled key is due for a re-pull today. Deterministic per
+    (key, day), so repeated runs on one day agree and only pull it once.
+    """
+    rate = policy_for(key.report_type).revision_sample_rate
+    if rate <= 0:
+        return False
+    today = today or date.today()
+    token = "|".join(
+        [
+            key.report_type,
+            key.marketplace_id,
+            key.data_start_date,
+            key.data_end_date,
+            key.report_options_json,
+            today.isoformat(),
+        ]
+    )
+    bucket = int.from_bytes(hashlib.sha256(token.encode("utf-8")).digest()[:8], "big") / 2.0**64
+    return bucket < rate
+
+
+def get_servable_parsed(
+    db_path: Path,
+    *,
+    key: CacheKey,
+    reuse_cache: bool,
+    today: Optional[date] = None,
+) -> Optional[dict[str, Any]]:
+    """
+    Cached parsed object to serve for key, or None when the caller should pull.
+
+    Settled entries are immutable and served whatever reuse_cache says, except
+    for the sampled revision checks. reuse_cache=False only bypasses entries
+    that are not settled yet; with reuse_cache=True those are served until
+    their recheck TTL expires.
+    """
+    settled = get_settled_parsed(db_path, key=key)
+    if settled is not None:
+        if sampled_for_revision_check(key, today=today):
+            print(f"Revision check: re-pulling settled {key.data_start_date}..{key.data_end_date}")
+            return None
+        return settled
+
+    if not reuse_cache:
+        return None
+    return get_cached_parsed(db_path, key=key, final_after_days=policy_for(key.report_type).settle_days)
+
+
+def get_settled_parsed(db_path: Path, *, key: CacheKey) -> Optional[dict[str, Any]]:
+    """
+    The settled (immutable) cached entry for key, or None. Not subject to
+    revision sampling: callers whose sampled re-pull failed fall back to it
+    rather than recording an error over good data.
+    """
+    settle_days = policy_for(key.report_type).settle_days
+    return get_cached_parsed(db_path, key=key, final_after_days=settle_days, settled_only=True)
+
+
+def revision_stats(db_path: Path, *, report_type: str) -> list[dict[str, float]]:
+    """
+    Per age (days after data_end_date at re-pull time): how many re-pulls were
+    logged and how many of them changed the parsed values.
+    """
+    init_db(db_path)
+    with _connect(db_path) as conn:
+        rows = conn.execute(
+            """
+            SELECT age_days, COUNT(*) AS checks, SUM(changed) AS changes
+            FROM spapi_revision_log
+            WHERE report_type = ?
+            GROUP BY age_days
+            ORDER BY age_days
+            """,
+            (report_type,),
+        ).fetchall()
+
+    return [
+        {
+            "age_days": int(r["age_days"]),
+            "checks": int(r["checks"]),
+            "changes": int(r["changes"] or 0),
+            "change_rate": float(r["changes"] or 0) / float(r["checks"]),
+        }
+        for r in rows
+    ]
+
+
+def suggest_settle_days(
+    db_path: Path,
+    *,
+    report_type: str,
+    max_change_rate: float = 0.01,
+    min_checks: int = 5,
+) -> Optional[int]:
+    """
+    Smallest age from which every observed age bucket (with at least min_checks
+    re-pulls) changed values at most max_change_rate of the time.
+    Returns None when there is not enough revision data yet.
+    """
+    stats = [s for s in revision_stats(db_path, report_type=report_type) if s["checks"] >= min_checks]
+    if not stats:
+        return None
+
+    suggestion = int(stats[-1]["age_days"]) + 1
+    for s in reversed(stats):
+        if s["change_rate"] > max_change_rate:
+            break
+        suggestion = int(s["age_days"])
+    return suggestion
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from weekly_summary.cache.sqlite_cache import _connect, _utc_now_iso
+
+
+@dataclass(frozen=True)
+class WindowStateRecord:
+    marketplace_id: str
+    end_date: str         # YYYY-MM-DD of the last day covered by the windows
+    mapping_sha256: str   # fingerprint of the normalized ASIN -> SKU mapping
+    spec_sha256: str      # fingerprint of the window definitions (relative offsets)
+    rows: list[dict[str, Any]]  # unrounded window totals + days_seen per (sku, asin), settled days
+    settled_through: str  # YYYY-MM-DD of the last settled day included in rows
+    updated_at_utc: Optional[str] = None
+
+
+def init_window_state_db(db_path: Path) -> None:
+    with _connect(db_path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sales_window_state (
+              marketplace_id TEXT NOT NULL PRIMARY KEY,
+              end_date TEXT NOT NULL,
+              mapping_sha256 TEXT NOT NULL,
+              spec_sha256 TEXT NOT NULL,
+              rows_json TEXT NOT NULL,
+              settled_through TEXT NOT NULL,
+              updated_at_utc TEXT NOT NULL
+            )
+            """
+        )
+        conn.commit()
+
+
+def get_window_state(db_path: Path, *, marketplace_id: str) -> Optional[WindowStateRecord]:
+    init_window_state_db(db_path)
+    with _connect(db_path) as conn:
+        row = conn.execute(
+            """
+            SELECT marketplace_id, end_date, mapping_sha256, spec_sha256, rows_json, settled_through, updated_at_utc
+            FROM sales_window_state
+            WHERE marketplace_id = ?
+            """,
+            (marketplace_id,),
+        ).fetchone()
+
+    if not row:
+        return None
+
+    return WindowStateRecord(
+        marketplace_id=row["marketplace_id"],
+        end_date=row["end_date"],
+        mapping_sha256=row["mapping_sha256"],
+        spec_sha256=row["spec_sha256"],
+        rows=json.loads(row["rows_json"]),
+        settled_through=row["settled_through"],
+        updated_at_utc=row["updated_at_utc"],
+    )
+
+
+def put_window_state(db_path: Path, *, state: WindowStateRecord) -> None:
+    init_window_state_db(db_path)
+    with _connect(db_path) as conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO sales_window_state (
+              marketplace_id, end_date, mapping_sha256, spec_sha256, rows_json, settled_through, updated_at_utc
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                state.marketplace_id,
+                state.end_date,
+                state.mapping_sha256,
+                state.spec_sha256,
+                json.dumps(state.rows, separators=(",", ":")),
+                state.settled_through,
+                _utc_now_iso(),
+            ),
+        )
+        conn.commit()
@@ -4,7 +4,7 @@ Export full weekly inventory report to Excel.
 Combines:
 - Amazon restock data (asin, inventory_available, fc_transfer, etc.)
 - SKU mapping from ASIN
-- Sellercloud warehouse inventory from Delta API (190-welles inventory)
+- Sellercloud warehouse inventory from the configured saved views, one column each (190-welles inventory by default)
 
 Handles missing SKUs by filling with NA.
 """
@@ -19,7 +19,7 @@ from dotenv import load_dotenv
 
 from weekly_summary.extract.amazon.pull_restock_inventory import pull_restock_inventory_raw
 from weekly_summary.helpers.asin_sku_mapping import load_asin_sku_mapping
-from weekly_summary.sc_run import pull_warehouse_inventory_qty
+from weekly_summary.sc_run import pull_warehouse_inventory_wide
 from weekly_summary.transform.current_stock import compute_current_stock
 from weekly_summary.transform.restock_inventory import load_and_normalize_restock
 
@@ -35,7 +35,8 @@ def generate_full_inventory_report(
     
     Combines:
     1. Amazon restock data (inventory_available, fc_transfer, etc.)
-    2. Sellercloud warehouse inventory via Delta API (190-welles inventory)
+    2. Sellercloud warehouse inventory, one column per view in SELLERCLOUD_VIEWS
+       (default: saved view 187, 190-welles inventory), pulled concurrently
     
     Any SKU missing from either source gets 'NA' for those columns.
     
@@ -73,12 +74,10 @@ def generate_full_inventory_report(
     
     logger.info(f"  After SKU mapping: {len(df_with_sku)}")
     
-    # ============ 3. SELLERCLOUD DATA (DELTA API) ============
-    logger.info("Step 3: Pulling Sellercloud warehouse inventory from Delta API...")
-    df_sc = pull_warehouse_inventory_qty(
-        saved_view_id=187,  # Inventory report for 190 Welles
-        warehouse_id=142,   # 190 Welles - Bins warehouse
-    )
+    # ============ 3. SELLERCLOUD DATA (SNAPSHOT SYNC) ============
+    logger.info("Step 3: Syncing Sellercloud warehouse inventory (configured saved views)...")
+    df_sc = pull_warehouse_inventory_wide()
+    sc_cols = [c for c in df_sc.columns if c != "sku"]
     
     logger.info(f"  Sellercloud rows: {len(df_sc)}")
     
@@ -103,7 +102,7 @@ def generate_full_inventory_report(
         "fc_processing",
         "inbound",
         "current_stock_per_6",
-        "190-welles inventory",
+        *sc_cols,
     ]
     
     # Only include columns that exist
@@ -114,11 +113,11 @@ def generate_full_inventory_report(
     # Fill missing values with 'NA'
     df_final = df_final.fillna("NA")
     
-    # Sort by 190-welles inventory descending (or by SKU if column doesn't exist)
-    if "190-welles inventory" in df_final.columns:
+    # Sort by the first warehouse column descending (or by SKU if none exist)
+    if sc_cols and sc_cols[0] in df_final.columns:
         # Convert to numeric for sorting, keeping NAs at bottom
         df_final["_sort_key"] = pd.to_numeric(
-            df_final["190-welles inventory"], 
+            df_final[sc_cols[0]], 
             errors="coerce"
         )
         df_final = df_final.sort_values("_sort_key", ascending=False, na_position="last")
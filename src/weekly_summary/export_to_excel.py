@@ -7,6 +7,8 @@ from typing import Optional
 
 import pandas as pd
 
+from weekly_summary.transform.loc_keys import loc_mask
+
 
 @dataclass(frozen=True)
 class ExcelExportResult:
@@ -45,7 +47,7 @@ def export_report_to_excel(
 
     loc_df = pd.DataFrame()
     if include_loc_sheet and "sku" in df_out.columns:
-        loc_df = df_out[df_out["sku"].astype(str).str.upper().str.endswith("-LOC")].copy()
+        loc_df = df_out[loc_mask(df_out["sku"])].copy()
 
     with pd.ExcelWriter(output_path, engine="xlsxwriter") as writer:
         df_out.to_excel(writer, index=False, sheet_name="Report")
@@ -11,6 +11,9 @@ from sp_api.api import Reports
 from sp_api.base import Marketplaces
 from sp_api.base.exceptions import SellingApiRequestThrottledException
 
+from weekly_summary.instrumentation import record, record_throttle
+from weekly_summary.tracing import TracedClient
+
 from .report_utils import download_report_document, wait_for_report
 
 REPORT_TYPE = "GET_RESTOCK_INVENTORY_RECOMMENDATIONS_REPORT"
@@ -32,7 +35,7 @@ def _default_cache_dir() -> Path:
     return Path("data") / "raw" / "amazon" / "restock_inventory" / _today_str()
 
 
-def _build_reports_client() -> Reports:
+def _build_reports_client() -> TracedClient:
     refresh_token = os.getenv("SPAPI_REFRESH_TOKEN")
     lwa_app_id = os.getenv("SPAPI_LWA_APP_ID")
     lwa_client_secret = os.getenv("SPAPI_LWA_CLIENT_SECRET")
@@ -42,13 +45,17 @@ def _build_reports_client() -> Reports:
             "Missing SP-API env vars. Need SPAPI_REFRESH_TOKEN, SPAPI_LWA_APP_ID, SPAPI_LWA_CLIENT_SECRET"
         )
 
-    return Reports(
-        credentials={
-            "refresh_token": refresh_token,
-            "lwa_app_id": lwa_app_id,
-            "lwa_client_secret": lwa_client_secret,
-        },
-        marketplace=Marketplaces.US,
+    # Every Reports call becomes a trace span when tracing is on
+    return TracedClient(
+        "spapi",
+        Reports(
+            credentials={
+                "refresh_token": refresh_token,
+                "lwa_app_id": lwa_app_id,
+                "lwa_client_secret": lwa_client_secret,
+            },
+            marketplace=Marketplaces.US,
+        ),
     )
 
 
@@ -65,6 +72,7 @@ def _get_latest_done_report(reports: Reports, lookback_days: int = 7) -> Optiona
     # get_reports can also throttle, so keep it conservative with retries
     for attempt in range(1, 6):
         try:
+            record("spapi", api_calls=1)
             res = reports.get_reports(
                 reportTypes=[REPORT_TYPE],
                 processingStatuses=["DONE"],
@@ -93,6 +101,7 @@ def _get_latest_done_report(reports: Reports, lookback_days: int = 7) -> Optiona
         except SellingApiRequestThrottledException:
             wait_s = 5 * attempt
             print(f"Throttled on get_reports. Waiting {wait_s}s (attempt {attempt}/5)...")
+            record_throttle("spapi", wait_s)
             time.sleep(wait_s)
 
     return None
@@ -105,11 +114,13 @@ def _create_report_with_backoff(
 ) -> str:
     for attempt in range(1, max_attempts + 1):
         try:
+            record("spapi", api_calls=1)
             res = reports.create_report(reportType=report_type)
             return res.payload["reportId"]
         except SellingApiRequestThrottledException:
             wait_s = 30 * attempt
             print(f"Throttled on create_report. Waiting {wait_s}s (attempt {attempt}/{max_attempts})...")
+            record_throttle("spapi", wait_s)
             time.sleep(wait_s)
 
     raise RuntimeError("Exceeded max attempts creating restock report due to throttling.")
@@ -137,6 +148,7 @@ def pull_restock_inventory_raw(
     if reuse_if_exists and existing:
         raw_path = existing[-1]
         print(f"Using cached restock report: {raw_path}")
+        record("spapi", cache_hits=1)
         return RestockPullResult(
             report_type=REPORT_TYPE,
             report_id="cached",
@@ -144,6 +156,7 @@ def pull_restock_inventory_raw(
             raw_path=raw_path,
         )
 
+    record("spapi", cache_misses=1)
     reports = _build_reports_client()
 
     latest = _get_latest_done_report(reports, lookback_days=lookback_days)
@@ -151,6 +164,7 @@ def pull_restock_inventory_raw(
         report_id, document_id = latest
         print(f"Reusing newest DONE restock report from Amazon: reportId={report_id}")
 
+        record("spapi", api_calls=1)
         doc = reports.get_report_document(reportDocumentId=document_id).payload
         content = download_report_document(doc)
 
@@ -173,6 +187,7 @@ def pull_restock_inventory_raw(
     document_id = wait_for_report(reports, report_id)
     print(f"DONE documentId={document_id}")
 
+    record("spapi", api_calls=1)
     doc = reports.get_report_document(reportDocumentId=document_id).payload
     content = download_report_document(doc)
 
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+
+from weekly_summary.instrumentation import record_throttle
+
+
+@dataclass
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every worker calling one SP-API operation.
+
+    rate_per_s / burst mirror the operation's published usage plan. When any
+    caller gets throttled anyway, penalize() pushes the next grant out for all.
+    """
+
+    rate_per_s: float
+    burst: int
+    _tokens: float = field(init=False)
+    _updated: float = field(init=False)
+    _blocked_until: float = field(init=False, default=0.0)
+    _lock: threading.Lock = field(init=False, default_factory=threading.Lock)
+
+    def __post_init__(self) -> None:
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate_per_s)
+        self._updated = now
+
+    def acquire(self) -> None:
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._blocked_until and self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    if waited:
+                        record_throttle("spapi", waited)
+                    return
+                wait_s = max(self._blocked_until - now, (1.0 - self._tokens) / self.rate_per_s)
+            time.sleep(wait_s)
+            waited += wait_s
+
+    def penalize(self, seconds: float) -> None:
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0.0
@@ -13,6 +13,9 @@ import requests
 from sp_api.api import Reports
 from sp_api.base.exceptions import SellingApiRequestThrottledException
 
+from weekly_summary.instrumentation import record, record_throttle
+from weekly_summary.tracing import span
+
 
 @dataclass(frozen=True)
 class ReportWaitConfig:
@@ -38,9 +41,11 @@ def wait_for_report(reports: Reports, report_id: str, *, cfg: ReportWaitConfig =
             raise TimeoutError(f"Timed out waiting for reportId={report_id} after {cfg.max_minutes} minutes")
 
         try:
+            record("spapi", api_calls=1)
             res = reports.get_report(reportId=report_id)
         except SellingApiRequestThrottledException:
             sleep_s = min(cfg.poll_seconds * attempt, 120)
+            record_throttle("spapi", sleep_s)
             time.sleep(sleep_s)
             continue
 
@@ -73,9 +78,13 @@ def download_report_document(doc_payload: dict[str, Any], *, timeout_s: int = 90
     if not url:
         raise ValueError(f"Report document payload missing 'url': {doc_payload}")
 
-    resp = requests.get(url, timeout=timeout_s)
+    # Presigned S3 URL: traced apart from the SP-API calls that produced it
+    with span("s3", "reportDocument", "GET") as sp:
+        resp = requests.get(url, timeout=timeout_s)
+        sp.set_requests_response(resp)
     resp.raise_for_status()
     content = resp.content
+    record("spapi", api_calls=1, bytes_downloaded=len(content))
 
     enc = doc_payload.get("encryptionDetails")
     if enc:
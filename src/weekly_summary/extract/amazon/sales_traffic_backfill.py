@@ -0,0 +1,357 @@
+"""
+Sales & Traffic history backfill (up to the ~2 years SP-API retains).
+
+    python -m weekly_summary.extract.amazon.sales_traffic_backfill [--days 730] [--step-days 1] [--workers 4]
+
+The range is planned as day- (or week-) sized SKU reports, keyed exactly like
+get_sales_traffic_rows_cached so live window pulls hit them. Jobs run on a
+thread pool; every Reports call goes through token buckets shared by all
+workers, sized to the Reports API usage plans. Progress is checkpointed per job
+(spapi_backfill_jobs), so the run can be stopped and resumed: finished jobs are
+skipped and jobs that already have a reportId are polled instead of re-created.
+Only settled ranges are planned, and settled entries are stored with no expiry.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import pandas as pd
+from sp_api.base import Marketplaces
+from sp_api.base.exceptions import SellingApiRequestThrottledException
+
+from weekly_summary.cache.backfill_checkpoint import BackfillCheckpoint, get_checkpoints, put_checkpoint
+from weekly_summary.cache.sqlite_cache import CacheKey, _connect, get_cached_parsed, init_db, put_cached_parsed
+from weekly_summary.cache.ttl_policy import policy_for, ttl_seconds_for_range
+from weekly_summary.extract.amazon.rate_limit import TokenBucket
+from weekly_summary.extract.amazon.report_utils import download_report_document, wait_for_report
+from weekly_summary.extract.amazon.sales_traffic_by_window import (
+    REPORT_TYPE,
+    SalesTrafficSchemaError,
+    _build_reports_client,
+    _create_report_with_backoff,
+    _parse_rows_by_child_asin_and_sku,
+    _utc_now_iso,
+)
+
+DEFAULT_DB_PATH = Path("data") / "cache" / "spapi_reports.sqlite"
+MAX_HISTORY_DAYS = 730
+SKU_DAY_OPTIONS = {"dateGranularity": "DAY", "asinGranularity": "SKU"}
+
+# Reports API usage plans (rate per second, burst), shared by the whole account
+CREATE_REPORT_LIMIT = (0.0167, 15)
+GET_REPORT_LIMIT = (2.0, 15)
+GET_REPORT_DOCUMENT_LIMIT = (0.0167, 15)
+THROTTLE_PENALTY_S = 60.0
+
+
+@dataclass(frozen=True)
+class HistoryBackfillResult:
+    planned: int
+    skipped: int  # already DONE or already in the parsed cache
+    done: int
+    failed: int
+
+
+class _LimitedReports:
+    """
+    Reports client wrapper that takes a shared token before each call and, when
+    throttled anyway, blocks every worker for THROTTLE_PENALTY_S. Exceptions are
+    re-raised so the existing backoff loops still apply.
+    """
+
+    def __init__(self, reports: Any, buckets: dict[str, TokenBucket]) -> None:
+        self._reports = reports
+        self._buckets = buckets
+
+    def _call(self, op: str, **kwargs: Any) -> Any:
+        bucket = self._buckets[op]
+        bucket.acquire()
+        try:
+            return getattr(self._reports, op)(**kwargs)
+        except SellingApiRequestThrottledException:
+            bucket.penalize(THROTTLE_PENALTY_S)
+            raise
+
+    def create_report(self, **kwargs: Any) -> Any:
+        return self._call("create_report", **kwargs)
+
+    def get_report(self, **kwargs: Any) -> Any:
+        return self._call("get_report", **kwargs)
+
+    def get_report_document(self, **kwargs: Any) -> Any:
+        return self._call("get_report_document", **kwargs)
+
+
+def _default_buckets() -> dict[str, TokenBucket]:
+    return {
+        "create_report": TokenBucket(*CREATE_REPORT_LIMIT),
+        "get_report": TokenBucket(*GET_REPORT_LIMIT),
+        "get_report_document": TokenBucket(*GET_REPORT_DOCUMENT_LIMIT),
+    }
+
+
+def history_key(start_date: date, end_date: date, *, marketplace_id: str) -> CacheKey:
+    return CacheKey(
+        report_type=REPORT_TYPE,
+        marketplace_id=marketplace_id,
+        data_start_date=start_date.isoformat(),
+        data_end_date=end_date.isoformat(),
+        report_options_json=json.dumps(SKU_DAY_OPTIONS, separators=(",", ":"), sort_keys=True),
+    )
+
+
+def default_history_range(today: Optional[date] = None) -> tuple[date, date]:
+    """Newest settled day back to MAX_HISTORY_DAYS before today."""
+    today = today or date.today()
+    end = today - timedelta(days=policy_for(REPORT_TYPE).settle_days)
+    return today - timedelta(days=MAX_HISTORY_DAYS), end
+
+
+def plan_history_jobs(
+    *,
+    start_date: date,
+    end_date: date,
+    step_days: int = 1,
+    marketplace_id: str = Marketplaces.US.marketplace_id,
+) -> list[CacheKey]:
+    """
+    Slices of step_days aligned to end_date, newest first (an interrupted run has
+    already covered the most useful recent history). The oldest slice is clipped
+    at start_date.
+    """
+    if step_days < 1:
+        raise ValueError("step_days must be >= 1")
+
+    keys: list[CacheKey] = []
+    slice_end = end_date
+    while slice_end >= start_date:
+        slice_start = max(start_date, slice_end - timedelta(days=step_days - 1))
+        keys.append(history_key(slice_start, slice_end, marketplace_id=marketplace_id))
+        slice_end = slice_start - timedelta(days=1)
+    return keys
+
+
+def _run_job(
+    reports: _LimitedReports,
+    *,
+    db_path: Path,
+    checkpoint: BackfillCheckpoint,
+) -> BackfillCheckpoint:
+    key = checkpoint.key
+    start_date = date.fromisoformat(key.data_start_date)
+    end_date = date.fromisoformat(key.data_end_date)
+    attempts = checkpoint.attempts + 1
+    pulled_at_utc = _utc_now_iso()
+
+    report_id = checkpoint.report_id
+    if checkpoint.status != "REQUESTED" or not report_id:
+        report_id = _create_report_with_backoff(
+            reports,  # type: ignore[arg-type]
+            marketplace_ids=[key.marketplace_id],
+            data_start_time=datetime(start_date.year, start_date.month, start_date.day, tzinfo=timezone.utc),
+            data_end_time=datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59, tzinfo=timezone.utc),
+            report_options=SKU_DAY_OPTIONS,
+        )
+        # Persist the reportId before waiting: a resumed run polls it instead of spending quota
+        checkpoint = replace(checkpoint, status="REQUESTED", report_id=report_id, attempts=attempts)
+        put_checkpoint(db_path, checkpoint=checkpoint)
+
+    document_id = wait_for_report(reports, report_id)  # type: ignore[arg-type]
+    doc = reports.get_report_document(reportDocumentId=document_id).payload
+    raw = download_report_document(doc)
+
+    try:
+        payload = json.loads(raw.decode("utf-8", errors="replace").strip())
+    except Exception as e:
+        preview = raw[:800].decode("utf-8", errors="replace")
+        raise SalesTrafficSchemaError(f"Downloaded document was not valid JSON. Preview: {preview}") from e
+
+    df_rows = _parse_rows_by_child_asin_and_sku(payload)
+    put_cached_parsed(
+        db_path,
+        key=key,
+        parsed_obj={"rows": df_rows.to_dict(orient="records")},
+        # None for settled ranges: history never expires
+        ttl_seconds=ttl_seconds_for_range(REPORT_TYPE, start_date=start_date, end_date=end_date),
+        pulled_at_utc=pulled_at_utc,
+        report_id=report_id,
+        document_id=document_id,
+        raw_bytes=raw,
+        row_count=int(len(df_rows)),
+    )
+
+    done = replace(
+        checkpoint,
+        status="DONE",
+        attempts=attempts,
+        document_id=document_id,
+        row_count=int(len(df_rows)),
+        last_error=None,
+    )
+    put_checkpoint(db_path, checkpoint=done)
+    return done
+
+
+def run_history_backfill(
+    *,
+    db_path: Path = DEFAULT_DB_PATH,
+    marketplace_id: str = Marketplaces.US.marketplace_id,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    step_days: int = 1,
+    workers: int = 4,
+    max_attempts: int = 3,
+    reports_factory: Callable[[], Any] = _build_reports_client,
+    buckets: Optional[dict[str, TokenBucket]] = None,
+) -> HistoryBackfillResult:
+    default_start, default_end = default_history_range()
+    start_date = start_date or default_start
+    end_date = end_date or default_end
+
+    init_db(db_path)
+    keys = plan_history_jobs(
+        start_date=start_date, end_date=end_date, step_days=step_days, marketplace_id=marketplace_id
+    )
+    existing = get_checkpoints(db_path, report_type=REPORT_TYPE, marketplace_id=marketplace_id)
+    settle_days = policy_for(REPORT_TYPE).settle_days
+
+    todo: list[BackfillCheckpoint] = []
+    skipped = 0
+    for key in keys:
+        cp = existing.get(key) or BackfillCheckpoint(key=key, status="PENDING")
+        if cp.status == "DONE" or (cp.status == "FAILED" and cp.attempts >= max_attempts):
+            skipped += 1
+            continue
+        if cp.status != "REQUESTED" and get_cached_parsed(db_path, key=key, final_after_days=settle_days) is not None:
+            put_checkpoint(db_path, checkpoint=replace(cp, status="DONE"))
+            skipped += 1
+            continue
+        todo.append(cp)
+
+    print(
+        f"Sales&Traffic backfill: {start_date}..{end_date} step={step_days}d -> "
+        f"{len(keys)} jobs, {skipped} already done, {len(todo)} to run on {workers} worker(s)"
+    )
+
+    buckets = buckets or _default_buckets()
+    local = threading.local()
+
+    def _reports() -> _LimitedReports:
+        # sp_api clients hold a requests session; keep one per thread
+        if not hasattr(local, "reports"):
+            local.reports = _LimitedReports(reports_factory(), buckets)
+        return local.reports
+
+    def _work(cp: BackfillCheckpoint) -> BackfillCheckpoint:
+        try:
+            return _run_job(_reports(), db_path=db_path, checkpoint=cp)
+        except Exception as e:
+            failed = replace(
+                cp,
+                status="FAILED",
+                attempts=cp.attempts + 1,
+                # Forget the reportId: a failed report is re-created on retry
+                report_id=None,
+                last_error=f"{type(e).__name__}: {e}",
+            )
+            put_checkpoint(db_path, checkpoint=failed)
+            return failed
+
+    done = failed = 0
+    if todo:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = [pool.submit(_work, cp) for cp in todo]
+            try:
+                for i, fut in enumerate(as_completed(futures), start=1):
+                    cp = fut.result()
+                    if cp.status == "DONE":
+                        done += 1
+                    else:
+                        failed += 1
+                    print(
+                        f"  [{i}/{len(todo)}] {cp.key.data_start_date}..{cp.key.data_end_date} "
+                        f"{cp.status} rows={cp.row_count if cp.row_count is not None else '-'}"
+                        + (f" err={cp.last_error}" if cp.status == "FAILED" else "")
+                    )
+            except KeyboardInterrupt:
+                print("Interrupted: cancelling queued jobs (progress is checkpointed; re-run to resume)")
+                pool.shutdown(wait=True, cancel_futures=True)
+                raise
+
+    result = HistoryBackfillResult(planned=len(keys), skipped=skipped, done=done, failed=failed)
+    print(f"Sales&Traffic backfill: {result}")
+    return result
+
+
+def load_daily_sku_history(
+    db_path: Path = DEFAULT_DB_PATH,
+    *,
+    start_date: date,
+    end_date: date,
+    marketplace_id: str = Marketplaces.US.marketplace_id,
+) -> pd.DataFrame:
+    """
+    Long frame (day, child_asin, amazon_sku, Units) from cached single-day SKU
+    reports, for year-over-year / seasonality windows without API calls.
+    Days with no cached report are simply absent.
+    """
+    init_db(db_path)
+    options_json = json.dumps(SKU_DAY_OPTIONS, separators=(",", ":"), sort_keys=True)
+    with _connect(db_path) as conn:
+        rows = conn.execute(
+            """
+            SELECT data_start_date, parsed_json
+            FROM spapi_parsed_cache
+            WHERE report_type = ? AND marketplace_id = ? AND report_options_json = ?
+              AND status = 'OK' AND data_start_date = data_end_date
+              AND data_start_date BETWEEN ? AND ?
+            ORDER BY data_start_date
+            """,
+            (REPORT_TYPE, marketplace_id, options_json, start_date.isoformat(), end_date.isoformat()),
+        ).fetchall()
+
+    frames = []
+    for r in rows:
+        day_rows = json.loads(r["parsed_json"]).get("rows", [])
+        if day_rows:
+            df = pd.DataFrame(day_rows)[["child_asin", "amazon_sku", "Units"]]
+            df.insert(0, "day", r["data_start_date"])
+            frames.append(df)
+
+    if not frames:
+        return pd.DataFrame(columns=["day", "child_asin", "amazon_sku", "Units"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Backfill Sales & Traffic SKU history into the parsed cache.")
+    parser.add_argument("--db-path", type=Path, default=DEFAULT_DB_PATH)
+    parser.add_argument("--days", type=int, default=MAX_HISTORY_DAYS, help="history depth back from today")
+    parser.add_argument("--step-days", type=int, default=1, help="1 = daily reports, 7 = weekly")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-attempts", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    _, end = default_history_range()
+    start = date.today() - timedelta(days=min(args.days, MAX_HISTORY_DAYS))
+
+    run_history_backfill(
+        db_path=args.db_path,
+        start_date=start,
+        end_date=end,
+        step_days=args.step_days,
+        workers=args.workers,
+        max_attempts=args.max_attempts,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 import os
 import time
-from datetime import date, datetime, timedelta, timezone
+from datetime import date, datetime, timezone
 from pathlib import Path
 from typing import Any, Optional
 
@@ -16,11 +16,18 @@ from sp_api.base.exceptions import SellingApiForbiddenException, SellingApiReque
 from weekly_summary.cache.sqlite_cache import (
     CacheKey,
     get_cache_status,
-    get_cached_parsed,
     put_cache_error,
     put_cached_parsed,
 )
+from weekly_summary.cache.ttl_policy import (
+    get_servable_parsed,
+    get_settled_parsed,
+    policy_for,
+    ttl_seconds_for_range,
+)
 from weekly_summary.extract.amazon.report_utils import download_report_document, wait_for_report
+from weekly_summary.instrumentation import record, record_throttle
+from weekly_summary.tracing import TracedClient
 
 REPORT_TYPE = "GET_SALES_AND_TRAFFIC_REPORT"
 
@@ -37,7 +44,7 @@ def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
 
-def _build_reports_client() -> Reports:
+def _build_reports_client() -> TracedClient:
     load_dotenv(override=True)
 
     refresh_token = os.getenv("SPAPI_REFRESH_TOKEN")
@@ -49,13 +56,17 @@ def _build_reports_client() -> Reports:
             "Missing SP-API env vars. Need SPAPI_REFRESH_TOKEN, SPAPI_LWA_APP_ID, SPAPI_LWA_CLIENT_SECRET"
         )
 
-    return Reports(
-        credentials={
-            "refresh_token": refresh_token,
-            "lwa_app_id": lwa_app_id,
-            "lwa_client_secret": lwa_client_secret,
-        },
-        marketplace=Marketplaces.US,
+    # Every Reports call becomes a trace span when tracing is on
+    return TracedClient(
+        "spapi",
+        Reports(
+            credentials={
+                "refresh_token": refresh_token,
+                "lwa_app_id": lwa_app_id,
+                "lwa_client_secret": lwa_client_secret,
+            },
+            marketplace=Marketplaces.US,
+        ),
     )
 
 
@@ -70,6 +81,7 @@ def _create_report_with_backoff(
 ) -> str:
     for attempt in range(1, max_attempts + 1):
         try:
+            record("spapi", api_calls=1)
             res = reports.create_report(
                 reportType=REPORT_TYPE,
                 marketplaceIds=marketplace_ids,
@@ -85,6 +97,7 @@ def _create_report_with_backoff(
         except SellingApiRequestThrottledException:
             wait_s = min(30 * attempt, 180)
             print(f"Throttled on create_report. Waiting {wait_s}s (attempt {attempt}/{max_attempts})...")
+            record_throttle("spapi", wait_s)
             time.sleep(wait_s)
 
         except SellingApiForbiddenException as e:
@@ -93,18 +106,6 @@ def _create_report_with_backoff(
     raise RuntimeError("Exceeded max attempts creating Sales & Traffic report due to throttling.")
 
 
-def _ttl_seconds_for_window(*, end_date: date) -> int:
-    """
-    TTL policy:
-      - If window ends yesterday or today: refresh more often (6 hours)
-      - Otherwise: 30 days
-    """
-    today = date.today()
-    if end_date >= (today - timedelta(days=1)):
-        return 6 * 60 * 60
-    return 30 * 24 * 60 * 60
-
-
 def _pick_units_ordered_from_row(row: dict[str, Any]) -> float:
     """
     Observed payload for asinGranularity=SKU uses salesByAsin.unitsOrdered.
@@ -156,10 +157,14 @@ def _parse_rows_by_child_asin_and_sku(payload: Any) -> pd.DataFrame:
         if not child_asin or not amazon_sku:
             continue
 
+        parent_asin = r.get("parentAsin")
+
         out.append(
             {
                 "child_asin": str(child_asin).strip(),
                 "amazon_sku": str(amazon_sku).strip(),
+                # Kept in the cache so ASIN/PARENT requests can be rolled up from SKU rows
+                "parent_asin": str(parent_asin).strip() if parent_asin else None,
                 "Units": _pick_units_ordered_from_row(r),
             }
         )
@@ -172,7 +177,44 @@ def _parse_rows_by_child_asin_and_sku(payload: Any) -> pd.DataFrame:
     df["child_asin"] = df["child_asin"].astype(str).str.strip()
     df["amazon_sku"] = df["amazon_sku"].astype(str).str.strip()
 
-    return df.groupby(["child_asin", "amazon_sku"], as_index=False)["Units"].sum()
+    return df.groupby(["child_asin", "amazon_sku", "parent_asin"], as_index=False, dropna=False)[
+        "Units"
+    ].sum()
+
+
+def _rows_cache_key(
+    start_date: date, end_date: date, marketplace_id: str, report_options: dict[str, str]
+) -> CacheKey:
+    return CacheKey(
+        report_type=REPORT_TYPE,
+        marketplace_id=marketplace_id,
+        data_start_date=start_date.isoformat(),
+        data_end_date=end_date.isoformat(),
+        report_options_json=json.dumps(report_options, separators=(",", ":"), sort_keys=True),
+    )
+
+
+def has_settled_rows_cached(
+    *,
+    start_date: date,
+    end_date: date,
+    marketplace_id: str = Marketplaces.US.marketplace_id,
+    db_path: Path = Path("data") / "cache" / "spapi_reports.sqlite",
+) -> bool:
+    """Whether get_sales_traffic_rows_cached would serve this range from a settled cache entry."""
+    report_options = {"dateGranularity": "DAY", "asinGranularity": "SKU"}
+    key = _rows_cache_key(start_date, end_date, marketplace_id, report_options)
+    return get_settled_parsed(db_path, key=key) is not None
+
+
+def _rows_from_parsed(parsed: dict[str, Any]) -> pd.DataFrame:
+    df = pd.DataFrame(parsed.get("rows", []))
+    if df.empty:
+        return pd.DataFrame(columns=["child_asin", "amazon_sku", "Units"])
+    df["Units"] = pd.to_numeric(df["Units"], errors="coerce").fillna(0.0)
+    df["child_asin"] = df["child_asin"].astype(str).str.strip()
+    df["amazon_sku"] = df["amazon_sku"].astype(str).str.strip()
+    return df[["child_asin", "amazon_sku", "Units"]]
 
 
 def get_sales_traffic_rows_cached(
@@ -191,33 +233,22 @@ def get_sales_traffic_rows_cached(
       child_asin, amazon_sku, Units
     """
     report_options = {"dateGranularity": date_granularity, "asinGranularity": asin_granularity}
-    report_options_json = json.dumps(report_options, separators=(",", ":"), sort_keys=True)
+    key = _rows_cache_key(start_date, end_date, marketplace_id, report_options)
 
-    key = CacheKey(
-        report_type=REPORT_TYPE,
-        marketplace_id=marketplace_id,
-        data_start_date=start_date.isoformat(),
-        data_end_date=end_date.isoformat(),
-        report_options_json=report_options_json,
-    )
+    policy = policy_for(REPORT_TYPE)
 
     if debug_cache_status:
         st = get_cache_status(db_path, key=key)
         if st is not None:
             print("Cache status:", st)
 
-    if reuse_cache:
-        cached = get_cached_parsed(db_path, key=key)
-        if cached is not None:
-            rows = cached.get("rows", [])
-            df = pd.DataFrame(rows)
-            if df.empty:
-                return pd.DataFrame(columns=["child_asin", "amazon_sku", "Units"])
-            df["Units"] = pd.to_numeric(df["Units"], errors="coerce").fillna(0.0)
-            df["child_asin"] = df["child_asin"].astype(str).str.strip()
-            df["amazon_sku"] = df["amazon_sku"].astype(str).str.strip()
-            return df[["child_asin", "amazon_sku", "Units"]]
+    # Settled entries are served even with reuse_cache=False (see get_servable_parsed)
+    cached = get_servable_parsed(db_path, key=key, reuse_cache=reuse_cache)
+    if cached is not None:
+        record("spapi", cache_hits=1)
+        return _rows_from_parsed(cached)
 
+    record("spapi", cache_misses=1)
     reports = _build_reports_client()
 
     start_dt = datetime(start_date.year, start_date.month, start_date.day, tzinfo=timezone.utc)
@@ -229,7 +260,7 @@ def get_sales_traffic_rows_cached(
     document_id: Optional[str] = None
     raw: Optional[bytes] = None
     pulled_at_utc = _utc_now_iso()
-    ttl_seconds = _ttl_seconds_for_window(end_date=end_date)
+    ttl_seconds = ttl_seconds_for_range(REPORT_TYPE, start_date=start_date, end_date=end_date)
 
     try:
         report_id = _create_report_with_backoff(
@@ -241,6 +272,7 @@ def get_sales_traffic_rows_cached(
         )
         document_id = wait_for_report(reports, report_id)
 
+        record("spapi", api_calls=1)
         doc = reports.get_report_document(reportDocumentId=document_id).payload
         raw = download_report_document(doc)
 
@@ -267,11 +299,17 @@ def get_sales_traffic_rows_cached(
         return df_rows[["child_asin", "amazon_sku", "Units"]]
 
     except Exception as e:
+        settled = get_settled_parsed(db_path, key=key)
+        if settled is not None:
+            # A failed revision check must not overwrite the settled entry with an ERROR row
+            print(f"Revision check failed for {start_date}..{end_date}, keeping the settled entry: {e}")
+            return _rows_from_parsed(settled)
+
         put_cache_error(
             db_path,
             key=key,
             error_message=f"{type(e).__name__}: {e}",
-            ttl_seconds=15 * 60,
+            ttl_seconds=policy.error_ttl_seconds,
             pulled_at_utc=pulled_at_utc,
             report_id=report_id,
             document_id=document_id,
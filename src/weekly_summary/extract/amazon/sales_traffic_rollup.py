@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import pandas as pd
+
+# asinGranularity levels, finest first. "ASIN" is what get_units_rows_cached has
+# historically requested; it returns child-ASIN rows like CHILD.
+_LEVEL = {"SKU": 0, "CHILD": 1, "ASIN": 1, "PARENT": 2}
+
+# Column names used by the cached `rows` of each granularity's parser
+_SKU_ROW_COLS = {"parent": "parent_asin", "child": "child_asin", "units": "Units"}
+_ASIN_ROW_COLS = {"parent": "parentAsin", "child": "childAsin", "units": "Units"}
+
+
+def finer_granularities(asin_granularity: str) -> list[str]:
+    """Granularities whose rows can be rolled up into asin_granularity, finest first."""
+    level = _LEVEL.get(asin_granularity.upper())
+    if level is None:
+        return []
+    return [g for g in ("SKU", "CHILD", "ASIN") if _LEVEL[g] < level]
+
+
+def rollup_rows(
+    rows: list[dict[str, Any]],
+    *,
+    from_granularity: str,
+    to_granularity: str,
+) -> Optional[pd.DataFrame]:
+    """
+    Aggregate cached parsed rows of a finer granularity to a coarser one.
+
+    Returns the same shape get_units_rows_cached produces for to_granularity
+    (parentAsin, childAsin, Units for CHILD/ASIN; parentAsin, Units for PARENT),
+    or None if any row lacks the keys needed: every target shape carries
+    parentAsin, so entries cached before the SKU parser kept parent_asin are a
+    miss for all of them rather than rows with an NA parent.
+    """
+    if _LEVEL.get(from_granularity.upper(), 99) >= _LEVEL.get(to_granularity.upper(), -1):
+        return None
+
+    cols = _SKU_ROW_COLS if from_granularity.upper() == "SKU" else _ASIN_ROW_COLS
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return pd.DataFrame(columns=["parentAsin", "childAsin", "Units"])
+
+    out = pd.DataFrame(
+        {
+            "parentAsin": df[cols["parent"]] if cols["parent"] in df.columns else pd.NA,
+            "childAsin": df[cols["child"]] if cols["child"] in df.columns else pd.NA,
+            "Units": pd.to_numeric(df[cols["units"]], errors="coerce").fillna(0.0),
+        }
+    )
+
+    if out["parentAsin"].isna().any():
+        return None
+    if to_granularity.upper() == "PARENT":
+        return out.groupby("parentAsin", as_index=False)["Units"].sum()
+
+    if out["childAsin"].isna().any():
+        return None
+    return out.groupby(["parentAsin", "childAsin"], as_index=False)["Units"].sum()
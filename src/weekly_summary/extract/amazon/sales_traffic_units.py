@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import dataclasses
 import json
 import os
 import time
-from datetime import date, datetime, timedelta, timezone
+from datetime import date, datetime, timezone
 from pathlib import Path
 from typing import Any, Optional
 
@@ -20,7 +21,16 @@ from weekly_summary.cache.sqlite_cache import (
     put_cache_error,
     put_cached_parsed,
 )
+from weekly_summary.cache.ttl_policy import (
+    get_servable_parsed,
+    get_settled_parsed,
+    policy_for,
+    ttl_seconds_for_range,
+)
 from weekly_summary.extract.amazon.report_utils import download_report_document, wait_for_report
+from weekly_summary.extract.amazon.sales_traffic_rollup import finer_granularities, rollup_rows
+from weekly_summary.instrumentation import record, record_throttle
+from weekly_summary.tracing import TracedClient
 
 REPORT_TYPE = "GET_SALES_AND_TRAFFIC_REPORT"
 
@@ -37,7 +47,7 @@ def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
 
-def _build_reports_client() -> Reports:
+def _build_reports_client() -> TracedClient:
     load_dotenv(override=True)
 
     refresh_token = os.getenv("SPAPI_REFRESH_TOKEN")
@@ -49,13 +59,17 @@ def _build_reports_client() -> Reports:
             "Missing SP-API env vars. Need SPAPI_REFRESH_TOKEN, SPAPI_LWA_APP_ID, SPAPI_LWA_CLIENT_SECRET"
         )
 
-    return Reports(
-        credentials={
-            "refresh_token": refresh_token,
-            "lwa_app_id": lwa_app_id,
-            "lwa_client_secret": lwa_client_secret,
-        },
-        marketplace=Marketplaces.US,
+    # Every Reports call becomes a trace span when tracing is on
+    return TracedClient(
+        "spapi",
+        Reports(
+            credentials={
+                "refresh_token": refresh_token,
+                "lwa_app_id": lwa_app_id,
+                "lwa_client_secret": lwa_client_secret,
+            },
+            marketplace=Marketplaces.US,
+        ),
     )
 
 
@@ -70,6 +84,7 @@ def _create_report_with_backoff(
 ) -> str:
     for attempt in range(1, max_attempts + 1):
         try:
+            record("spapi", api_calls=1)
             res = reports.create_report(
                 reportType=REPORT_TYPE,
                 marketplaceIds=marketplace_ids,
@@ -85,6 +100,7 @@ def _create_report_with_backoff(
         except SellingApiRequestThrottledException:
             wait_s = 30 * attempt
             print(f"Throttled on create_report. Waiting {wait_s}s (attempt {attempt}/{max_attempts})...")
+            record_throttle("spapi", wait_s)
             time.sleep(wait_s)
 
         except SellingApiForbiddenException as e:
@@ -168,16 +184,57 @@ def _parse_units_rows(payload: Any) -> pd.DataFrame:
     return out
 
 
-def _ttl_seconds_for_range(*, start_date: date, end_date: date) -> int:
+def _stable_units_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Make downstream stable: ensure expected columns exist and Units is numeric."""
+    for c in ("parentAsin", "childAsin", "sku"):
+        if c not in df.columns:
+            df[c] = pd.NA
+
+    if "Units" not in df.columns:
+        df["Units"] = 0.0
+    df["Units"] = pd.to_numeric(df["Units"], errors="coerce").fillna(0.0)
+
+    return df
+
+
+def _derive_from_finer_cache(
+    db_path: Path,
+    *,
+    key: CacheKey,
+    report_options: dict[str, str],
+    final_after_days: int,
+    settled_only: bool = False,
+) -> Optional[pd.DataFrame]:
     """
-    TTL policy:
-    - If range ends within the last 2 days (yesterday or today), TTL = 6 hours
-    - Else TTL = 30 days
+    Answer a coarser asinGranularity request by rolling up a cached entry of a
+    finer granularity (same dates, marketplace and dateGranularity).
+    SKU rows sum exactly to child/parent ASIN totals, so no new report is needed.
     """
-    today = date.today()
-    if end_date >= (today - timedelta(days=2)):
-        return 6 * 60 * 60
-    return 30 * 24 * 60 * 60
+    for finer in finer_granularities(report_options["asinGranularity"]):
+        finer_options = {**report_options, "asinGranularity": finer}
+        finer_key = dataclasses.replace(
+            key,
+            report_options_json=json.dumps(finer_options, separators=(",", ":"), sort_keys=True),
+        )
+        cached = get_cached_parsed(
+            db_path, key=finer_key, final_after_days=final_after_days, settled_only=settled_only
+        )
+        if cached is None:
+            continue
+
+        df = rollup_rows(
+            cached.get("rows", []),
+            from_granularity=finer,
+            to_granularity=report_options["asinGranularity"],
+        )
+        if df is not None:
+            print(
+                f"Sales&Traffic (derived from {finer} cache): "
+                f"{key.data_start_date}..{key.data_end_date} options={report_options}"
+            )
+            return _stable_units_frame(df)
+
+    return None
 
 
 def get_units_rows_cached(
@@ -202,28 +259,31 @@ def get_units_rows_cached(
         report_options_json=report_options_json,
     )
 
+    policy = policy_for(REPORT_TYPE)
+
     if debug_cache_status:
         st = get_cache_status(db_path, key=key)
         if st is not None:
             print("Cache status:", st)
 
-    if reuse_cache:
-        cached = get_cached_parsed(db_path, key=key)
-        if cached is not None:
-            rows = cached.get("rows", [])
-            df = pd.DataFrame(rows)
-
-            # Make downstream stable: ensure expected columns exist
-            for c in ("parentAsin", "childAsin", "sku"):
-                if c not in df.columns:
-                    df[c] = pd.NA
-
-            if "Units" not in df.columns:
-                df["Units"] = 0.0
-            df["Units"] = pd.to_numeric(df["Units"], errors="coerce").fillna(0.0)
-
-            return df
+    # Settled entries are served even with reuse_cache=False (see get_servable_parsed)
+    cached = get_servable_parsed(db_path, key=key, reuse_cache=reuse_cache)
+    if cached is not None:
+        record("spapi", cache_hits=1)
+        return _stable_units_frame(pd.DataFrame(cached.get("rows", [])))
+
+    derived = _derive_from_finer_cache(
+        db_path,
+        key=key,
+        report_options=report_options,
+        final_after_days=policy.settle_days,
+        settled_only=not reuse_cache,
+    )
+    if derived is not None:
+        record("spapi", cache_hits=1)
+        return derived
 
+    record("spapi", cache_misses=1)
     reports = _build_reports_client()
 
     start_dt = datetime(start_date.year, start_date.month, start_date.day, tzinfo=timezone.utc)
@@ -236,7 +296,7 @@ def get_units_rows_cached(
     raw: Optional[bytes] = None
     pulled_at_utc = _utc_now_iso()
 
-    ttl_seconds = _ttl_seconds_for_range(start_date=start_date, end_date=end_date)
+    ttl_seconds = ttl_seconds_for_range(REPORT_TYPE, start_date=start_date, end_date=end_date)
 
     try:
         report_id = _create_report_with_backoff(
@@ -248,6 +308,7 @@ def get_units_rows_cached(
         )
         document_id = wait_for_report(reports, report_id)
 
+        record("spapi", api_calls=1)
         doc = reports.get_report_document(reportDocumentId=document_id).payload
         raw = download_report_document(doc)
 
@@ -274,11 +335,17 @@ def get_units_rows_cached(
         return df_rows
 
     except Exception as e:
+        settled = get_settled_parsed(db_path, key=key)
+        if settled is not None:
+            # A failed revision check must not overwrite the settled entry with an ERROR row
+            print(f"Revision check failed for {start_date}..{end_date}, keeping the settled entry: {e}")
+            return _stable_units_frame(pd.DataFrame(settled.get("rows", [])))
+
         put_cache_error(
             db_path,
             key=key,
             error_message=f"{type(e).__name__}: {e} | range={start_date}..{end_date} options={report_options}",
-            ttl_seconds=15 * 60,
+            ttl_seconds=policy.error_ttl_seconds,
             pulled_at_utc=pulled_at_utc,
             report_id=report_id,
             document_id=document_id,
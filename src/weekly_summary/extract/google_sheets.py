@@ -1,16 +1,118 @@
 from __future__ import annotations
 
+import os
+import random
+import re
+import threading
 import time
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
 import httplib2
+from google.auth.exceptions import GoogleAuthError
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from google_auth_httplib2 import AuthorizedHttp
 
+from weekly_summary.cache.sheets_cache import get_cached_header, put_cached_header
+from weekly_summary.instrumentation import record, record_throttle
+from weekly_summary.tracing import span, tracing_enabled
+
 # Read-only scope (safest)
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
+# Drive metadata only: lets us read a spreadsheet's modifiedTime, never its content
+DRIVE_METADATA_SCOPES = ["https://www.googleapis.com/auth/drive.metadata.readonly"]
+
+_SERVICES: Dict[tuple, object] = {}
+_SERVICES_LOCK = threading.Lock()
+# httplib2 connections aren't thread-safe: concurrent readers lease services from a pool
+_SERVICE_POOLS: Dict[str, "_ServicePool"] = {}
+
+_A1_RANGE = re.compile(r"^(?P<sheet>.+)!(?P<c1>[A-Z]+)(?P<r1>\d*):(?P<c2>[A-Z]+)(?P<r2>\d*)$")
+
+
+# Only cell values in batchGet responses (no range echo / majorDimension)
+VALUES_FIELDS_MASK = "valueRanges(values)"
+
+
+@dataclass(frozen=True)
+class SheetRange:
+    spreadsheet_id: str
+    range_name: str  # A1 notation, e.g. "AMZ US!A1:P"
+
+
+@dataclass(frozen=True)
+class ProjectedRange:
+    """
+    Only the named columns of a tab.
+
+    The header row is the first of the top `scan_rows` rows containing
+    `header` (case-insensitive); `columns` are matched against its stripped cells.
+    Key columns (the header column and `text_columns`, e.g. SKU / ASIN) are read
+    as displayed text, so identifiers like "00123" or "1E5" survive; every other
+    column is read unformatted, so numbers arrive as numbers.
+    """
+
+    spreadsheet_id: str
+    sheet_name: str
+    header: str
+    columns: Tuple[str, ...]
+    last_row: Optional[int] = None  # inclusive; None reads to the end of the sheet
+    scan_rows: int = 20
+    text_columns: Tuple[str, ...] = ()
+
+    def is_text_column(self, name: str) -> bool:
+        return name.strip().lower() == self.header.strip().lower() or name in self.text_columns
+
+    @property
+    def range_name(self) -> str:
+        """Stable label (cache key), not A1 notation."""
+        return f"{self.sheet_name}[{'|'.join(self.columns)}]"
+
+
+def column_letter(index: int) -> str:
+    """0-based column index -> A1 column letters (0 -> A, 26 -> AA)."""
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord("A") + rem) + letters
+    return letters
+
+
+def _quote_sheet(sheet_name: str) -> str:
+    return "'" + sheet_name.replace("'", "''") + "'"
+
+
+_ENDPOINT_IDS = (
+    (re.compile(r"/spreadsheets/[^/:?]+"), "/spreadsheets/{id}"),
+    (re.compile(r"/values/.+?(?=:(?:append|clear)$|$)"), "/values/{range}"),  # A1 ranges contain ":"
+    (re.compile(r"/files/[^/?]+"), "/files/{id}"),
+)
+
+
+def _trace_endpoint(uri: str) -> str:
+    """API path with spreadsheet / file IDs and ranges replaced, so spans group per endpoint."""
+    path = re.sub(r"^https?://[^/]+", "", uri).split("?", 1)[0]
+    for pattern, repl in _ENDPOINT_IDS:
+        path = pattern.sub(repl, path)
+    return path
+
+
+class _TracedHttp(AuthorizedHttp):
+    """AuthorizedHttp that records each request as a "sheets" span when tracing is on."""
+
+    def request(self, uri, method="GET", *args, **kwargs):
+        if not tracing_enabled():
+            return super().request(uri, method, *args, **kwargs)
+        with span("sheets", _trace_endpoint(uri), method) as sp:
+            resp, content = super().request(uri, method, *args, **kwargs)
+            sp.set_response(resp.status, bytes=len(content or b""), headers=resp)
+            return resp, content
 
 
 def build_sheets_service(service_account_json_path: str, *, timeout_s: int = 120):
@@ -26,7 +128,7 @@ def build_sheets_service(service_account_json_path: str, *, timeout_s: int = 120
     )
 
     base_http = httplib2.Http(timeout=timeout_s)
-    authed_http = AuthorizedHttp(credentials, http=base_http)
+    authed_http = _TracedHttp(credentials, http=base_http)
 
     return build(
         "sheets",
@@ -36,6 +138,16 @@ def build_sheets_service(service_account_json_path: str, *, timeout_s: int = 120
     )
 
 
+def build_drive_service(service_account_json_path: str, *, timeout_s: int = 60):
+    """Drive v3 client limited to file metadata (used for spreadsheet modifiedTime)."""
+    credentials = Credentials.from_service_account_file(
+        service_account_json_path,
+        scopes=DRIVE_METADATA_SCOPES,
+    )
+    authed_http = _TracedHttp(credentials, http=httplib2.Http(timeout=timeout_s))
+    return build("drive", "v3", http=authed_http, cache_discovery=False)
+
+
 def read_range(
     service,
     spreadsheet_id: str,
@@ -51,6 +163,7 @@ def read_range(
 
     for attempt in range(1, max_attempts + 1):
         try:
+            record("sheets", api_calls=1)
             result = (
                 service.spreadsheets()
                 .values()
@@ -65,8 +178,500 @@ def read_range(
         except (TimeoutError, HttpError) as e:
             last_err = e
             if attempt < max_attempts:
+                record_throttle("sheets", 3 * attempt)
+                time.sleep(3 * attempt)
+            else:
+                raise
+
+    raise TimeoutError(f"Google Sheets read_range failed after {max_attempts} attempts: {last_err}")
+
+
+def get_sheets_service(service_account_json_path: Optional[str] = None):
+    """
+    Process-wide Sheets service for a service account (built on first use).
+
+    Reuses the authorized credentials, discovery client and HTTP connection
+    across every read in the run. Defaults to env GOOGLE_SERVICE_ACCOUNT_JSON.
+    """
+    path = service_account_json_path or os.environ["GOOGLE_SERVICE_ACCOUNT_JSON"]
+    return _shared_service("sheets", path, build_sheets_service)
+
+
+def get_drive_service(service_account_json_path: Optional[str] = None):
+    """Process-wide Drive metadata service (see get_sheets_service)."""
+    path = service_account_json_path or os.environ["GOOGLE_SERVICE_ACCOUNT_JSON"]
+    return _shared_service("drive", path, build_drive_service)
+
+
+def _shared_service(api: str, path: str, builder):
+    with _SERVICES_LOCK:
+        service = _SERVICES.get((api, path))
+        if service is None:
+            service = builder(path)
+            _SERVICES[(api, path)] = service
+        return service
+
+
+def get_spreadsheet_modified_time(spreadsheet_id: str, *, drive_service=None) -> Optional[str]:
+    """
+    The spreadsheet's Drive modifiedTime (RFC 3339), or None if it can't be read
+    (Drive API not enabled, no access, network error). Callers then fall back
+    to comparing content.
+    """
+    try:
+        drive_service = drive_service or get_drive_service()
+        record("sheets", api_calls=1)
+        meta = (
+            drive_service.files()
+            .get(fileId=spreadsheet_id, fields="modifiedTime", supportsAllDrives=True)
+            .execute()
+        )
+        return meta.get("modifiedTime")
+    except (TimeoutError, HttpError, GoogleAuthError, OSError):
+        return None
+
+
+def batch_read_ranges(
+    service,
+    spreadsheet_id: str,
+    range_names: Sequence[str],
+    *,
+    value_render_option: str = "FORMATTED_VALUE",
+    major_dimension: str = "ROWS",
+    max_attempts: int = 3,
+) -> Dict[str, List[List[Any]]]:
+    """
+    Read several ranges of one spreadsheet in a single values.batchGet call.
+    Returns raw cell values keyed by the requested range name. Retries transient errors.
+
+    With value_render_option="UNFORMATTED_VALUE" numbers come back as numbers
+    (dates stay formatted strings).
+    """
+    range_names = list(dict.fromkeys(range_names))
+    last_err: Exception | None = None
+
+    for attempt in range(1, max_attempts + 1):
+        try:
+            record("sheets", api_calls=1)
+            result = (
+                service.spreadsheets()
+                .values()
+                .batchGet(
+                    spreadsheetId=spreadsheet_id,
+                    ranges=range_names,
+                    valueRenderOption=value_render_option,
+                    dateTimeRenderOption="FORMATTED_STRING",
+                    majorDimension=major_dimension,
+                    fields=VALUES_FIELDS_MASK,
+                )
+                .execute()
+            )
+            # valueRanges come back in request order (with normalized range names)
+            value_ranges = result.get("valueRanges", [])
+            return {name: vr.get("values", []) for name, vr in zip(range_names, value_ranges)}
+
+        except (TimeoutError, HttpError) as e:
+            last_err = e
+            if attempt < max_attempts:
+                record_throttle("sheets", 3 * attempt)
                 time.sleep(3 * attempt)
             else:
                 raise
 
-    raise TimeoutError(f"Google Sheets read_range failed after {max_attempts} attempts: {last_err}")
\ No newline at end of file
+    raise TimeoutError(f"Google Sheets batch_read_ranges failed after {max_attempts} attempts: {last_err}")
+
+
+def read_sheet_ranges(
+    ranges: Sequence[SheetRange],
+    *,
+    service=None,
+) -> Dict[SheetRange, List[List[str]]]:
+    """
+    Read every range a run needs with one batchGet round trip per spreadsheet.
+    Uses the process-wide service unless one is given.
+    """
+    service = service or get_sheets_service()
+
+    by_spreadsheet: Dict[str, List[str]] = {}
+    for r in ranges:
+        by_spreadsheet.setdefault(r.spreadsheet_id, []).append(r.range_name)
+
+    out: Dict[SheetRange, List[List[str]]] = {}
+    for spreadsheet_id, range_names in by_spreadsheet.items():
+        values = batch_read_ranges(service, spreadsheet_id, range_names)
+        for name in range_names:
+            out[SheetRange(spreadsheet_id, name)] = values.get(name, [])
+    return out
+
+
+def _find_header(rows: List[List[Any]], needle: str) -> Optional[Tuple[int, Dict[str, int]]]:
+    """(0-based row offset, {stripped header: column index}) of the first row containing needle."""
+    needle = needle.strip().lower()
+    for offset, row in enumerate(rows):
+        cells = ["" if c is None else str(c).strip() for c in row]
+        if needle in (c.lower() for c in cells):
+            positions: Dict[str, int] = {}
+            for idx, cell in enumerate(cells):
+                if cell:
+                    positions.setdefault(cell, idx)
+            return offset, positions
+    return None
+
+
+# (1-based header row, {header cell: column index}, data rows at the last read; 0 = unknown)
+_HeaderHit = Tuple[int, Dict[str, int], int]
+
+
+class _ServicePool:
+    """
+    Sheets services kept across calls and leased to one thread at a time
+    (httplib2 connections aren't thread-safe). Holds as many services as were
+    ever in use at once, i.e. one per concurrent worker.
+    """
+
+    def __init__(self, build: Callable[[], Any]) -> None:
+        self._build = build
+        self._idle: List[Any] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def lease(self) -> Iterator[Any]:
+        with self._lock:
+            service = self._idle.pop() if self._idle else None
+        if service is None:
+            service = self._build()
+        try:
+            yield service
+        finally:
+            with self._lock:
+                self._idle.append(service)
+
+
+def _sheets_service_pool(service_account_json_path: Optional[str] = None) -> _ServicePool:
+    """Process-wide pool of Sheets services for concurrent block reads (see get_sheets_service)."""
+    path = service_account_json_path or os.environ["GOOGLE_SERVICE_ACCOUNT_JSON"]
+    with _SERVICES_LOCK:
+        pool = _SERVICE_POOLS.get(path)
+        if pool is None:
+            pool = _SERVICE_POOLS[path] = _ServicePool(lambda: build_sheets_service(path))
+        return pool
+
+
+def _map_leased(
+    fn: Callable[[Any, Any], Any],
+    jobs: Sequence[Any],
+    *,
+    service=None,
+    pool: Optional[_ServicePool] = None,
+    max_workers: int = 4,
+) -> List[Any]:
+    """fn(service, job) for each job, in order: concurrently on pooled services, or in turn on `service`."""
+
+    def _leased(job: Any) -> Any:
+        with pool.lease() as leased:
+            return fn(leased, job)
+
+    if service is not None and (pool is None or len(jobs) < 2):
+        return [fn(service, job) for job in jobs]
+    if len(jobs) < 2:
+        return [_leased(job) for job in jobs]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as executor:
+        return list(executor.map(_leased, jobs))
+
+
+def _scan_headers(
+    service, spreadsheet_id: str, group: Sequence[ProjectedRange]
+) -> Dict[ProjectedRange, Optional[_HeaderHit]]:
+    """Header row and column positions of each range, from one batchGet of the top rows."""
+    scan = {r: f"{_quote_sheet(r.sheet_name)}!1:{r.scan_rows}" for r in group}
+    head_values = batch_read_ranges(service, spreadsheet_id, list(scan.values()))
+    out: Dict[ProjectedRange, Optional[_HeaderHit]] = {}
+    for r in group:
+        found = _find_header(head_values.get(scan[r], []), r.header)
+        out[r] = (found[0] + 1, found[1], 0) if found is not None else None
+    return out
+
+
+def _row_blocks(r: ProjectedRange, header_row: int, data_rows: int, chunk_rows: int) -> List[Tuple[int, str]]:
+    """
+    (first row, last row or "" for open-ended) of each block to read, header
+    row included. An open-ended range is split by the row count of its last
+    read, with the final block left open so rows added since are still read.
+    """
+    if r.last_row is not None:
+        last, open_ended = r.last_row, False
+    else:
+        last, open_ended = header_row + data_rows, True
+    starts = list(range(header_row, last + 1, chunk_rows)) or [header_row]
+    blocks = [(start, str(min(start + chunk_rows - 1, last))) for start in starts]
+    if open_ended:
+        blocks[-1] = (blocks[-1][0], "")
+    return blocks
+
+
+def _read_projected_columns(
+    spreadsheet_id: str,
+    headers: Dict[ProjectedRange, _HeaderHit],
+    *,
+    service=None,
+    pool: Optional[_ServicePool] = None,
+    chunk_rows: int,
+    max_workers: int,
+) -> Tuple[Dict[ProjectedRange, List[List[Any]]], List[ProjectedRange]]:
+    """
+    Fetch the projected columns of each range from its header row down:
+    one column-major batchGet per render option (text / unformatted) and row
+    block, the batchGets run concurrently on pooled services.
+
+    Returns (rows per range, ranges whose fetched header cells no longer match,
+    i.e. whose header positions are stale).
+    """
+    requests: Dict[Tuple[str, int], List[str]] = {}
+    columns: Dict[ProjectedRange, List[Tuple[str, str, List[Tuple[str, int]]]]] = {}
+    for r, (header_row, positions, data_rows) in headers.items():
+        blocks = _row_blocks(r, header_row, data_rows, chunk_rows)
+        cols = []
+        for name in r.columns:
+            if name not in positions:
+                continue
+            letter = column_letter(positions[name])
+            render = "FORMATTED_VALUE" if r.is_text_column(name) else "UNFORMATTED_VALUE"
+            parts = []
+            for i, (start, end) in enumerate(blocks):
+                a1 = f"{_quote_sheet(r.sheet_name)}!{letter}{start}:{letter}{end}"
+                requests.setdefault((render, i), []).append(a1)
+                # The API drops trailing blanks: pad every block but the last to its full height
+                parts.append((a1, int(end) - start + 1 if i < len(blocks) - 1 else 0))
+            cols.append((name, render, parts))
+        columns[r] = cols
+
+    def _fetch(service, job: Tuple[Tuple[str, int], List[str]]) -> Dict[str, List[List[Any]]]:
+        (render, _), wanted = job
+        return batch_read_ranges(
+            service, spreadsheet_id, wanted, value_render_option=render, major_dimension="COLUMNS"
+        )
+
+    jobs = list(requests.items())
+    fetched: Dict[Tuple[str, str], List[List[Any]]] = {}
+    for ((render, _), _), values in zip(
+        jobs, _map_leased(_fetch, jobs, service=service, pool=pool, max_workers=max_workers)
+    ):
+        fetched.update({(render, a1): v for a1, v in values.items()})
+
+    out: Dict[ProjectedRange, List[List[Any]]] = {}
+    stale: List[ProjectedRange] = []
+    for r, cols in columns.items():
+        data = []
+        for _, render, parts in cols:
+            cells: List[Any] = []
+            for a1, height in parts:
+                part = (fetched.get((render, a1)) or [[]])[0]
+                cells.extend(part + [""] * (height - len(part)))
+            data.append(cells)
+        # The first cell of each column is its header: check the cached positions still hold
+        if any(not d or str(d[0]).strip() != name for (name, _, _), d in zip(cols, data)):
+            stale.append(r)
+            continue
+        data = [d[1:] for d in data]
+        n_rows = max((len(d) for d in data), default=0)
+        rows = [[d[i] if i < len(d) else "" for d in data] for i in range(n_rows)]
+        while rows and all(c == "" for c in rows[-1]):  # padding past a tab that shrank
+            rows.pop()
+        out[r] = [[name for name, _, _ in cols], *rows]
+    return out, stale
+
+
+def read_projected_ranges(
+    ranges: Sequence[ProjectedRange],
+    *,
+    service=None,
+    header_cache_path: Optional[Path] = None,
+    chunk_rows: int = 10000,
+    max_workers: int = 4,
+) -> Dict[ProjectedRange, List[List[Any]]]:
+    """
+    Fetch only the used columns of each range.
+
+    Per spreadsheet: one batchGet locates every header row, then one
+    column-major batchGet per render option fetches just the projected columns
+    (text for key columns, UNFORMATTED_VALUE for the rest; see ProjectedRange).
+
+    With header_cache_path, header positions are kept in that SQLite file and
+    the scan is skipped while they hold: the column reads start at the header
+    row, and a header cell that no longer matches triggers a rescan of that
+    range. A steady-state load is then one request per render option in use
+    (one for the ASIN -> SKU mapping, whose columns are all text).
+
+    Large tabs are read in blocks of chunk_rows rows, like read_range_chunked:
+    a range with last_row is split up front, an open-ended one by the row
+    count cached from its last read. The blocks are fetched concurrently on
+    pooled services (in turn when `service` is given), each retried on its own.
+
+    Returns rows shaped like read_sheet_ranges: [header, *data rows] restricted
+    to the columns found (in requested order); [] if the header row isn't found.
+    """
+    pool = None if service is not None else _sheets_service_pool()
+    service = service or get_sheets_service()
+
+    by_spreadsheet: Dict[str, List[ProjectedRange]] = {}
+    for r in ranges:
+        by_spreadsheet.setdefault(r.spreadsheet_id, []).append(r)
+
+    def _remember(spreadsheet_id: str, found: Dict[ProjectedRange, Optional[_HeaderHit]]) -> None:
+        if header_cache_path is None:
+            return
+        for r, hit in found.items():
+            put_cached_header(
+                header_cache_path,
+                spreadsheet_id=spreadsheet_id,
+                sheet_name=r.sheet_name,
+                header=r.header,
+                header_row=hit[0] if hit is not None else None,
+                positions=hit[1] if hit is not None else None,
+                data_rows=hit[2] if hit is not None else 0,
+            )
+
+    def _read(spreadsheet_id: str, headers: Dict[ProjectedRange, _HeaderHit]):
+        if not headers:
+            return {}, []
+        rows, stale = _read_projected_columns(
+            spreadsheet_id, headers, service=service, pool=pool, chunk_rows=chunk_rows, max_workers=max_workers
+        )
+        # Keep each range's row count, so its next read is split into blocks
+        _remember(spreadsheet_id, {r: (*headers[r][:2], max(len(v) - 1, 0)) for r, v in rows.items()})
+        return rows, stale
+
+    out: Dict[ProjectedRange, List[List[Any]]] = {}
+    for spreadsheet_id, group in by_spreadsheet.items():
+        cached: Dict[ProjectedRange, _HeaderHit] = {}
+        if header_cache_path is not None:
+            for r in group:
+                hit = get_cached_header(
+                    header_cache_path, spreadsheet_id=spreadsheet_id, sheet_name=r.sheet_name, header=r.header
+                )
+                if hit is not None:
+                    cached[r] = hit
+
+        uncached = [r for r in group if r not in cached]
+        scanned = _scan_headers(service, spreadsheet_id, uncached) if uncached else {}
+        _remember(spreadsheet_id, {r: hit for r, hit in scanned.items() if hit is None})
+        out.update({r: [] for r, hit in scanned.items() if hit is None})
+
+        rows, stale = _read(spreadsheet_id, {**cached, **{r: hit for r, hit in scanned.items() if hit is not None}})
+        out.update(rows)
+
+        if stale:
+            # Columns moved since the positions were cached (or the sheet shifted): locate them again
+            rescanned = _scan_headers(service, spreadsheet_id, stale)
+            _remember(spreadsheet_id, rescanned)
+            rows, _ = _read(spreadsheet_id, {r: hit for r, hit in rescanned.items() if hit is not None})
+            out.update({r: rows.get(r, []) for r in stale})
+    return out
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, HttpError):
+        return exc.resp.status in (429, 500, 502, 503, 504)
+    return isinstance(exc, (TimeoutError, OSError))
+
+
+def _used_last_row(
+    service, spreadsheet_id: str, sheet_name: str, column: str, first_row: int
+) -> int:
+    """
+    Last row holding a value in `column` from first_row down (first_row - 1 if
+    none): one narrow read, bounded by the tab's grid like any open-ended range.
+    """
+    record("sheets", api_calls=1)
+    result = (
+        service.spreadsheets()
+        .values()
+        .get(
+            spreadsheetId=spreadsheet_id,
+            range=f"{_quote_sheet(sheet_name)}!{column}{first_row}:{column}",
+            majorDimension="COLUMNS",
+        )
+        .execute()
+    )
+    cells = (result.get("values") or [[]])[0]
+    return first_row + len(cells) - 1
+
+
+def read_range_chunked(
+    spreadsheet_id: str,
+    range_name: str,
+    *,
+    chunk_rows: int = 2000,
+    max_workers: int = 4,
+    max_attempts: int = 5,
+    base_backoff_s: float = 1.0,
+    service_factory: Optional[Callable[[], Any]] = None,
+) -> List[List[str]]:
+    """
+    Read a (possibly open-ended) range like "AMZ US!A1:P" in row blocks fetched concurrently.
+
+    An open-ended range is split by its used rows (the last value in its first
+    column), with the final block left open so rows past that are still read;
+    the tab's grid only bounds that block, as it does read_range. Blocks of
+    chunk_rows are fetched in parallel, each retried on its own with
+    exponential backoff (so one failure doesn't discard the other blocks), and
+    stitched back in order. Returns the same rows read_range would.
+
+    Args:
+        spreadsheet_id: Spreadsheet ID
+        range_name: A1 range with explicit columns ("Sheet!A1:P" or "Sheet!A1:P5000")
+        chunk_rows: Rows per request
+        max_workers: Concurrent requests
+        max_attempts: Attempts per block
+        base_backoff_s: First retry delay; doubles per attempt (with jitter)
+        service_factory: Builds a Sheets service for a worker (default: the
+            process-wide service pool, so services are reused across calls)
+    """
+    m = _A1_RANGE.match(range_name)
+    if not m:
+        raise ValueError(f"Unsupported range for chunked read: {range_name!r}")
+    sheet = m.group("sheet").strip("'")
+    c1, c2 = m.group("c1"), m.group("c2")
+    first_row = int(m.group("r1") or 1)
+    pool = _ServicePool(service_factory) if service_factory is not None else _sheets_service_pool()
+
+    if m.group("r2"):
+        last_row = int(m.group("r2"))
+        if last_row < first_row:
+            return []
+        starts = range(first_row, last_row + 1, chunk_rows)
+        blocks = [(start, min(start + chunk_rows - 1, last_row)) for start in starts]
+    else:
+        with pool.lease() as service:
+            used_last = _used_last_row(service, spreadsheet_id, sheet, c1, first_row)
+        starts = range(first_row, max(used_last, first_row) + 1, chunk_rows)
+        blocks = [(start, start + chunk_rows - 1) for start in starts]
+        blocks[-1] = (blocks[-1][0], None)
+
+    def _fetch(service, block: Tuple[int, Optional[int]]) -> List[List[str]]:
+        start, end = block
+        a1 = f"{_quote_sheet(sheet)}!{c1}{start}:{c2}{end if end is not None else ''}"
+        attempt = 1
+        while True:
+            try:
+                record("sheets", api_calls=1)
+                result = service.spreadsheets().values().get(spreadsheetId=spreadsheet_id, range=a1).execute()
+                rows = result.get("values", [])
+                if end is None:
+                    return rows
+                # Trailing blank rows are omitted by the API; keep row positions aligned
+                return rows + [[] for _ in range(end - start + 1 - len(rows))]
+            except Exception as e:
+                if attempt >= max_attempts or not _is_retryable(e):
+                    raise
+                wait_s = base_backoff_s * 2 ** (attempt - 1) * (1 + random.random() / 2)
+                record_throttle("sheets", wait_s)
+                time.sleep(wait_s)
+                attempt += 1
+
+    parts = _map_leased(_fetch, blocks, pool=pool, max_workers=max_workers)
+
+    values = [row for part in parts for row in part]
+    while values and not values[-1]:
+        values.pop()
+    return values
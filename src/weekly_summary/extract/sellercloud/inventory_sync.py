@@ -0,0 +1,267 @@
+"""
+Local SellerCloud saved-view inventory snapshot.
+
+Each sync pulls the whole view and replaces the snapshot of that view in one
+transaction, so readers see either the previous or the new snapshot, never a
+half-written one. No incremental (modified-since) sync: GetAllByView has no
+documented filter for it, and the view excludes zero inventory, so SKUs that
+drop to zero would never show up in a delta.
+
+On top of the snapshot, pull_view_inventory_cached keeps each view result for
+a short TTL, so report runs repeated within minutes never call SellerCloud.
+"""
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from weekly_summary.cache.sellercloud_view_cache import ViewCacheKey, get_cached_view, put_cached_view
+from weekly_summary.cache.sqlite_cache import _connect
+from weekly_summary.instrumentation import record
+
+try:
+    from .pull_inventory_by_view import SkuQtyAccumulator, _reduce_view
+    from .sellercloud_client import SellerCloudClient
+except ImportError:
+    from weekly_summary.extract.sellercloud.pull_inventory_by_view import SkuQtyAccumulator, _reduce_view
+    from weekly_summary.extract.sellercloud.sellercloud_client import SellerCloudClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = Path("data") / "cache" / "sellercloud.sqlite"
+DEFAULT_CACHE_TTL_MINUTES = 15
+
+
+@dataclass(frozen=True)
+class SyncState:
+    server_id: str
+    view_id: int
+    last_sync_utc: str
+
+
+@dataclass(frozen=True)
+class SyncResult:
+    items_fetched: int
+    snapshot_rows: int
+    removed: int              # SKUs of the previous snapshot no longer in the view
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def init_sellercloud_db(db_path: Path) -> None:
+    with _connect(db_path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sellercloud_inventory_snapshot (
+              server_id TEXT NOT NULL,
+              view_id INTEGER NOT NULL,
+              sku TEXT NOT NULL,
+              qty INTEGER NOT NULL,
+              updated_at_utc TEXT NOT NULL,
+              PRIMARY KEY (server_id, view_id, sku)
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sellercloud_sync_state (
+              server_id TEXT NOT NULL,
+              view_id INTEGER NOT NULL,
+              last_sync_utc TEXT NOT NULL,
+              PRIMARY KEY (server_id, view_id)
+            )
+            """
+        )
+        conn.commit()
+
+
+def get_sync_state(db_path: Path, *, server_id: str, view_id: int) -> Optional[SyncState]:
+    init_sellercloud_db(db_path)
+    with _connect(db_path) as conn:
+        row = conn.execute(
+            """
+            SELECT server_id, view_id, last_sync_utc
+            FROM sellercloud_sync_state
+            WHERE server_id = ? AND view_id = ?
+            """,
+            (server_id, view_id),
+        ).fetchone()
+    return SyncState(**dict(row)) if row else None
+
+
+def load_snapshot(db_path: Path, *, server_id: str, view_id: int) -> pd.DataFrame:
+    """Snapshot in pull_190_welles_inventory's shape: SKU, Welles190Qty (sorted by SKU)."""
+    init_sellercloud_db(db_path)
+    with _connect(db_path) as conn:
+        df = pd.read_sql_query(
+            """
+            SELECT sku AS SKU, qty AS Welles190Qty
+            FROM sellercloud_inventory_snapshot
+            WHERE server_id = ? AND view_id = ?
+            ORDER BY sku
+            """,
+            conn,
+            params=(server_id, view_id),
+        )
+    return df
+
+
+def _replace_snapshot(
+    db_path: Path,
+    *,
+    server_id: str,
+    view_id: int,
+    acc: SkuQtyAccumulator,
+    started_at: datetime,
+) -> SyncResult:
+    df = acc.to_frame()
+    now = started_at.isoformat()
+
+    with _connect(db_path) as conn:
+        previous = {
+            row["sku"]
+            for row in conn.execute(
+                "SELECT sku FROM sellercloud_inventory_snapshot WHERE server_id = ? AND view_id = ?",
+                (server_id, view_id),
+            )
+        }
+        conn.execute(
+            "DELETE FROM sellercloud_inventory_snapshot WHERE server_id = ? AND view_id = ?",
+            (server_id, view_id),
+        )
+        conn.executemany(
+            """
+            INSERT INTO sellercloud_inventory_snapshot (server_id, view_id, sku, qty, updated_at_utc)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            [(server_id, view_id, sku, int(qty), now) for sku, qty in df.itertuples(index=False, name=None)],
+        )
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO sellercloud_sync_state (server_id, view_id, last_sync_utc)
+            VALUES (?, ?, ?)
+            """,
+            (server_id, view_id, now),
+        )
+        conn.commit()
+
+    return SyncResult(
+        items_fetched=acc.items,
+        snapshot_rows=len(df),
+        removed=len(previous - set(df["SKU"])),
+    )
+
+
+def sync_view_inventory(
+    client: SellerCloudClient,
+    *,
+    view_id: int = 187,
+    db_path: Path = DEFAULT_DB_PATH,
+    page_size: int = 50,
+    max_workers: int = 4,
+) -> SyncResult:
+    """
+    Pull a saved view and replace its local snapshot.
+
+    Args:
+        client: Authenticated SellerCloud client
+        view_id: Saved view ID (default: 187)
+        db_path: SQLite file holding the snapshot and sync state
+
+    Returns:
+        SyncResult describing what was fetched and stored
+    """
+    init_sellercloud_db(db_path)
+    started_at = _utc_now()
+    logger.info(f"Syncing view {view_id}")
+    acc = _reduce_view(client, view_id=view_id, page_size=page_size, max_workers=max_workers)
+    result = _replace_snapshot(
+        db_path, server_id=client.server_id, view_id=view_id, acc=acc, started_at=started_at
+    )
+    logger.info(
+        f"Sync of view {view_id}: {result.items_fetched} items fetched, snapshot now "
+        f"{result.snapshot_rows} SKUs ({result.removed} removed)"
+    )
+    return result
+
+
+def pull_view_inventory_synced(
+    server_id: str,
+    username: str,
+    password: str,
+    view_id: int = 187,
+    db_path: Path = DEFAULT_DB_PATH,
+) -> pd.DataFrame:
+    """
+    Drop-in for pull_190_welles_inventory backed by the local snapshot.
+
+    Returns:
+        DataFrame with columns SKU, Welles190Qty (sorted by SKU)
+    """
+    # 429s are paced by the pager's shared backoff, not retried inside the session
+    client = SellerCloudClient(server_id, username, password, retry_rate_limited=False)
+    sync_view_inventory(client, view_id=view_id, db_path=db_path)
+    return load_snapshot(db_path, server_id=server_id, view_id=view_id)
+
+
+def _env_flag(name: str) -> bool:
+    return (os.getenv(name) or "").strip().lower() in ("1", "true", "yes")
+
+
+def pull_view_inventory_cached(
+    server_id: str,
+    username: str,
+    password: str,
+    view_id: int = 187,
+    warehouse_id: str = "",
+    ttl_minutes: Optional[float] = None,
+    force_refresh: Optional[bool] = None,
+    db_path: Path = DEFAULT_DB_PATH,
+) -> pd.DataFrame:
+    """
+    View inventory served from a short-TTL cache, synced from SellerCloud on a miss.
+
+    Args:
+        server_id: SellerCloud server ID
+        username: API username
+        password: API password
+        view_id: Saved view ID (default: 187)
+        warehouse_id: Part of the cache key; "" when the saved view fixes the warehouse
+        ttl_minutes: Max age of a cached result (default: env SELLERCLOUD_CACHE_TTL_MINUTES
+            or 15; 0 disables the cache)
+        force_refresh: Skip the cached result and sync now
+            (default: env SELLERCLOUD_FORCE_REFRESH)
+        db_path: SQLite file holding the cache and the snapshot
+
+    Returns:
+        DataFrame with columns SKU, Welles190Qty (sorted by SKU). Freshness
+        metadata (from_cache, fetched_at_utc, age_s, ttl_s, row_count) is in
+        df.attrs["sellercloud_cache"].
+    """
+    if ttl_minutes is None:
+        ttl_minutes = float(os.getenv("SELLERCLOUD_CACHE_TTL_MINUTES") or DEFAULT_CACHE_TTL_MINUTES)
+    if force_refresh is None:
+        force_refresh = _env_flag("SELLERCLOUD_FORCE_REFRESH")
+    ttl_s = int(ttl_minutes * 60)
+    key = ViewCacheKey(server_id=server_id, view_id=int(view_id), warehouse_id=str(warehouse_id or ""))
+
+    if not force_refresh:
+        cached = get_cached_view(db_path, key=key, ttl_s=ttl_s)
+        if cached is not None:
+            info = cached.attrs["sellercloud_cache"]
+            logger.info(
+                f"View {view_id}: {info['row_count']} SKUs from cache "
+                f"(fetched {info['fetched_at_utc']}, {info['age_s']}s old, TTL {ttl_s}s)"
+            )
+            record("sellercloud", cache_hits=1)
+            return cached
+
+    record("sellercloud", cache_misses=1)
+    df = pull_view_inventory_synced(server_id, username, password, view_id=view_id, db_path=db_path)
+    return put_cached_view(db_path, key=key, df=df, ttl_s=ttl_s)
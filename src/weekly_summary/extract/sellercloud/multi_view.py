@@ -0,0 +1,137 @@
+"""
+Pull several SellerCloud saved views concurrently into one wide frame.
+
+Each configured view (typically one per warehouse) becomes its own quantity
+column, joined on SKU. Views are configured with SELLERCLOUD_VIEWS:
+
+    SELLERCLOUD_VIEWS=190-welles inventory=187@142;overflow inventory=201@150
+
+i.e. "<column>=<view_id>[@<warehouse_id>]" entries separated by ";". The
+warehouse filter lives in the saved view itself; warehouse_id labels the
+entry and keeps its cache key distinct.
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+try:
+    from .inventory_sync import DEFAULT_DB_PATH, pull_view_inventory_cached
+except ImportError:
+    from weekly_summary.extract.sellercloud.inventory_sync import DEFAULT_DB_PATH, pull_view_inventory_cached
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SellerCloudViewSpec:
+    column: str             # output quantity column
+    view_id: int
+    warehouse_id: str = ""  # "" when not recorded
+
+
+DEFAULT_VIEW_SPECS = (SellerCloudViewSpec(column="190-welles inventory", view_id=187, warehouse_id="142"),)
+
+
+def parse_view_specs(value: str) -> List[SellerCloudViewSpec]:
+    """
+    Parse "<column>=<view_id>[@<warehouse_id>];..." into view specs.
+
+    Raises:
+        ValueError: On a malformed entry or a repeated column name
+    """
+    specs: List[SellerCloudViewSpec] = []
+    for entry in value.split(";"):
+        entry = entry.strip()
+        if not entry:
+            continue
+        column, sep, target = entry.rpartition("=")
+        column = column.strip()
+        if not sep or not column:
+            raise ValueError(f"Bad SellerCloud view entry {entry!r}; expected <column>=<view_id>[@<warehouse_id>]")
+        view_part, _, warehouse_id = target.partition("@")
+        try:
+            view_id = int(view_part.strip())
+        except ValueError:
+            raise ValueError(f"Bad view ID in SellerCloud view entry {entry!r}") from None
+        specs.append(SellerCloudViewSpec(column=column, view_id=view_id, warehouse_id=warehouse_id.strip()))
+
+    columns = [s.column for s in specs]
+    dupes = sorted({c for c in columns if columns.count(c) > 1})
+    if dupes:
+        raise ValueError(f"Duplicate SellerCloud view columns: {dupes}")
+    return specs
+
+
+def load_view_specs() -> List[SellerCloudViewSpec]:
+    """View specs from env SELLERCLOUD_VIEWS, else the 190 Welles view (187)."""
+    raw = os.getenv("SELLERCLOUD_VIEWS") or ""
+    specs = parse_view_specs(raw)
+    return specs or list(DEFAULT_VIEW_SPECS)
+
+
+def pull_views_wide(
+    server_id: str,
+    username: str,
+    password: str,
+    specs: Optional[Sequence[SellerCloudViewSpec]] = None,
+    max_workers: Optional[int] = None,
+    db_path: Path = DEFAULT_DB_PATH,
+) -> pd.DataFrame:
+    """
+    Pull every configured view concurrently and join them on SKU.
+
+    Each view goes through the same cache / snapshot path as a single pull, so
+    wall-clock time is that of the slowest view rather than the sum.
+
+    Args:
+        server_id: SellerCloud server ID
+        username: API username
+        password: API password
+        specs: Views to pull (default: load_view_specs())
+        max_workers: Concurrent view pulls (default: one per view)
+        db_path: SQLite file holding the cache and snapshots
+
+    Returns:
+        DataFrame with columns ["sku", <one quantity column per spec>], missing
+        quantities filled with 0. df.attrs["sellercloud_cache"] maps each column
+        to that view's freshness metadata.
+    """
+    specs = list(specs) if specs is not None else load_view_specs()
+    if not specs:
+        raise ValueError("No SellerCloud views configured")
+    columns = [s.column for s in specs]
+
+    def _pull(spec: SellerCloudViewSpec) -> pd.DataFrame:
+        return pull_view_inventory_cached(
+            server_id,
+            username,
+            password,
+            view_id=spec.view_id,
+            warehouse_id=spec.warehouse_id,
+            db_path=db_path,
+        )
+
+    logger.info(f"Pulling {len(specs)} SellerCloud view(s): " + ", ".join(f"{s.column} (view {s.view_id})" for s in specs))
+    with ThreadPoolExecutor(max_workers=max_workers or len(specs)) as pool:
+        frames = list(pool.map(_pull, specs))
+
+    cache_info: Dict[str, Dict[str, object]] = {}
+    series = []
+    for spec, df in zip(specs, frames):
+        cache_info[spec.column] = df.attrs.get("sellercloud_cache", {})
+        qty = pd.to_numeric(df["Welles190Qty"], errors="coerce").fillna(0.0)
+        s = pd.Series(qty.to_numpy(), index=df["SKU"].astype(str).str.strip(), name=spec.column)
+        # If duplicates exist for any reason, take max
+        series.append(s.groupby(level=0).max())
+
+    # One outer join across all views on the SKU index
+    wide = pd.concat(series, axis=1, join="outer").fillna(0.0)
+    wide.index.name = "sku"
+    out = wide.reset_index()[["sku", *columns]]
+    out.attrs["sellercloud_cache"] = cache_info
+    return out
@@ -2,8 +2,20 @@
 Pull inventory from SellerCloud using saved views and normalize to DataFrame.
 """
 import logging
-from typing import List, Dict, Any
+import math
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Any, Optional, Set, Tuple
+import numpy as np
 import pandas as pd
+import requests
+
+from weekly_summary.instrumentation import record_throttle
 
 try:
     from .sellercloud_client import SellerCloudClient
@@ -12,6 +24,249 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+GET_ALL_BY_VIEW = "Inventory/GetAllByView"
+
+
+class _SharedBackoff:
+    """
+    One pause shared by all page workers: when any request is rate limited (429),
+    every worker holds off until the pause ends instead of hammering the API.
+    """
+    
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+    
+    def wait(self) -> None:
+        waited = 0.0
+        while True:
+            with self._lock:
+                delay = self._resume_at - time.monotonic()
+            if delay <= 0:
+                if waited:
+                    record_throttle("sellercloud", waited)
+                return
+            time.sleep(delay)
+            waited += delay
+    
+    def trip(self, seconds: float) -> None:
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+
+def _is_rate_limited(exc: Exception) -> bool:
+    # The paging client does not retry 429 in its session, so it surfaces as an HTTPError
+    response = getattr(exc, "response", None)
+    return response is not None and response.status_code == 429
+
+
+def _retry_after_seconds(exc: Exception, attempt: int) -> float:
+    """Pause from the response's Retry-After (seconds or HTTP date), else exponential."""
+    response = getattr(exc, "response", None)
+    header = response.headers.get("Retry-After") if response is not None else None
+    if header is not None:
+        try:
+            return max(float(header), 1.0)
+        except ValueError:
+            pass
+        try:
+            return max((parsedate_to_datetime(header) - datetime.now(timezone.utc)).total_seconds(), 1.0)
+        except (TypeError, ValueError):
+            pass
+    return min(2.0 ** attempt, 60.0)
+
+
+def _get_view_page(
+    client: SellerCloudClient,
+    *,
+    view_id: int,
+    page_number: int,
+    page_size: int,
+    backoff: _SharedBackoff,
+    max_attempts: int = 5,
+) -> Dict[str, Any]:
+    for attempt in range(1, max_attempts + 1):
+        backoff.wait()
+        logger.debug(f"Fetching page {page_number}")
+        try:
+            # Only pass the 3 required parameters per API documentation
+            response = client.get(
+                GET_ALL_BY_VIEW,
+                params={
+                    "viewID": view_id,
+                    "pageNumber": page_number,
+                    "pageSize": page_size,
+                }
+            )
+        except requests.RequestException as e:
+            if _is_rate_limited(e) and attempt < max_attempts:
+                pause = _retry_after_seconds(e, attempt)
+                logger.warning(f"Rate limited on page {page_number}; pausing all workers {pause:.0f}s")
+                backoff.trip(pause)
+                continue
+            logger.error(f"Failed to fetch page {page_number}: {e}")
+            raise
+        
+        try:
+            return response.json()
+        except ValueError as e:
+            logger.error(f"Invalid JSON response on page {page_number}: {e}")
+            raise
+    
+    raise RuntimeError(f"Exceeded {max_attempts} attempts fetching page {page_number}")
+
+
+def _item_sku(item: Dict[str, Any]) -> str:
+    """Parent SKU (prefer ShadowOf over ManufacturerSKU), stripped; "" if missing."""
+    sku = item.get("ShadowOf") or item.get("ManufacturerSKU")
+    return str(sku or "").strip()
+
+
+@dataclass
+class _PageReduction:
+    """One page reduced to (sku, qty) pairs with positive qty, in item order."""
+    skus: List[str] = field(default_factory=list)
+    qtys: array = field(default_factory=lambda: array("q"))
+    zero_qty: int = 0
+    empty_sku: int = 0
+    bad_items: int = 0
+
+
+def _reduce_page(items: List[Dict[str, Any]]) -> _PageReduction:
+    out = _PageReduction()
+    for item in items:
+        try:
+            qty = int(item.get("InventoryAvailableQty") or 0)
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Error parsing item: {e}")
+            out.bad_items += 1
+            continue
+        
+        sku = _item_sku(item)
+        
+        # Only include items with positive inventory
+        if qty <= 0:
+            out.zero_qty += 1
+            continue
+        if not sku:
+            out.empty_sku += 1
+            continue
+        
+        out.skus.append(sku)
+        out.qtys.append(qty)
+    return out
+
+
+class SkuQtyAccumulator:
+    """
+    Streaming first-occurrence (sku, qty) buffers for a saved view.
+    
+    Pages must be added in page order; each SKU keeps the first positive
+    quantity seen (API returns the same SKU for different channels/variants).
+    Only the typed column buffers and the dedupe set grow with the view.
+    """
+    
+    def __init__(self) -> None:
+        self.skus: List[str] = []
+        self.qtys = array("q")
+        self._seen: Set[str] = set()
+        self.items = 0
+        self.duplicates = 0
+        self.zero_qty = 0
+        self.empty_sku = 0
+        self.bad_items = 0
+    
+    def add(self, page: _PageReduction, n_items: int) -> None:
+        self.items += n_items
+        self.zero_qty += page.zero_qty
+        self.empty_sku += page.empty_sku
+        self.bad_items += page.bad_items
+        
+        seen = self._seen
+        for sku, qty in zip(page.skus, page.qtys):
+            if sku in seen:
+                self.duplicates += 1
+                continue
+            seen.add(sku)
+            self.skus.append(sku)
+            self.qtys.append(qty)
+    
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame with columns SKU, Welles190Qty (sorted by SKU)."""
+        logger.info(f"Processing stats:")
+        logger.info(f"  - Items: {self.items}")
+        logger.info(f"  - Kept: {len(self.skus)} unique SKUs with positive inventory")
+        logger.info(f"  - Skipped (duplicate SKU): {self.duplicates}")
+        logger.info(f"  - Skipped (empty SKU): {self.empty_sku}")
+        logger.info(f"  - Skipped (zero qty): {self.zero_qty}")
+        
+        df = pd.DataFrame(
+            {
+                "SKU": self.skus,
+                "Welles190Qty": np.array(self.qtys, dtype=np.int64),
+            }
+        )
+        # Sort by SKU for consistency
+        return df.sort_values("SKU").reset_index(drop=True)
+
+
+def _reduce_view(
+    client: SellerCloudClient,
+    *,
+    view_id: int,
+    page_size: int,
+    max_workers: int,
+) -> SkuQtyAccumulator:
+    """
+    Fetch every page of a saved view and reduce it as it arrives.
+    
+    Page 1 is fetched alone (it also obtains the token). Its TotalResults gives
+    the page count, and pages 2..N are fetched on a bounded thread pool. Without
+    TotalResults, pages are walked sequentially until a short page, so no empty
+    terminator page is requested either way (except when the last page is exactly full).
+    
+    Each worker reduces its page to (sku, qty) before returning, so the raw JSON
+    is released immediately; reductions are merged in page order.
+    """
+    backoff = _SharedBackoff()
+    acc = SkuQtyAccumulator()
+    
+    def _fetch(page_number: int) -> Tuple[_PageReduction, int, Optional[int]]:
+        data = _get_view_page(
+            client,
+            view_id=view_id,
+            page_number=page_number,
+            page_size=page_size,
+            backoff=backoff,
+        )
+        items = data.get("Items") or []
+        return _reduce_page(items), len(items), data.get("TotalResults")
+    
+    first, n_first, total = _fetch(1)
+    acc.add(first, n_first)
+    n_fetched = 1
+    
+    if total is not None:
+        n_pages = max(1, math.ceil(int(total) / page_size))
+        logger.info(f"TotalResults={total} -> {n_pages} pages ({max_workers} workers)")
+        
+        if n_pages > 1:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+                # map() yields in page order, so first-occurrence dedupe matches a sequential pull
+                for reduced, n_items, _ in pool.map(_fetch, range(2, n_pages + 1)):
+                    acc.add(reduced, n_items)
+            n_fetched = n_pages
+    else:
+        logger.info("No TotalResults in response; paging sequentially")
+        n_last = n_first
+        while n_last >= page_size:
+            n_fetched += 1
+            reduced, n_last, _ = _fetch(n_fetched)
+            acc.add(reduced, n_last)
+    
+    logger.info(f"Pagination complete: {n_fetched} pages, {acc.items} items")
+    return acc
+
 
 def pull_190_welles_inventory(
     server_id: str,
@@ -19,6 +274,7 @@ def pull_190_welles_inventory(
     password: str,
     view_id: int = 187,
     page_size: int = 50,
+    max_workers: int = 4,
 ) -> pd.DataFrame:
     """
     Pull "190 Welles Inventory" from SellerCloud saved view.
@@ -42,6 +298,7 @@ def pull_190_welles_inventory(
         password: API password
         view_id: Saved view ID (default: 187 for "Monday Inventory Report")
         page_size: Items per page (default: 50, max is 50)
+        max_workers: Concurrent page requests after the first page (default: 4)
         
     Returns:
         DataFrame with columns:
@@ -56,100 +313,10 @@ def pull_190_welles_inventory(
     logger.info(f"Pulling from saved view {view_id} (Monday Inventory Report)")
     logger.info(f"Page size: {page_size} (API max: 50)")
     
-    client = SellerCloudClient(server_id, username, password)
-    all_items: List[Dict[str, Any]] = []
-    
-    page_number = 1
-    while True:
-        logger.debug(f"Fetching page {page_number}")
-        
-        try:
-            # Only pass the 3 required parameters per API documentation
-            response = client.get(
-                "Inventory/GetAllByView",
-                params={
-                    "viewID": view_id,
-                    "pageNumber": page_number,
-                    "pageSize": page_size,
-                }
-            )
-        except Exception as e:
-            logger.error(f"Failed to fetch page {page_number}: {e}")
-            raise
-        
-        try:
-            data = response.json()
-        except ValueError as e:
-            logger.error(f"Invalid JSON response on page {page_number}: {e}")
-            raise
-        
-        items = data.get("Items", [])
-        
-        if not items:
-            logger.info(f"Pagination complete at page {page_number}")
-            break
-        
-        logger.debug(f"Page {page_number}: {len(items)} items")
-        all_items.extend(items)
-        page_number += 1
-    
-    logger.info(f"Total items fetched from API: {len(all_items)}")
-    
-    # Extract parent SKU and inventory quantity
-    rows = []
-    stats = {
-        "empty_sku": 0,
-        "zero_qty": 0,
-        "processed": 0,
-    }
-    
-    for item in all_items:
-        try:
-            qty = int(item.get("InventoryAvailableQty") or 0)
-            
-            # Only include items with positive inventory
-            if qty <= 0:
-                stats["zero_qty"] += 1
-                continue
-            
-            # Get parent SKU (prefer ShadowOf over ManufacturerSKU)
-            sku = item.get("ShadowOf") or item.get("ManufacturerSKU")
-            sku = str(sku or "").strip()
-            
-            if not sku:
-                stats["empty_sku"] += 1
-                continue
-            
-            # Add row
-            rows.append({
-                "SKU": sku,
-                "Welles190Qty": qty,
-            })
-            stats["processed"] += 1
-            
-        except (ValueError, TypeError) as e:
-            logger.warning(f"Error parsing item: {e}")
-            continue
-    
-    logger.info(f"Processing stats:")
-    logger.info(f"  - Processed: {stats['processed']} items with positive inventory")
-    logger.info(f"  - Skipped (empty SKU): {stats['empty_sku']}")
-    logger.info(f"  - Skipped (zero qty): {stats['zero_qty']}")
-    
-    # Convert to DataFrame
-    df = pd.DataFrame(rows)
-    
-    logger.info(f"Total rows (before dedup): {len(df)}")
-    
-    # Remove duplicates - keep only FIRST occurrence of each SKU
-    # (API returns same SKU multiple times for different channels/variants)
-    df_dedup = df.drop_duplicates(subset=['SKU'], keep='first')
-    
-    logger.info(f"After removing duplicates: {len(df_dedup)} unique SKUs")
-    logger.info(f"Removed {len(df) - len(df_dedup)} duplicate SKU entries")
-    
-    # Sort by SKU for consistency
-    df_dedup = df_dedup.sort_values("SKU").reset_index(drop=True)
+    # 429s are paced by the pager's shared backoff, not retried inside the session
+    client = SellerCloudClient(server_id, username, password, retry_rate_limited=False)
+    acc = _reduce_view(client, view_id=view_id, page_size=page_size, max_workers=max_workers)
     
-    logger.info(f"Final DataFrame: {len(df_dedup)} rows x {len(df_dedup.columns)} columns")
-    return df_dedup
\ No newline at end of file
+    df = acc.to_frame()
+    logger.info(f"Final DataFrame: {len(df)} rows x {len(df.columns)} columns")
+    return df
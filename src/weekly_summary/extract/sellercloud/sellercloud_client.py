@@ -3,13 +3,34 @@ SellerCloud API client with token-based authentication and retry logic.
 """
 import os
 import logging
+import threading
+import time
+from pathlib import Path
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from typing import Dict, Any, Optional
 
+from weekly_summary.instrumentation import record
+from weekly_summary.tracing import span
+
+try:
+    from .token_cache import DEFAULT_TOKEN_CACHE_PATH, CachedToken, file_lock, read_token, token_cache_key, write_token
+except ImportError:
+    from weekly_summary.extract.sellercloud.token_cache import (
+        DEFAULT_TOKEN_CACHE_PATH,
+        CachedToken,
+        file_lock,
+        read_token,
+        token_cache_key,
+        write_token,
+    )
+
 logger = logging.getLogger(__name__)
 
+# Used when the token response carries no expires_in
+DEFAULT_TOKEN_LIFETIME_S = 3600
+
 
 class SellerCloudClient:
     """
@@ -24,6 +45,9 @@ class SellerCloudClient:
         password: str,
         timeout: int = 30,
         max_retries: int = 3,
+        token_cache_path: Optional[Path] = DEFAULT_TOKEN_CACHE_PATH,
+        refresh_margin_s: int = 300,
+        retry_rate_limited: bool = True,
     ):
         """
         Initialize SellerCloud client.
@@ -34,6 +58,11 @@ class SellerCloudClient:
             password: API password (from environment)
             timeout: Request timeout in seconds (default: 30)
             max_retries: Maximum retry attempts for 429/5xx errors (default: 3)
+            token_cache_path: JSON file shared by processes for reusing tokens
+                (default: data/cache/sellercloud_token.json; None disables it)
+            refresh_margin_s: Refresh the token this many seconds before it expires (default: 300)
+            retry_rate_limited: Retry 429 responses inside the session (default: True). Pass
+                False when the caller paces itself on 429s (e.g. the view pager's shared backoff)
         """
         self.server_id = server_id
         self.username = username
@@ -42,6 +71,12 @@ class SellerCloudClient:
         self.max_retries = max_retries
         self.base_url = f"https://{server_id}.api.sellercloud.com/rest/api"
         self.access_token: Optional[str] = None
+        self.token_expires_at: float = 0.0
+        self.token_cache_path = Path(token_cache_path) if token_cache_path is not None else None
+        self.refresh_margin_s = refresh_margin_s
+        self.retry_rate_limited = retry_rate_limited
+        self._token_key = token_cache_key(server_id, username)
+        self._token_lock = threading.Lock()
         
         # Session with retry strategy for 429 (Too Many Requests) and 5xx errors
         self.session = self._create_session()
@@ -50,12 +85,18 @@ class SellerCloudClient:
         """Create a requests session with retry strategy."""
         session = requests.Session()
         
-        # Retry strategy: retry on 429 and 5xx errors
+        # Retry strategy: retry on 5xx errors, and on 429 unless the caller handles it.
+        # urllib3 also retries any 429 carrying Retry-After when it respects that header,
+        # so both are switched off together.
+        status_forcelist = [500, 502, 503, 504]
+        if self.retry_rate_limited:
+            status_forcelist.insert(0, 429)
         retry_strategy = Retry(
             total=self.max_retries,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=status_forcelist,
             allowed_methods=["GET", "POST"],
             backoff_factor=1.0,  # Exponential backoff: 1s, 2s, 4s, etc.
+            respect_retry_after_header=self.retry_rate_limited,
         )
         
         adapter = HTTPAdapter(max_retries=retry_strategy)
@@ -68,6 +109,8 @@ class SellerCloudClient:
         """
         Fetch a new access token from SellerCloud.
         
+        Sets self.token_expires_at from the response's expires_in.
+        
         Returns:
             Access token string
             
@@ -84,12 +127,15 @@ class SellerCloudClient:
         logger.info(f"Fetching token from {token_url}")
         
         try:
-            response = self.session.post(
-                token_url,
-                json=payload,
-                timeout=self.timeout,
-                verify=True,  # Always verify SSL certificates
-            )
+            with span("sellercloud", "token", "POST") as sp:
+                response = self.session.post(
+                    token_url,
+                    json=payload,
+                    timeout=self.timeout,
+                    verify=True,  # Always verify SSL certificates
+                )
+                sp.set_requests_response(response)
+            record("sellercloud", api_calls=1, bytes_downloaded=len(response.content))
             response.raise_for_status()
         except requests.RequestException as e:
             logger.error(f"Token request failed: {e}")
@@ -100,22 +146,98 @@ class SellerCloudClient:
             token = data.get("access_token")
             if not token:
                 raise ValueError(f"No access_token in response: {data}")
-            logger.info("Token obtained successfully")
+            lifetime = int(data.get("expires_in") or DEFAULT_TOKEN_LIFETIME_S)
+            self.token_expires_at = time.time() + lifetime
+            logger.info(f"Token obtained successfully (expires in {lifetime}s)")
             return token
         except (ValueError, KeyError) as e:
             logger.error(f"Failed to parse token response: {e}")
             raise
     
+    def _token_is_fresh(self) -> bool:
+        return bool(self.access_token) and time.time() + self.refresh_margin_s < self.token_expires_at
+    
     def _ensure_token(self) -> str:
         """
-        Ensure valid access token. Fetch new one if needed.
+        Ensure valid access token, refreshing ahead of expiry.
+        
+        Order: in-memory token -> shared on-disk cache -> /token. The disk cache is
+        re-read under its lock, so concurrent processes fetch at most one new token.
         
         Returns:
             Valid access token
         """
-        if not self.access_token:
-            self.access_token = self._fetch_token()
-        return self.access_token
+        with self._token_lock:
+            if self._token_is_fresh():
+                return self.access_token  # type: ignore[return-value]
+            
+            if self.token_cache_path is None:
+                self.access_token = self._fetch_token()
+                return self.access_token
+            
+            with file_lock(self.token_cache_path):
+                cached = read_token(self.token_cache_path, self._token_key)
+                if cached is not None and cached.valid_for(self.refresh_margin_s):
+                    logger.debug("Using cached SellerCloud token")
+                    self.access_token = cached.access_token
+                    self.token_expires_at = cached.expires_at
+                    return self.access_token
+                
+                self.access_token = self._fetch_token()
+                write_token(
+                    self.token_cache_path,
+                    self._token_key,
+                    CachedToken(access_token=self.access_token, expires_at=self.token_expires_at),
+                )
+                return self.access_token
+    
+    def _invalidate_token(self, rejected: str) -> None:
+        """Drop a token the server rejected (memory and disk, unless already replaced)."""
+        with self._token_lock:
+            if self.access_token == rejected:
+                self.access_token = None
+                self.token_expires_at = 0.0
+            if self.token_cache_path is None:
+                return
+            with file_lock(self.token_cache_path):
+                cached = read_token(self.token_cache_path, self._token_key)
+                if cached is not None and cached.access_token == rejected:
+                    write_token(self.token_cache_path, self._token_key, None)
+    
+    def _request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        """
+        Authenticated request; on 401 the token is invalidated, refreshed and the
+        request retried once.
+        """
+        url = f"{self.base_url}/{endpoint}"
+        
+        for attempt in (1, 2):
+            token = self._ensure_token()
+            headers = {"Authorization": f"Bearer {token}"}
+            
+            try:
+                with span("sellercloud", endpoint, method) as sp:
+                    response = self.session.request(
+                        method,
+                        url,
+                        headers=headers,
+                        timeout=self.timeout,
+                        verify=True,  # Always verify SSL certificates
+                        **kwargs
+                    )
+                    sp.set_requests_response(response)
+                record("sellercloud", api_calls=1, bytes_downloaded=len(response.content))
+                if response.status_code == 401 and attempt == 1:
+                    logger.info(f"{method} {url} returned 401; refreshing token and retrying once")
+                    self._invalidate_token(token)
+                    continue
+                response.raise_for_status()
+                return response
+            except requests.RequestException as e:
+                logger.error(f"{method} request failed: {e}")
+                raise
+        
+        raise RuntimeError("unreachable")
     
     def get(
         self,
@@ -137,26 +259,8 @@ class SellerCloudClient:
         Raises:
             requests.RequestException: If request fails
         """
-        token = self._ensure_token()
-        url = f"{self.base_url}/{endpoint}"
-        headers = {"Authorization": f"Bearer {token}"}
-        
-        logger.debug(f"GET {url} with params {params}")
-        
-        try:
-            response = self.session.get(
-                url,
-                params=params,
-                headers=headers,
-                timeout=self.timeout,
-                verify=True,
-                **kwargs
-            )
-            response.raise_for_status()
-            return response
-        except requests.RequestException as e:
-            logger.error(f"GET request failed: {e}")
-            raise
+        logger.debug(f"GET {self.base_url}/{endpoint} with params {params}")
+        return self._request("GET", endpoint, params=params, **kwargs)
     
     def post(
         self,
@@ -178,23 +282,5 @@ class SellerCloudClient:
         Raises:
             requests.RequestException: If request fails
         """
-        token = self._ensure_token()
-        url = f"{self.base_url}/{endpoint}"
-        headers = {"Authorization": f"Bearer {token}"}
-        
-        logger.debug(f"POST {url} with data {json_data}")
-        
-        try:
-            response = self.session.post(
-                url,
-                json=json_data,
-                headers=headers,
-                timeout=self.timeout,
-                verify=True,
-                **kwargs
-            )
-            response.raise_for_status()
-            return response
-        except requests.RequestException as e:
-            logger.error(f"POST request failed: {e}")
-            raise
\ No newline at end of file
+        logger.debug(f"POST {self.base_url}/{endpoint} with data {json_data}")
+        return self._request("POST", endpoint, json=json_data, **kwargs)
\ No newline at end of file
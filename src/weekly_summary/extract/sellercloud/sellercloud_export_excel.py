@@ -7,7 +7,7 @@ import sys
 from datetime import datetime
 from dotenv import load_dotenv
 import pandas as pd
-from weekly_summary.extract.sellercloud.pull_inventory_by_view import pull_190_welles_inventory
+from weekly_summary.extract.sellercloud.inventory_sync import pull_view_inventory_cached
 
 # Configure logging
 logging.basicConfig(
@@ -37,12 +37,17 @@ def main():
     
     try:
         logger.info("Pulling inventory from SellerCloud...")
-        df = pull_190_welles_inventory(
+        df = pull_view_inventory_cached(
             server_id=server_id,
             username=username,
             password=password,
             view_id=187,
-            page_size=50,
+        )
+        cache_info = df.attrs.get("sellercloud_cache", {})
+        logger.info(
+            f"Data fetched {cache_info.get('fetched_at_utc')} "
+            f"({'from cache' if cache_info.get('from_cache') else 'live'}; "
+            f"SELLERCLOUD_FORCE_REFRESH=1 to bypass)"
         )
         
         # Create output filename with timestamp
@@ -6,7 +6,7 @@ import os
 import logging
 import sys
 from dotenv import load_dotenv
-from weekly_summary.extract.sellercloud.pull_inventory_by_view import pull_190_welles_inventory
+from weekly_summary.extract.sellercloud.inventory_sync import pull_view_inventory_cached
 
 # Configure logging
 logging.basicConfig(
@@ -36,12 +36,17 @@ def main():
     
     try:
         logger.info("Starting inventory pull from Monday Inventory Report (View 187)...")
-        df = pull_190_welles_inventory(
+        df = pull_view_inventory_cached(
             server_id=server_id,
             username=username,
             password=password,
             view_id=187,
-            page_size=50,
+        )
+        cache_info = df.attrs.get("sellercloud_cache", {})
+        logger.info(
+            f"Data fetched {cache_info.get('fetched_at_utc')} "
+            f"({'from cache' if cache_info.get('from_cache') else 'live'}; "
+            f"SELLERCLOUD_FORCE_REFRESH=1 to bypass)"
         )
         
         logger.info(f"\n{'='*70}")
@@ -0,0 +1,129 @@
+"""
+On-disk SellerCloud token cache shared by processes.
+
+Tokens are stored per (server, username) in one JSON file, guarded by an OS
+lock on a companion lock file (fcntl.flock on POSIX, msvcrt.locking on
+Windows), and written atomically so a reader never sees a half-written file.
+The file is created owner-read/write only (0600 on POSIX).
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOKEN_CACHE_PATH = Path("data") / "cache" / "sellercloud_token.json"
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    access_token: str
+    expires_at: float  # unix epoch seconds
+
+    def valid_for(self, seconds: float, now: Optional[float] = None) -> bool:
+        """True if the token is still valid `seconds` from now."""
+        return (now if now is not None else time.time()) + seconds < self.expires_at
+
+
+def token_cache_key(server_id: str, username: str) -> str:
+    """Cache entry key; hashed so the file doesn't list usernames."""
+    return hashlib.sha256(f"{server_id}\n{username}".encode("utf-8")).hexdigest()[:32]
+
+
+def _try_lock(fd: int) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)  # msvcrt locks bytes from the current position
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(path: Path, *, timeout_s: float = 300.0) -> Iterator[None]:
+    """
+    Exclusive cross-process lock on a lock file next to `path`.
+
+    The OS releases the lock when its holder exits or crashes, so there is no
+    stale lock to break. The lock file itself is left in place: deleting it
+    would let a waiter lock an unlinked file while a newcomer locks a new one.
+    timeout_s covers a holder fetching a token through its HTTP retries.
+
+    Raises:
+        TimeoutError: If the lock isn't acquired within timeout_s
+    """
+    lock_path = path.with_name(path.name + ".lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + timeout_s
+
+    fd = os.open(str(lock_path), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        while not _try_lock(fd):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for lock {lock_path}")
+            time.sleep(0.05)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+def _read_all(path: Path) -> Dict[str, Dict[str, object]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else {}
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def read_token(path: Path, key: str) -> Optional[CachedToken]:
+    entry = _read_all(path).get(key)
+    if not isinstance(entry, dict):
+        return None
+    try:
+        return CachedToken(access_token=str(entry["access_token"]), expires_at=float(entry["expires_at"]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def write_token(path: Path, key: str, token: Optional[CachedToken]) -> None:
+    """Store (or with token=None, drop) one entry. Caller must hold file_lock(path)."""
+    data = _read_all(path)
+    if token is None:
+        data.pop(key, None)
+    else:
+        data[key] = {"access_token": token.access_token, "expires_at": token.expires_at}
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    # Bearer tokens: owner-only from the first byte written, then renamed into place
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(json.dumps(data))
+    os.chmod(tmp, 0o600)  # the mode above only applies when the file is newly created
+    os.replace(tmp, path)
@@ -1,38 +1,83 @@
 from __future__ import annotations
 
-import os
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
 import pandas as pd
 
-from weekly_summary.extract.google_sheets import build_sheets_service, read_range
+from weekly_summary.cache.sheets_cache import (
+    DEFAULT_SHEETS_CACHE_PATH,
+    SheetFrameKey,
+    get_cached_sheet_frame,
+    put_cached_sheet_frame,
+    values_sha256,
+)
+from weekly_summary.extract.google_sheets import (
+    ProjectedRange,
+    SheetRange,
+    get_spreadsheet_modified_time,
+    read_projected_ranges,
+    read_sheet_ranges,
+)
+from weekly_summary.instrumentation import record
 from weekly_summary.transform.gsheets_to_df import values_to_dataframe  # keep your current filename
-from weekly_summary.transform.gross_net_clean import clean_gross_net_df
 from weekly_summary.transform.gross_net_select import select_gross_net_mapping
 
 
 SPREADSHEET_ID = "1lJvclI4hgSYRpBTmVMJjQLfKmLzD7xCDqD_BuzYEt-0"
 RANGE_NAME = "AMZ US!A1:P"  # adjust if needed
 
+# Weights & Dims spreadsheet, Master Carton tab (header row is not the first row)
+MASTER_CARTON_SPREADSHEET_ID = "1J4hIViDyNEIBmZsrR1yGoK-a70Mhh0kRtUcnJZ7qEck"
+MASTER_CARTON_RANGE_NAME = "Master Carton!A1:Z60"
+MASTER_CARTON_HEADER = "Mini SKU:"
 
-def load_asin_sku_mapping(
+# Bump a kind's version whenever its parse output changes (parse function,
+# values_to_dataframe, cleaning); cached frames of another version are re-parsed
+PARSER_VERSIONS: Dict[str, str] = {
+    "asin_sku": "2",  # 2: values_to_dataframe infers column dtypes
+}
+
+# Only the columns the mapping uses are fetched; identifiers as displayed text, the rest typed
+ASIN_SKU_COLUMNS = ("SKU", "ASIN")
+KEY_TEXT_COLUMNS = ("SKU", "ASIN", "Mini SKU")
+MASTER_CARTON_COLUMNS = ("Mini SKU:", "Qty per Master:")
+
+
+def gross_net_projection(
     spreadsheet_id: str = SPREADSHEET_ID,
     range_name: str = RANGE_NAME,
-) -> pd.DataFrame:
-    """
-    Returns a dataframe with columns: ASIN, SKU
-    Pulled from your Gross&Net Google Sheet.
-    """
-    sa_path = os.environ["GOOGLE_SERVICE_ACCOUNT_JSON"]
-    service = build_sheets_service(sa_path)
+    columns: Tuple[str, ...] = ASIN_SKU_COLUMNS,
+) -> ProjectedRange:
+    return ProjectedRange(
+        spreadsheet_id=spreadsheet_id,
+        sheet_name=range_name.split("!", 1)[0].strip("'"),
+        header="SKU",
+        columns=tuple(columns),
+        text_columns=KEY_TEXT_COLUMNS,
+    )
+
 
-    values = read_range(service, spreadsheet_id, range_name)
+GROSS_NET_RANGE = gross_net_projection()
+MASTER_CARTON_RANGE = ProjectedRange(
+    spreadsheet_id=MASTER_CARTON_SPREADSHEET_ID,
+    sheet_name="Master Carton",
+    header=MASTER_CARTON_HEADER,
+    columns=MASTER_CARTON_COLUMNS,
+    last_row=60,
+    scan_rows=60,  # same window the full A1:Z60 read used to search for the header
+)
 
+
+def asin_sku_mapping_from_values(values: List[List[str]]) -> pd.DataFrame:
+    """ASIN, SKU mapping from Gross & Net sheet values (full block or SKU/ASIN projection)."""
     # Drop leading empty rows so header parsing doesn't fail
     while values and (not values[0] or all(str(x).strip() == "" for x in values[0])):
         values = values[1:]
 
+    # Only SKU/ASIN are used: no whitespace / money cleanup over the other columns
     df_raw = values_to_dataframe(values)
-    df_clean = clean_gross_net_df(df_raw)
-    mapping = select_gross_net_mapping(df_clean)
+    mapping = select_gross_net_mapping(df_raw, columns=list(ASIN_SKU_COLUMNS))
 
     # Normalize to exactly ASIN + SKU columns
     mapping = mapping[["ASIN", "SKU"]].copy()
@@ -40,3 +85,87 @@ def load_asin_sku_mapping(
     mapping["SKU"] = mapping["SKU"].astype(str).str.strip()
 
     return mapping
+
+
+def load_parsed_ranges(
+    parsers: Dict[Union[SheetRange, ProjectedRange], Tuple[str, Callable[[List[List[str]]], pd.DataFrame]]],
+    *,
+    service=None,
+    db_path: Path = DEFAULT_SHEETS_CACHE_PATH,
+    use_cache: bool = True,
+) -> Dict[Union[SheetRange, ProjectedRange], pd.DataFrame]:
+    """
+    Parsed frames for several sheet ranges, skipping unchanged sheets.
+
+    `parsers` maps each range to (kind, parse_fn); the kind's PARSER_VERSIONS
+    entry (default "1") is part of the cache key. A cached frame is returned
+    without downloading when the spreadsheet's Drive modifiedTime matches the
+    one it was cached at. Otherwise the ranges are fetched (SheetRange: one
+    batchGet per spreadsheet; ProjectedRange: only its columns, with header
+    positions cached in the same db_path), and a frame is only re-parsed if the
+    raw values' hash changed.
+
+    Ranges needed together belong in one call: that is what batches their
+    reads. The pipeline's only reference load today is the ASIN -> SKU
+    mapping (load_asin_sku_mapping).
+    """
+    modified = {sid: get_spreadsheet_modified_time(sid) for sid in {r.spreadsheet_id for r in parsers}}
+
+    def _key(r: Union[SheetRange, ProjectedRange], kind: str) -> SheetFrameKey:
+        return SheetFrameKey(r.spreadsheet_id, r.range_name, kind, PARSER_VERSIONS.get(kind, "1"))
+
+    out: Dict[Union[SheetRange, ProjectedRange], pd.DataFrame] = {}
+    stale = {}
+    for r, (kind, _) in parsers.items():
+        cached = get_cached_sheet_frame(db_path, key=_key(r, kind))
+        mtime = modified[r.spreadsheet_id]
+        if use_cache and cached is not None and mtime is not None and cached.modified_time == mtime:
+            out[r] = cached.df
+            record("sheets", cache_hits=1)
+        else:
+            stale[r] = cached if use_cache else None
+            record("sheets", cache_misses=1)
+
+    if stale:
+        plain = [r for r in stale if isinstance(r, SheetRange)]
+        projected = [r for r in stale if isinstance(r, ProjectedRange)]
+        values: Dict = {}
+        if plain:
+            values.update(read_sheet_ranges(plain, service=service))
+        if projected:
+            values.update(read_projected_ranges(projected, service=service, header_cache_path=db_path))
+        for r, cached in stale.items():
+            kind, parse = parsers[r]
+            digest = values_sha256(values[r])
+            df = cached.df if cached is not None and cached.content_sha256 == digest else parse(values[r])
+            put_cached_sheet_frame(
+                db_path,
+                key=_key(r, kind),
+                df=df,
+                content_sha256=digest,
+                modified_time=modified[r.spreadsheet_id],
+            )
+            out[r] = df
+    return out
+
+
+def load_asin_sku_mapping(
+    spreadsheet_id: str = SPREADSHEET_ID,
+    range_name: str = RANGE_NAME,
+    *,
+    service: Optional[object] = None,
+    use_cache: bool = True,
+    db_path: Path = DEFAULT_SHEETS_CACHE_PATH,
+) -> pd.DataFrame:
+    """
+    Returns a dataframe with columns: ASIN, SKU
+    Pulled from your Gross&Net Google Sheet (cached while the sheet is unchanged).
+    """
+    sheet_range = gross_net_projection(spreadsheet_id, range_name)
+    frames = load_parsed_ranges(
+        {sheet_range: ("asin_sku", asin_sku_mapping_from_values)},
+        service=service,
+        use_cache=use_cache,
+        db_path=db_path,
+    )
+    return frames[sheet_range]
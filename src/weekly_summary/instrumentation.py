@@ -0,0 +1,168 @@
+"""
+Run instrumentation: per-stage timings and per-extractor I/O counters.
+
+A run is recorded between instrumented_run() enter/exit. Pipeline stages
+report wall time, CPU time and rows in/out; extractors (SP-API, SellerCloud,
+Google Sheets) count API calls, bytes downloaded, throttle waits and cache
+hits through record(), which is a no-op when no run is being recorded.
+
+The finished report is plain JSON: written next to the run's output and
+appended to data/run_reports/history.jsonl so runs can be compared.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+DEFAULT_RUN_REPORT_DIR = Path("data") / "run_reports"
+DEFAULT_HISTORY_PATH = DEFAULT_RUN_REPORT_DIR / "history.jsonl"
+
+EXTRACTOR_COUNTERS = (
+    "api_calls",
+    "bytes_downloaded",
+    "throttle_waits",
+    "throttle_wait_s",
+    "cache_hits",
+    "cache_misses",
+)
+
+
+@dataclass(frozen=True)
+class StageMetrics:
+    name: str
+    wall_s: float
+    cpu_s: float        # CPU time of the thread that ran the stage
+    rows_in: int
+    rows_out: int
+    from_store: bool = False
+
+
+class RunRecorder:
+    """Thread-safe collector for one run; stages and extractors report into it."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.started_at_utc = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+        self._t0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        self._lock = threading.Lock()
+        self._stages: List[StageMetrics] = []
+        self._extractors: Dict[str, Dict[str, float]] = {}
+        self.wall_s: Optional[float] = None
+        self.cpu_s: Optional[float] = None
+
+    def count(self, extractor: str, **deltas: float) -> None:
+        unknown = set(deltas) - set(EXTRACTOR_COUNTERS)
+        if unknown:
+            raise ValueError(f"Unknown extractor counter(s): {sorted(unknown)}")
+        with self._lock:
+            counters = self._extractors.setdefault(extractor, dict.fromkeys(EXTRACTOR_COUNTERS, 0))
+            for k, v in deltas.items():
+                counters[k] += v
+
+    def stage(self, metrics: StageMetrics) -> None:
+        with self._lock:
+            self._stages.append(metrics)
+
+    def finish(self) -> None:
+        self.wall_s = time.perf_counter() - self._t0
+        self.cpu_s = time.process_time() - self._cpu0
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            extractors = {
+                name: {k: (round(v, 3) if k == "throttle_wait_s" else int(v)) for k, v in counters.items()}
+                for name, counters in sorted(self._extractors.items())
+            }
+            stages = [asdict(s) for s in self._stages]
+        return {
+            "run": self.name,
+            "started_at_utc": self.started_at_utc,
+            "wall_s": round(self.wall_s if self.wall_s is not None else time.perf_counter() - self._t0, 3),
+            "cpu_s": round(self.cpu_s if self.cpu_s is not None else time.process_time() - self._cpu0, 3),
+            "stages": [{k: (round(v, 3) if isinstance(v, float) else v) for k, v in s.items()} for s in stages],
+            "extractors": extractors,
+        }
+
+
+_ACTIVE: Optional[RunRecorder] = None
+
+
+@contextmanager
+def instrumented_run(name: str) -> Iterator[RunRecorder]:
+    """Record everything reported during the block into a new RunRecorder."""
+    global _ACTIVE
+    previous, recorder = _ACTIVE, RunRecorder(name)
+    _ACTIVE = recorder
+    try:
+        yield recorder
+    finally:
+        recorder.finish()
+        _ACTIVE = previous
+
+
+def record(extractor: str, **deltas: float) -> None:
+    """Add to an extractor's counters (api_calls=1, bytes_downloaded=n, cache_hits=1, ...)."""
+    recorder = _ACTIVE
+    if recorder is not None:
+        recorder.count(extractor, **deltas)
+
+
+def record_throttle(extractor: str, wait_s: float) -> None:
+    record(extractor, throttle_waits=1, throttle_wait_s=wait_s)
+
+
+def record_stage(metrics: StageMetrics) -> None:
+    recorder = _ACTIVE
+    if recorder is not None:
+        recorder.stage(metrics)
+
+
+def write_run_report(
+    report: Dict[str, Any],
+    path: Path,
+    *,
+    history_path: Optional[Path] = DEFAULT_HISTORY_PATH,
+) -> Path:
+    """Write the report as JSON to `path` and append it as one line to the run history."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if history_path is not None:
+        history_path.parent.mkdir(parents=True, exist_ok=True)
+        with history_path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps({**report, "report_path": str(path)}, separators=(",", ":")) + "\n")
+    return path
+
+
+def default_report_path(run_name: str, directory: Path = DEFAULT_RUN_REPORT_DIR) -> Path:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return directory / f"{run_name.replace('.', '_')}_{stamp}.json"
+
+
+def format_run_summary(report: Dict[str, Any]) -> str:
+    """Console table of a run report."""
+    lines = [f"Run {report['run']}: {report['wall_s']:.1f}s wall, {report['cpu_s']:.1f}s CPU"]
+    if report["stages"]:
+        lines.append(f"  {'stage':<18} {'wall s':>8} {'cpu s':>8} {'rows in':>9} {'rows out':>9}")
+        for s in report["stages"]:
+            stored = "  (stored)" if s["from_store"] else ""
+            lines.append(
+                f"  {s['name']:<18} {s['wall_s']:>8.2f} {s['cpu_s']:>8.2f} {s['rows_in']:>9} {s['rows_out']:>9}{stored}"
+            )
+    if report["extractors"]:
+        lines.append(
+            f"  {'extractor':<18} {'calls':>8} {'MB down':>8} {'throttled':>9} {'wait s':>8} {'hits':>6} {'misses':>6}"
+        )
+        for name, c in report["extractors"].items():
+            lines.append(
+                f"  {name:<18} {c['api_calls']:>8} {c['bytes_downloaded'] / 1e6:>8.2f} {c['throttle_waits']:>9} "
+                f"{c['throttle_wait_s']:>8.1f} {c['cache_hits']:>6} {c['cache_misses']:>6}"
+            )
+    return "\n".join(lines)
@@ -0,0 +1,344 @@
+"""
+The weekly summary pipeline: one definition shared by the console report
+(run.py), the Excel export and any later consumer.
+
+Every stage output is kept as a content-hashed artifact in
+data/cache/pipeline_artifacts.sqlite. A stage's key is built from its name,
+version, source fingerprint and the content hashes of its inputs, so a
+second consumer on the same day reads the stored frames instead of
+extracting and recomputing them.
+
+Stages:
+  restock          Restock raw file -> current stock      (fingerprint: raw file sha256)
+  asin_sku_mapping Gross & Net ASIN -> SKU                 (source; own Drive-modifiedTime cache)
+  sellercloud      SellerCloud views, wide                 (source; own TTL cache)
+  sales_windows    Units Ordered windows, incremental      (fingerprint: end date; input: mapping;
+                                                            max age: recheck TTL while unsettled)
+  report           final merged frame                      (inputs: all of the above)
+
+Source stages without a fingerprint always run (they are cheap when their
+own cache is warm) and are content-hashed, so downstream stages still hit
+their stored artifacts when the source data did not change. While the end
+date is unsettled, a stored sales_windows frame is only reused for as long
+as the SP-API cache would keep that day's report (its recheck TTL): a
+console run followed by an export shares one frame, a run hours later
+picks up Amazon's revisions.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from weekly_summary.cache.artifact_store import (
+    DEFAULT_ARTIFACTS_PATH,
+    Artifact,
+    file_sha256,
+    frame_sha256,
+    get_artifact,
+    prune_artifacts,
+    put_artifact,
+    stage_key,
+)
+from weekly_summary.cache.ttl_policy import ttl_seconds_for_range
+from weekly_summary.extract.amazon.pull_restock_inventory import pull_restock_inventory_raw
+from weekly_summary.extract.amazon.sales_traffic_by_window import REPORT_TYPE as SALES_TRAFFIC_REPORT_TYPE
+from weekly_summary.extract.sellercloud.multi_view import pull_views_wide
+from weekly_summary.helpers.asin_sku_mapping import load_asin_sku_mapping
+from weekly_summary.instrumentation import StageMetrics, record_stage
+from weekly_summary.stage_runner import Stage, StageRun, run_stages
+from weekly_summary.transform.current_stock import compute_current_stock
+from weekly_summary.transform.loc_keys import build_loc_key_resolver
+from weekly_summary.transform.restock_history import ingest_restock_archive
+from weekly_summary.transform.restock_inventory import load_and_normalize_restock
+from weekly_summary.transform.sales_windows_incremental import compute_sku_sales_windows_incremental
+
+DEFAULT_SPAPI_DB_PATH = Path("data") / "cache" / "spapi_reports.sqlite"
+ARTIFACT_RETENTION_DAYS = 14
+
+REPORT_WINDOW_COLS = [
+    "1 Day",
+    "7 Days",
+    "8-14",
+    "15-21",
+    "22-28",
+    "1-28",
+    "29-56",
+    "57-84",
+    "4 Week Avg",
+    "3 Month Avg",
+]
+INVENTORY_COLS = [
+    "inventory_available",
+    "fc_transfer",
+    "fc_processing",
+    "inbound",
+    "current_stock_per_6",
+]
+
+
+@dataclass(frozen=True)
+class PipelineStage:
+    name: str
+    build: Callable[..., pd.DataFrame]               # called with the input frames, in `inputs` order
+    inputs: Tuple[str, ...] = ()
+    fingerprint: Optional[Callable[[], str]] = None  # identity of the stage's external source
+    version: str = "1"                               # bump when build() output changes for the same inputs
+    max_age_s: Optional[int] = None                  # stored artifacts older than this are rebuilt
+
+    @property
+    def memoized(self) -> bool:
+        # Source stages without a fingerprint cannot be keyed before they run
+        return self.fingerprint is not None or bool(self.inputs)
+
+
+@dataclass(frozen=True)
+class WeeklyReport:
+    df_final: pd.DataFrame
+    output_cols: List[str]
+    end_date: date
+    artifacts: Dict[str, Artifact]
+    stage_run: StageRun
+
+
+def run_pipeline(
+    stages: List[PipelineStage],
+    *,
+    artifacts_path: Path = DEFAULT_ARTIFACTS_PATH,
+    refresh: bool = False,
+    max_workers: Optional[int] = None,
+) -> Tuple[Dict[str, Artifact], StageRun]:
+    """
+    Run `stages` on the stage runner, reusing stored artifacts where the key matches.
+
+    refresh=True recomputes every stage and overwrites its artifact; a stage's
+    max_age_s does the same for its artifact once it is older than that.
+    """
+
+    def _resolve(stage: PipelineStage, inputs: Tuple[Artifact, ...]) -> Artifact:
+        if not stage.memoized:
+            # Not stored: the source has its own cache; the hash keys downstream stages
+            df = stage.build(*[a.df for a in inputs])
+            return Artifact(stage=stage.name, key_sha256="", content_sha256=frame_sha256(df), df=df)
+
+        key = stage_key(
+            stage.name,
+            version=stage.version,
+            fingerprint=stage.fingerprint() if stage.fingerprint is not None else None,
+            input_shas=[a.content_sha256 for a in inputs],
+        )
+        if not refresh:
+            cached = get_artifact(artifacts_path, stage=stage.name, key_sha256=key)
+            if cached is not None and stage.max_age_s is not None:
+                built_at = datetime.fromisoformat(cached.created_at_utc)
+                age_s = (datetime.now(timezone.utc) - built_at).total_seconds()
+                if age_s > stage.max_age_s:
+                    print(f"{stage.name}: stored artifact is {age_s / 3600:.1f}h old, rebuilding")
+                    cached = None
+            if cached is not None:
+                print(f"{stage.name}: reusing artifact {cached.content_sha256[:12]} from {cached.created_at_utc}")
+                return cached
+        return put_artifact(artifacts_path, stage=stage.name, key_sha256=key, df=stage.build(*[a.df for a in inputs]))
+
+    def _memo(stage: PipelineStage) -> Callable[..., Artifact]:
+        def _run(*inputs: Artifact) -> Artifact:
+            t0, cpu0 = time.perf_counter(), time.thread_time()
+            artifact = _resolve(stage, inputs)
+            record_stage(
+                StageMetrics(
+                    name=stage.name,
+                    wall_s=time.perf_counter() - t0,
+                    cpu_s=time.thread_time() - cpu0,
+                    rows_in=sum(len(a.df) for a in inputs),
+                    rows_out=len(artifact.df),
+                    from_store=artifact.from_store,
+                )
+            )
+            return artifact
+
+        return _run
+
+    run = run_stages([Stage(s.name, _memo(s), inputs=s.inputs) for s in stages], max_workers=max_workers)
+
+    keep_since = datetime.now(timezone.utc) - timedelta(days=ARTIFACT_RETENTION_DAYS)
+    prune_artifacts(artifacts_path, keep_since_utc=keep_since.replace(microsecond=0).isoformat())
+    return run.results, run
+
+
+def assemble_report(
+    df_amz: pd.DataFrame,
+    mapping: pd.DataFrame,
+    sc_df: pd.DataFrame,
+    df_sales_windows: pd.DataFrame,
+) -> pd.DataFrame:
+    """
+    Amazon current stock + SKU mapping + SellerCloud quantities + Units Ordered windows.
+
+    The frame's attrs["output_cols"] lists the report columns in display order.
+    """
+    df_amz = (
+        df_amz.merge(
+            mapping[["ASIN", "SKU"]],
+            left_on="asin",
+            right_on="ASIN",
+            how="left",
+        )
+        .rename(columns={"SKU": "sku"})
+        .drop(columns=["ASIN"])
+    )
+    df_amz["sku"] = df_amz["sku"].astype(str).str.strip()
+    df_amz["asin"] = df_amz["asin"].astype(str).str.strip()
+
+    sc_cols = [c for c in sc_df.columns if c != "sku"]
+    df_final = df_amz.merge(sc_df, on="sku", how="left")
+    df_final[sc_cols] = df_final[sc_cols].fillna(0.0)
+
+    # IMPORTANT: merge on BOTH sku and asin (LOC rows have asin+'-loc' + sku+'-LOC')
+    # Outer merge keeps LOC-only sales rows even if they don't exist in inventory feeds.
+    df_sales_windows = df_sales_windows.copy()
+    df_sales_windows["sku"] = df_sales_windows["sku"].astype(str).str.strip()
+    df_sales_windows["asin"] = df_sales_windows["asin"].astype(str).str.strip()
+
+    df_final = df_final.merge(df_sales_windows, on=["sku", "asin"], how="outer")
+
+    # Outer merge introduces sales-only LOC rows; fill numeric columns for clean display
+    for c in [*REPORT_WINDOW_COLS, *INVENTORY_COLS, *sc_cols]:
+        if c in df_final.columns:
+            df_final[c] = df_final[c].fillna(0)
+
+    output_cols = ["sku", "asin", *INVENTORY_COLS, *sc_cols, *REPORT_WINDOW_COLS]
+    df_final.attrs = {"output_cols": [c for c in output_cols if c in df_final.columns]}
+    return df_final
+
+
+def weekly_report_stages(
+    *,
+    end_date: date,
+    server_id: str,
+    username: str,
+    password: str,
+    reuse_cache: bool = False,
+    db_path: Path = DEFAULT_SPAPI_DB_PATH,
+) -> List[PipelineStage]:
+    """Stage definitions for the weekly report (see module docstring)."""
+
+    @functools.lru_cache(maxsize=1)
+    def _restock_raw() -> Path:
+        pulled = pull_restock_inventory_raw(reuse_if_exists=True)
+        print(f"Using restock raw: {pulled.raw_path}")
+
+        # Keep the snapshot history current (files already ingested are skipped by hash).
+        # Done here, not in _restock: that build is skipped when its artifact is stored.
+        ingest_restock_archive(db_path)
+        return pulled.raw_path
+
+    def _restock() -> pd.DataFrame:
+        df_restock = load_and_normalize_restock(_restock_raw())
+        print("Restock normalized rows:", len(df_restock))
+        return compute_current_stock(df_restock)
+
+    def _mapping() -> pd.DataFrame:
+        mapping = load_asin_sku_mapping()
+        print("ASIN->SKU mapping rows:", len(mapping))
+        return mapping[["ASIN", "SKU"]]
+
+    def _sellercloud() -> pd.DataFrame:
+        print("Pulling inventory from SellerCloud (Inventory/GetAllByView)...")
+        # One quantity column per configured view (SELLERCLOUD_VIEWS), pulled concurrently
+        sc_df = pull_views_wide(server_id=server_id, username=username, password=password)
+        print("SellerCloud rows:", len(sc_df))
+        for col, info in sc_df.attrs.get("sellercloud_cache", {}).items():
+            source = f"cache, {info.get('age_s')}s old" if info.get("from_cache") else "live"
+            print(f"SellerCloud {col!r} fetched {info.get('fetched_at_utc')} ({source})")
+        # Freshness metadata changes on every read; keep it out of the content hash
+        sc_df.attrs = {}
+        return sc_df
+
+    def _sales_windows(mapping: pd.DataFrame) -> pd.DataFrame:
+        print("Computing Amazon Sales & Traffic windows (Units Ordered) from the window state...")
+        return compute_sku_sales_windows_incremental(
+            end_date=end_date,
+            asin_sku_map=mapping,
+            db_path=db_path,
+            reuse_cache=reuse_cache,
+            resolver=build_loc_key_resolver(mapping),
+        )
+
+    # None once end_date has settled: the frame is then final
+    windows_max_age_s = ttl_seconds_for_range(
+        SALES_TRAFFIC_REPORT_TYPE, start_date=end_date, end_date=end_date
+    )
+
+    return [
+        PipelineStage("restock", _restock, fingerprint=lambda: file_sha256(_restock_raw())),
+        PipelineStage("asin_sku_mapping", _mapping),
+        PipelineStage("sellercloud", _sellercloud),
+        PipelineStage(
+            "sales_windows",
+            _sales_windows,
+            inputs=("asin_sku_mapping",),
+            fingerprint=lambda: end_date.isoformat(),
+            max_age_s=windows_max_age_s,
+        ),
+        PipelineStage(
+            "report",
+            assemble_report,
+            inputs=("restock", "asin_sku_mapping", "sellercloud", "sales_windows"),
+        ),
+    ]
+
+
+def _sellercloud_env() -> Tuple[str, str, str]:
+    server_id = os.getenv("SELLERCLOUD_SERVER_ID") or os.getenv("SELLERCLOUD_SERVER")
+    username = os.getenv("SELLERCLOUD_USERNAME")
+    password = os.getenv("SELLERCLOUD_PASSWORD")
+    if not server_id or not username or not password:
+        raise RuntimeError(
+            "Missing SellerCloud env vars. Need SELLERCLOUD_SERVER_ID (or SELLERCLOUD_SERVER), "
+            "SELLERCLOUD_USERNAME, SELLERCLOUD_PASSWORD"
+        )
+    return server_id, username, password
+
+
+def build_weekly_report(
+    *,
+    end_date: Optional[date] = None,
+    reuse_cache: bool = False,
+    refresh: bool = False,
+    artifacts_path: Path = DEFAULT_ARTIFACTS_PATH,
+    db_path: Path = DEFAULT_SPAPI_DB_PATH,
+) -> WeeklyReport:
+    """
+    Run (or reuse) the weekly report pipeline for end_date (default: yesterday).
+
+    reuse_cache is passed to the SP-API report cache; refresh=True ignores
+    stored artifacts and recomputes every stage.
+    """
+    server_id, username, password = _sellercloud_env()
+    end_date = end_date or (date.today() - timedelta(days=1))
+
+    stages = weekly_report_stages(
+        end_date=end_date,
+        server_id=server_id,
+        username=username,
+        password=password,
+        reuse_cache=reuse_cache,
+        db_path=db_path,
+    )
+    artifacts, stage_run = run_pipeline(stages, artifacts_path=artifacts_path, refresh=refresh)
+
+    report = artifacts["report"]
+    return WeeklyReport(
+        df_final=report.df,
+        output_cols=list(report.df.attrs["output_cols"]),
+        end_date=end_date,
+        artifacts=artifacts,
+        stage_run=stage_run,
+    )
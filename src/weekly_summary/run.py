@@ -1,166 +1,44 @@
 from __future__ import annotations
 
-import os
-from datetime import date, timedelta
-from pathlib import Path
-
 from dotenv import load_dotenv
 
-from weekly_summary.extract.amazon.pull_restock_inventory import pull_restock_inventory_raw
-from weekly_summary.extract.sellercloud.pull_inventory_by_view import pull_190_welles_inventory
-from weekly_summary.helpers.asin_sku_mapping import load_asin_sku_mapping
-from weekly_summary.transform.current_stock import compute_current_stock
-from weekly_summary.transform.restock_inventory import load_and_normalize_restock
-from weekly_summary.transform.sales_windows import compute_sku_sales_windows
+from weekly_summary.instrumentation import (
+    default_report_path,
+    format_run_summary,
+    instrumented_run,
+    write_run_report,
+)
+from weekly_summary.pipeline import build_weekly_report
+from weekly_summary.tracing import format_trace_summary, summarize_trace, tracing_from_env
 
 
 def main() -> None:
     load_dotenv(override=True)
     print("weekly_summary.run: starting")
 
-    pulled = pull_restock_inventory_raw(reuse_if_exists=True)
-    print(f"Using restock raw: {pulled.raw_path}")
-
-    df_restock = load_and_normalize_restock(pulled.raw_path)
-    print("Restock normalized rows:", len(df_restock))
-
-    df_amz = compute_current_stock(df_restock)
-
-    mapping = load_asin_sku_mapping()
-    print("ASIN->SKU mapping rows:", len(mapping))
-
-    df_amz = (
-        df_amz.merge(
-            mapping[["ASIN", "SKU"]],
-            left_on="asin",
-            right_on="ASIN",
-            how="left",
-        )
-        .rename(columns={"SKU": "sku"})
-        .drop(columns=["ASIN"])
-    )
-
-    print("Amazon + SKU mapping rows:", len(df_amz))
-
-    print("\nPulling inventory from SellerCloud (Inventory/GetAllByView)...")
-
-    server_id = os.getenv("SELLERCLOUD_SERVER_ID") or os.getenv("SELLERCLOUD_SERVER")
-    username = os.getenv("SELLERCLOUD_USERNAME")
-    password = os.getenv("SELLERCLOUD_PASSWORD")
-
-    if not server_id or not username or not password:
-        raise RuntimeError(
-            "Missing SellerCloud env vars. Need SELLERCLOUD_SERVER_ID (or SELLERCLOUD_SERVER), "
-            "SELLERCLOUD_USERNAME, SELLERCLOUD_PASSWORD"
-        )
-
-    sc_df = pull_190_welles_inventory(
-        server_id=server_id,
-        username=username,
-        password=password,
-        view_id=187,
-    )
-
-    sc_df = sc_df.rename(
-        columns={
-            "SKU": "sku",
-            "Welles190Qty": "190-welles inventory",
-        }
-    ).copy()
-
-    sc_df["sku"] = sc_df["sku"].astype(str).str.strip()
-    print("SellerCloud rows:", len(sc_df))
-
-    df_amz["sku"] = df_amz["sku"].astype(str).str.strip()
-    df_amz["asin"] = df_amz["asin"].astype(str).str.strip()
-
-    df_final = df_amz.merge(sc_df, on="sku", how="left")
-
-    if "190-welles inventory" in df_final.columns:
-        df_final["190-welles inventory"] = df_final["190-welles inventory"].fillna(0.0)
-
-    print("\nComputing Amazon Sales & Traffic windows (Units Ordered) with window caching...")
-
-    end_date = date.today() - timedelta(days=1)
-    db_path = Path("data") / "cache" / "spapi_reports.sqlite"
-
-    df_sales_windows = compute_sku_sales_windows(
-        end_date=end_date,
-        asin_sku_map=mapping[["ASIN", "SKU"]],
-        db_path=db_path,
-        reuse_cache=False,
-    )
-
-    # IMPORTANT: merge on BOTH sku and asin (LOC rows have asin+'-loc' + sku+'-LOC')
-    # Outer merge keeps LOC-only sales rows even if they don't exist in inventory feeds.
-    df_final["sku"] = df_final["sku"].astype(str).str.strip()
-    df_final["asin"] = df_final["asin"].astype(str).str.strip()
-
-    df_sales_windows["sku"] = df_sales_windows["sku"].astype(str).str.strip()
-    df_sales_windows["asin"] = df_sales_windows["asin"].astype(str).str.strip()
-
-    df_final = df_final.merge(df_sales_windows, on=["sku", "asin"], how="outer")
-
-    window_cols = [
-        "1 Day",
-        "7 Days",
-        "8-14",
-        "15-21",
-        "22-28",
-        "1-28",
-        "29-56",
-        "57-84",
-        "4 Week Avg",
-        "3 Month Avg",
-    ]
-    for c in window_cols:
-        if c in df_final.columns:
-            df_final[c] = df_final[c].fillna(0)
-
-    # Outer merge introduces sales-only LOC rows; fill inventory-ish columns for clean display
-    for c in [
-        "inventory_available",
-        "fc_transfer",
-        "fc_processing",
-        "inbound",
-        "current_stock_per_6",
-        "190-welles inventory",
-    ]:
-        if c in df_final.columns:
-            df_final[c] = df_final[c].fillna(0)
-
-    output_cols = [
-        "sku",
-        "asin",
-        "inventory_available",
-        "fc_transfer",
-        "fc_processing",
-        "inbound",
-        "current_stock_per_6",
-        "190-welles inventory",
-        "1 Day",
-        "7 Days",
-        "8-14",
-        "15-21",
-        "22-28",
-        "1-28",
-        "29-56",
-        "57-84",
-        "4 Week Avg",
-        "3 Month Avg",
-    ]
-    output_cols = [c for c in output_cols if c in df_final.columns]
+    # Stage outputs are stored as artifacts; the Excel export reuses them
+    with tracing_from_env() as trace_path, instrumented_run("weekly_summary.run") as recorder:
+        report = build_weekly_report(reuse_cache=False)
+    df_final, output_cols = report.df_final, report.output_cols
+    sc_cols = [c for c in report.artifacts["sellercloud"].df.columns if c != "sku"]
 
     print("\n=== FINAL REPORT: Amazon + SellerCloud + Units Ordered Windows ===")
     print(
         df_final[output_cols]
-        .sort_values("190-welles inventory", ascending=False)
+        .sort_values(sc_cols[0], ascending=False)
         .head(50)
         .to_string(index=False)
     )
 
+    run_report = recorder.report()
+    print("\n" + format_run_summary(run_report))
+    print("Run report:", write_run_report(run_report, default_report_path(recorder.name)))
+    if trace_path is not None and trace_path.exists():
+        print("\nRequest latency by endpoint:\n" + format_trace_summary(summarize_trace(trace_path)))
+        print("Trace:", trace_path)
+
     print("\nweekly_summary.run: done")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
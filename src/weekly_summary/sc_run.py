@@ -9,21 +9,13 @@ import os
 from dotenv import load_dotenv
 import pandas as pd
 
-from weekly_summary.extract.sellercloud.pull_inventory_by_view import pull_190_welles_inventory
+from weekly_summary.extract.sellercloud.inventory_sync import pull_view_inventory_cached
+from weekly_summary.extract.sellercloud.multi_view import pull_views_wide
 
 WELLES_INVENTORY_COL = "190-welles inventory"
 
 
-def pull_warehouse_inventory_qty(
-    *,
-    saved_view_id: int = 187,  # Saved view 187: inventory report for 190 Welles warehouse
-) -> pd.DataFrame:
-    """
-    Fetch real-time warehouse inventory from SellerCloud using the saved view endpoint:
-      GET Inventory/GetAllByView
-
-    Returns a DataFrame with columns ["sku", "190-welles inventory"].
-    """
+def _sellercloud_credentials() -> tuple[str, str, str]:
     load_dotenv(override=True)
 
     server_id = os.getenv("SELLERCLOUD_SERVER")
@@ -39,19 +31,41 @@ def pull_warehouse_inventory_qty(
     if missing:
         raise RuntimeError(f"Missing required SellerCloud env vars: {missing}")
 
-    df_raw = pull_190_welles_inventory(
-        server_id=str(server_id).strip(),
-        username=str(username).strip(),
-        password=str(password),
+    return str(server_id).strip(), str(username).strip(), str(password)
+
+
+def pull_warehouse_inventory_qty(
+    *,
+    saved_view_id: int = 187,  # Saved view 187: inventory report for 190 Welles warehouse
+) -> pd.DataFrame:
+    """
+    Fetch warehouse inventory from SellerCloud using the saved view endpoint:
+      GET Inventory/GetAllByView
+
+    Served from the short-TTL view cache, or on a miss from a full pull of the
+    view into the local snapshot; see extract.sellercloud.inventory_sync.
+    Set SELLERCLOUD_FORCE_REFRESH=1 to bypass the cache.
+
+    Returns a DataFrame with columns ["sku", "190-welles inventory"].
+    """
+    server_id, username, password = _sellercloud_credentials()
+
+    df_raw = pull_view_inventory_cached(
+        server_id=server_id,
+        username=username,
+        password=password,
         view_id=int(saved_view_id),
-        page_size=50,
     )
 
+    cache_info = df_raw.attrs.get("sellercloud_cache", {})
+
     if df_raw.empty:
-        return pd.DataFrame(columns=["sku", WELLES_INVENTORY_COL])
+        out = pd.DataFrame(columns=["sku", WELLES_INVENTORY_COL])
+        out.attrs["sellercloud_cache"] = cache_info
+        return out
 
     # Normalize to the column names run.py expects
-    # pull_190_welles_inventory returns: ["SKU", "Welles190Qty"]
+    # pull_view_inventory_cached returns: ["SKU", "Welles190Qty"]
     out = pd.DataFrame(
         {
             "sku": df_raw["SKU"].astype(str).str.strip(),
@@ -66,10 +80,22 @@ def pull_warehouse_inventory_qty(
         .sort_values(WELLES_INVENTORY_COL, ascending=False)
         .reset_index(drop=True)
     )
+    out.attrs["sellercloud_cache"] = cache_info
 
     return out
 
 
+def pull_warehouse_inventory_wide() -> pd.DataFrame:
+    """
+    Fetch every view configured in SELLERCLOUD_VIEWS concurrently (default:
+    saved view 187, 190 Welles) and join them on SKU.
+
+    Returns a DataFrame with columns ["sku", <one quantity column per view>].
+    """
+    server_id, username, password = _sellercloud_credentials()
+    return pull_views_wide(server_id=server_id, username=username, password=password)
+
+
 def main() -> None:
     """Quick test of SellerCloud inventory pull via saved view endpoint."""
     load_dotenv(override=True)
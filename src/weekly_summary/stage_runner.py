@@ -0,0 +1,106 @@
+"""
+Run pipeline stages as a small dependency graph on a thread pool.
+
+Each Stage names the stages whose results it takes as inputs. Stages with no
+pending inputs start immediately; a dependent stage is submitted as soon as
+its last input finishes. The extractors are I/O bound (SP-API, Sheets,
+SellerCloud), so wall-clock time approaches the longest dependency chain
+instead of the sum of every stage.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    fn: Callable[..., Any]           # called with the input stages' results, in `inputs` order
+    inputs: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class StageRun:
+    results: Dict[str, Any]
+    elapsed_s: Dict[str, float]      # per stage, from start to finish
+    wall_s: float                    # whole graph
+    order: List[str] = field(default_factory=list)  # completion order
+
+
+def _check_graph(stages: Sequence[Stage]) -> Dict[str, Stage]:
+    by_name: Dict[str, Stage] = {}
+    for s in stages:
+        if s.name in by_name:
+            raise ValueError(f"Duplicate stage name: {s.name!r}")
+        by_name[s.name] = s
+
+    for s in stages:
+        unknown = [i for i in s.inputs if i not in by_name]
+        if unknown:
+            raise ValueError(f"Stage {s.name!r} depends on unknown stage(s): {unknown}")
+
+    # Kahn's algorithm: anything left over sits on a cycle
+    remaining = {s.name: set(s.inputs) for s in stages}
+    ready = [n for n, deps in remaining.items() if not deps]
+    while ready:
+        done = ready.pop()
+        del remaining[done]
+        for n, deps in remaining.items():
+            if done in deps:
+                deps.discard(done)
+                if not deps:
+                    ready.append(n)
+    if remaining:
+        raise ValueError(f"Stage dependency cycle among: {sorted(remaining)}")
+    return by_name
+
+
+def run_stages(stages: Sequence[Stage], *, max_workers: Optional[int] = None) -> StageRun:
+    """
+    Run `stages`, each as soon as all of its inputs are available.
+
+    If a stage raises, stages not yet started are skipped, running ones are
+    allowed to finish, and the first failure is re-raised.
+
+    Raises:
+        ValueError: On duplicate names, unknown inputs or a dependency cycle
+    """
+    by_name = _check_graph(stages)
+    results: Dict[str, Any] = {}
+    elapsed: Dict[str, float] = {}
+    order: List[str] = []
+    pending = dict(by_name)
+    running: Dict[Future, str] = {}
+
+    def _timed(stage: Stage, args: List[Any]) -> Tuple[Any, float]:
+        t0 = time.perf_counter()
+        value = stage.fn(*args)
+        return value, time.perf_counter() - t0
+
+    t_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers or len(by_name) or 1) as pool:
+
+        def _submit_ready() -> None:
+            for name, stage in list(pending.items()):
+                if all(i in results for i in stage.inputs):
+                    del pending[name]
+                    running[pool.submit(_timed, stage, [results[i] for i in stage.inputs])] = name
+
+        _submit_ready()
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                name = running.pop(fut)
+                exc = fut.exception()
+                if exc is not None:
+                    pending.clear()
+                    raise exc
+                results[name], elapsed[name] = fut.result()
+                order.append(name)
+            _submit_ready()
+
+    return StageRun(results=results, elapsed_s=elapsed, wall_s=time.perf_counter() - t_start, order=order)
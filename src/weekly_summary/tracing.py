@@ -0,0 +1,297 @@
+"""
+Request-level tracing of outbound calls (SP-API, S3 report downloads,
+SellerCloud, Google Sheets / Drive).
+
+Each request becomes one span: system, endpoint, method, status, latency,
+bytes, retry count and any rate-limit headers, written as one JSON line to
+the active trace file. Turn it on with WEEKLY_SUMMARY_TRACE (a .jsonl path,
+or 1 for data/traces/trace_<timestamp>.jsonl). When it is off, span()
+returns a shared no-op span, so the cost is one global lookup per request.
+
+Summarize a trace as p50/p95/p99 latency per endpoint:
+
+    python -m weekly_summary.tracing data/traces/trace_20260101T000000Z.jsonl
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Union
+
+import numpy as np
+
+DEFAULT_TRACE_DIR = Path("data") / "traces"
+TRACE_ENV = "WEEKLY_SUMMARY_TRACE"
+
+
+def _rate_limit_headers(headers: Optional[Mapping[str, Any]]) -> Dict[str, str]:
+    if not headers:
+        return {}
+    return {
+        k.lower(): str(v)
+        for k, v in headers.items()
+        if "ratelimit" in k.lower() or "rate-limit" in k.lower() or k.lower() == "retry-after"
+    }
+
+
+class _Tracer:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = path.open("a", encoding="utf-8")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            if self._file.closed:  # span finished after tracing was stopped
+                return
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+_TRACER: Optional[_Tracer] = None
+
+
+class Span:
+    """One outbound request; fill in the response with set_response() before the block ends."""
+
+    __slots__ = ("_tracer", "system", "endpoint", "method", "status", "bytes", "retries", "rate_limit", "_t0", "_ts")
+
+    def __init__(self, tracer: _Tracer, system: str, endpoint: str, method: Optional[str]) -> None:
+        self._tracer = tracer
+        self.system = system
+        self.endpoint = endpoint
+        self.method = method
+        self.status: Optional[int] = None
+        self.bytes: Optional[int] = None
+        self.retries = 0
+        self.rate_limit: Dict[str, str] = {}
+
+    def __enter__(self) -> "Span":
+        self._ts = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        latency_ms = (time.perf_counter() - self._t0) * 1000.0
+        if exc is not None:
+            # SP-API exceptions carry .code/.headers, googleapiclient HttpError .resp,
+            # requests errors .response
+            if self.status is None:
+                status = getattr(exc, "code", None)
+                resp = getattr(exc, "resp", None) or getattr(exc, "response", None)
+                if status is None and resp is not None:
+                    status = getattr(resp, "status", None) or getattr(resp, "status_code", None)
+                self.status = status if isinstance(status, int) else None
+            if not self.rate_limit:
+                self.rate_limit = _rate_limit_headers(getattr(exc, "headers", None))
+        self._tracer.write(
+            {
+                "ts": self._ts,
+                "system": self.system,
+                "endpoint": self.endpoint,
+                "method": self.method,
+                "status": self.status,
+                "latency_ms": round(latency_ms, 2),
+                "bytes": self.bytes,
+                "retries": self.retries,
+                "rate_limit": self.rate_limit,
+                "error": exc_type.__name__ if exc_type is not None else None,
+            }
+        )
+
+    def set_response(
+        self,
+        status: Optional[int],
+        *,
+        bytes: Optional[int] = None,
+        headers: Optional[Mapping[str, Any]] = None,
+        retries: int = 0,
+    ) -> None:
+        self.status = status
+        self.bytes = bytes
+        self.retries = retries
+        self.rate_limit = _rate_limit_headers(headers)
+
+    def set_requests_response(self, response: Any) -> None:
+        """Fill in from a requests.Response (urllib3 retries are read from response.raw)."""
+        retries = getattr(getattr(getattr(response, "raw", None), "retries", None), "history", None) or ()
+        self.set_response(
+            response.status_code,
+            bytes=len(response.content),
+            headers=response.headers,
+            retries=len(retries),
+        )
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def set_response(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+    def set_requests_response(self, response: Any) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def tracing_enabled() -> bool:
+    return _TRACER is not None
+
+
+def span(system: str, endpoint: str, method: Optional[str] = None) -> Union[Span, _NoopSpan]:
+    """Context manager timing one outbound request (a shared no-op when tracing is off)."""
+    tracer = _TRACER
+    if tracer is None:
+        return _NOOP_SPAN
+    return Span(tracer, system, endpoint, method)
+
+
+class TracedClient:
+    """
+    Proxy that traces every method call on an API client (e.g. sp_api Reports)
+    as one span named after the method. Responses with .headers contribute
+    their rate-limit headers.
+    """
+
+    def __init__(self, system: str, client: Any) -> None:
+        self._system = system
+        self._client = client
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if _TRACER is None or not callable(attr):
+            return attr
+
+        def _call(*args: Any, **kwargs: Any) -> Any:
+            with span(self._system, name) as sp:
+                result = attr(*args, **kwargs)
+                sp.set_response(200, headers=getattr(result, "headers", None))
+                return result
+
+        return _call
+
+
+def start_tracing(path: Path) -> Path:
+    """Append spans to `path` until stop_tracing()."""
+    global _TRACER
+    stop_tracing()
+    _TRACER = _Tracer(path)
+    return path
+
+
+def stop_tracing() -> None:
+    global _TRACER
+    tracer, _TRACER = _TRACER, None
+    if tracer is not None:
+        tracer.close()
+
+
+@contextmanager
+def tracing_from_env() -> Iterator[Optional[Path]]:
+    """Trace the block if WEEKLY_SUMMARY_TRACE is set; yields the trace path (or None)."""
+    value = (os.getenv(TRACE_ENV) or "").strip()
+    if value.lower() in ("", "0", "false", "no"):
+        yield None
+        return
+
+    if value.lower() in ("1", "true", "yes"):
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        path = DEFAULT_TRACE_DIR / f"trace_{stamp}.jsonl"
+    else:
+        path = Path(value)
+    start_tracing(path)
+    try:
+        yield path
+    finally:
+        stop_tracing()
+
+
+@dataclass(frozen=True)
+class EndpointLatency:
+    system: str
+    endpoint: str
+    count: int
+    errors: int       # spans that raised or returned a status >= 400
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    bytes: int
+
+
+def read_trace(path: Path) -> List[Dict[str, Any]]:
+    with path.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize_trace(spans: Union[Path, Iterable[Dict[str, Any]]]) -> List[EndpointLatency]:
+    """Latency percentiles per (system, endpoint), slowest p95 first."""
+    records = read_trace(spans) if isinstance(spans, Path) else list(spans)
+
+    grouped: Dict[tuple, List[Dict[str, Any]]] = {}
+    for r in records:
+        grouped.setdefault((r["system"], r["endpoint"]), []).append(r)
+
+    out: List[EndpointLatency] = []
+    for (system, endpoint), rows in grouped.items():
+        latency = np.array([r["latency_ms"] for r in rows], dtype=float)
+        p50, p95, p99 = np.percentile(latency, [50, 95, 99])
+        out.append(
+            EndpointLatency(
+                system=system,
+                endpoint=endpoint,
+                count=len(rows),
+                errors=sum(1 for r in rows if r.get("error") or (r.get("status") or 0) >= 400),
+                p50_ms=round(float(p50), 2),
+                p95_ms=round(float(p95), 2),
+                p99_ms=round(float(p99), 2),
+                max_ms=round(float(latency.max()), 2),
+                bytes=sum(r.get("bytes") or 0 for r in rows),
+            )
+        )
+    return sorted(out, key=lambda e: e.p95_ms, reverse=True)
+
+
+def format_trace_summary(rows: List[EndpointLatency]) -> str:
+    lines = [
+        f"  {'system':<12} {'endpoint':<40} {'n':>6} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'MB':>8}"
+    ]
+    for e in rows:
+        lines.append(
+            f"  {e.system:<12} {e.endpoint[:40]:<40} {e.count:>6} {e.errors:>4} "
+            f"{e.p50_ms:>9.1f} {e.p95_ms:>9.1f} {e.p99_ms:>9.1f} {e.bytes / 1e6:>8.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 1:
+        raise SystemExit("usage: python -m weekly_summary.tracing <trace.jsonl>")
+    print(format_trace_summary(summarize_trace(Path(args[0]))))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import re
 from dataclasses import dataclass
 import pandas as pd
 
@@ -21,40 +22,59 @@ MONEY_COLS_DEFAULT = [
     "Placement Service Fee",
 ]
 
+# Everything that is formatting, not value: currency sign, thousands separators, whitespace
+_MONEY_NOISE = re.compile(r"[$,\s]")
+
+
 def _to_numeric_money(series: pd.Series) -> pd.Series:
     """
-    Convert a money-like series (e.g. '$1,234.56', '12.00') to float. 
-    Blanks become NA. 
+    Convert a money-like series (e.g. '$1,234.56', '12.00', '(5.00)') to float.
+    Accounting parentheses around the whole value mean negative; an unbalanced
+    parenthesis is not a number. Blanks become NA.
     """
-    s = series.astype("string").str.strip()
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype("Float64")  # already typed (UNFORMATTED_VALUE reads)
 
-    # Remove common currency formatting
-    s = s.str.replace("$", "", regex=False).str.replace(",", "", regex=False)
+    # One compiled pass strips the formatting
+    s = series.astype("string").str.replace(_MONEY_NOISE, "", regex=True)
+
+    negative = s.str.fullmatch(r"\(.*\)").fillna(False)
+    # Only the wrapping pair is dropped: "(5" or "5)" keeps its parenthesis and coerces to NA
+    s = s.mask(negative, s.str.slice(1, -1))
 
     # Treat empty strings as missing
-    s = s.replace("", pd.NA)
+    s = s.mask(s == "", pd.NA)
 
-    return pd.to_numeric(s, errors="coerce")
+    out = pd.to_numeric(s, errors="coerce").astype("Float64")
+    return out.mask(negative, -out)
 
 
-def clean_gross_net_df(df: pd.DataFrame, money_cols: list[str] | None = None) -> pd.DataFrame:
+def clean_gross_net_df(
+    df: pd.DataFrame,
+    money_cols: list[str] | None = None,
+    *,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
     """
     Return a cleaned copy of the Gross & Net DataFrame:
-    - trims whitespace on all string columns
+    - keeps only `columns` (when given) before doing any work
+    - trims whitespace on the remaining string columns
     - converts money columns to numeric floats
     """
 
-    out = df.copy()
+    out = df[[c for c in columns if c in df.columns]].copy() if columns is not None else df.copy()
 
-    # Strip whitespace from all object/string columns
-    for col in out.columns: 
+    cols = money_cols if money_cols is not None else MONEY_COLS_DEFAULT
+    money = [c for c in cols if c in out.columns]
+
+    # Strip whitespace from the object/string columns (money parsing handles its own)
+    for col in out.columns:
+        if col in money:
+            continue
         if pd.api.types.is_object_dtype(out[col]) or pd.api.types.is_string_dtype(out[col]):
             out[col] = out[col].astype("string").str.strip()
 
-    cols = money_cols if money_cols is not None else MONEY_COLS_DEFAULT
-
-    for col in cols: 
-        if col in out.columns:
-            out[col] = _to_numeric_money(out[col])
+    for col in money:
+        out[col] = _to_numeric_money(out[col])
 
     return out
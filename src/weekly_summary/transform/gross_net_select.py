@@ -4,19 +4,20 @@ import pandas as pd
 
 REQUIRED_COLS = ["SKU", "ASIN", "Mini SKU", "Selling Price"]
 
-def select_gross_net_mapping(df: pd.DataFrame) -> pd.DataFrame:
+def select_gross_net_mapping(df: pd.DataFrame, columns: list[str] | None = None) -> pd.DataFrame:
     """
     Reduce Gross & Net to the minimal mapping needed for weekly Summary:
-    SKU -> ASIN, Mini SKU, Selling Price
+    SKU -> ASIN, Mini SKU, Selling Price (or just `columns`, which must include SKU)
     
     Returns a de-duplicated DataFrame keyed by SKU.
     Raises ValueError if required columns are missing.
     """
-    missing = [c for c in REQUIRED_COLS if c not in df.columns]
+    cols = columns if columns is not None else REQUIRED_COLS
+    missing = [c for c in cols if c not in df.columns]
     if missing: 
         raise ValueError(f"Gross & Net missing required columns: {missing}")
     
-    out = df[REQUIRED_COLS].copy()
+    out = df[cols].copy()
 
     # Normalize SKU key
     out["SKU"] = out["SKU"].astype("string").str.strip()
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from itertools import chain
 from typing import List
 
+import numpy as np
 import pandas as pd
 
 
@@ -20,6 +22,9 @@ def slice_values_from_header(values: List[List[str]], required_header: str) -> L
     for idx, row in enumerate(values):
         if not row:
             continue
+        # Cheap substring pre-check on the whole row; only candidate rows get the per-cell match
+        if needle not in "\x1f".join(map(str, row)).lower():
+            continue
         lowered = [str(cell).strip().lower() for cell in row if cell is not None]
         if needle in lowered:
             return values[idx:]
@@ -53,15 +58,31 @@ def values_to_dataframe(values: List[List[str]]) -> pd.DataFrame:
 
     header_kept = [header_str[i].strip() for i in keep_idx]
 
-    # Build kept data rows (drop the same columns)
-    data_rows = []
-    for row in values[1:]:
-        row = [] if row is None else row
-        # pad row to header length so indexing is safe
-        padded = list(row) + [""] * (len(header_str) - len(row))
-        data_rows.append([padded[i] for i in keep_idx])
-
-    df = pd.DataFrame(data_rows, columns=header_kept)
+    # Ragged rows -> one rectangular block of the kept columns, built from a single
+    # flat array of every cell: each cell's (row, column) comes from the row lengths,
+    # cells past the header width or under blank headers are masked out, and the
+    # block's "" fill is the padding for short rows.
+    width = len(header_str)
+    rows = [row if row else () for row in values[1:]]
+    lengths = np.fromiter(map(len, rows), dtype=np.intp, count=len(rows))
+    cells = np.empty(int(lengths.sum()), dtype=object)
+    cells[:] = list(chain.from_iterable(rows))
+
+    row_idx = np.repeat(np.arange(len(rows)), lengths)
+    col_idx = np.arange(len(cells)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    target = np.full(width + 1, -1, dtype=np.intp)  # header column -> kept position (-1 = dropped)
+    target[keep_idx] = np.arange(len(keep_idx))
+    dest = target[np.minimum(col_idx, width)]
+    mask = dest >= 0
+
+    block = np.empty((len(rows), len(keep_idx)), dtype=object)
+    block.fill("")
+    block[row_idx[mask], dest[mask]] = cells[mask]
+
+    # Object blocks keep object dtype; infer per column like the row-wise constructor did
+    # (all-text -> str, all-numeric UNFORMATTED_VALUE cells -> int64/float64)
+    df = pd.DataFrame({j: block[:, j] for j in range(len(keep_idx))}).infer_objects()
+    df.columns = header_kept
 
     # Ensure unique column names (avoid duplicates after stripping)
     cols = list(df.columns)
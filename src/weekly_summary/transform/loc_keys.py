@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+LOC_ASIN_SUFFIX = "-loc"
+LOC_SKU_SUFFIX = "-LOC"
+
+
+def _drop_loc_suffix(s: pd.Series) -> pd.Series:
+    """Strip a trailing -loc (any case); build-time only, runs once per mapping row."""
+    has_suffix = s.str.lower().str.endswith(LOC_ASIN_SUFFIX)
+    return s.where(~has_suffix, s.str[: -len(LOC_ASIN_SUFFIX)])
+
+
+def loc_mask(values: pd.Series) -> np.ndarray:
+    """
+    Boolean mask of values ending in -LOC (case-insensitive).
+
+    The suffix check runs once per distinct value (factorize is a hash pass),
+    not once per row.
+    """
+    codes, uniques = pd.factorize(values)
+    if len(uniques) == 0:
+        return np.zeros(len(values), dtype=bool)
+    unique_is_loc = np.fromiter(
+        (str(u).upper().endswith(LOC_SKU_SUFFIX) for u in uniques),
+        dtype=bool,
+        count=len(uniques),
+    )
+    return np.where(codes >= 0, unique_is_loc[codes], False)
+
+
+@dataclass(frozen=True)
+class LocKeyResolver:
+    """
+    Maps report rows (child_asin, amazon_sku) to output product keys.
+
+    Output keys are integer codes into a shared dictionary built once from the
+    Gross & Net mapping. Code 2*i is the base product for mapping row i and
+    code 2*i + 1 its LOC variant:
+      asin_out[2*i]     = child_asin          sku_out[2*i]     = mapped_sku
+      asin_out[2*i + 1] = child_asin + '-loc' sku_out[2*i + 1] = mapped_sku + '-LOC'
+
+    Amazon's SKU is only used to detect the LOC variant; naming always comes
+    from the mapping. Unmapped child ASINs encode to -1.
+    """
+    child_asins: pd.Index   # normalized child ASIN per mapping row (hash lookup)
+    mapped_skus: np.ndarray  # base SKU per mapping row
+    asin_out: np.ndarray    # dictionary: code -> output asin
+    sku_out: np.ndarray     # dictionary: code -> output sku
+    is_loc: np.ndarray      # dictionary: code -> LOC flag
+    sort_rank: np.ndarray   # dictionary: code -> rank in (sku_out, asin_out) order
+
+    def encode(self, child_asin: pd.Series, amazon_sku: pd.Series) -> np.ndarray:
+        row_idx = self.child_asins.get_indexer(child_asin)
+        is_loc = loc_mask(amazon_sku).astype(np.int64)
+        return np.where(row_idx >= 0, row_idx * 2 + is_loc, -1)
+
+    def decode(self, codes: np.ndarray) -> pd.DataFrame:
+        """Output (sku, asin) for valid codes; reuses the dictionary's string objects."""
+        return pd.DataFrame({"sku": self.sku_out.take(codes), "asin": self.asin_out.take(codes)})
+
+    def sort_order(self, codes: np.ndarray) -> np.ndarray:
+        """Positions that put codes in output (sku, asin) order."""
+        return np.argsort(self.sort_rank[codes], kind="stable")
+
+
+def build_loc_key_resolver(asin_sku_map: pd.DataFrame) -> LocKeyResolver:
+    """
+    Build the resolver from the Gross & Net mapping (columns: ASIN, SKU).
+
+    Any -loc suffix in the mapping is stripped so LOC naming is applied
+    uniformly by the resolver; the first row wins for a duplicated ASIN.
+    """
+    asin = _drop_loc_suffix(asin_sku_map["ASIN"].astype("string").str.strip().fillna(""))
+    sku = _drop_loc_suffix(asin_sku_map["SKU"].astype("string").str.strip().fillna(""))
+
+    m = pd.DataFrame({"child_asin": asin, "mapped_sku": sku})
+    m = m[(m["child_asin"].str.len() > 0) & (m["mapped_sku"].str.len() > 0)]
+    m = m.drop_duplicates(subset=["child_asin"], keep="first")
+
+    child_asins = m["child_asin"].to_numpy(dtype=object)
+    mapped_skus = m["mapped_sku"].to_numpy(dtype=object)
+    n = len(child_asins)
+
+    asin_out = np.empty(2 * n, dtype=object)
+    sku_out = np.empty(2 * n, dtype=object)
+    asin_out[0::2] = child_asins
+    asin_out[1::2] = [a + LOC_ASIN_SUFFIX for a in child_asins]
+    sku_out[0::2] = mapped_skus
+    sku_out[1::2] = [s + LOC_SKU_SUFFIX for s in mapped_skus]
+
+    is_loc = np.zeros(2 * n, dtype=bool)
+    is_loc[1::2] = True
+
+    order = pd.DataFrame({"sku": sku_out, "asin": asin_out}).sort_values(["sku", "asin"]).index.to_numpy()
+    sort_rank = np.empty(2 * n, dtype=np.int64)
+    sort_rank[order] = np.arange(2 * n)
+
+    return LocKeyResolver(
+        child_asins=pd.Index(child_asins),
+        mapped_skus=mapped_skus,
+        asin_out=asin_out,
+        sku_out=sku_out,
+        is_loc=is_loc,
+        sort_rank=sort_rank,
+    )
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from weekly_summary.cache.restock_snapshots import (
+    SNAPSHOT_QTY_COLS,
+    ingested_file_hashes,
+    load_restock_snapshots,
+    put_restock_snapshot,
+)
+from weekly_summary.transform.restock_inventory import normalize_restock_rows, read_restock_raw
+
+DEFAULT_RAW_DIR = Path("data") / "raw" / "amazon" / "restock_inventory"
+RAW_GLOB = "*/restock_inventory_raw_*"
+
+
+@dataclass(frozen=True)
+class RestockIngestSummary:
+    ingested: list[Path] = field(default_factory=list)
+    skipped: list[Path] = field(default_factory=list)
+    rows_written: int = 0
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def snapshot_date_for(path: Path) -> str:
+    """
+    Archive layout is <raw_dir>/<YYYY-MM-DD>/restock_inventory_raw_<reportId>.txt,
+    so the folder name is the snapshot date. Falls back to the file's mtime.
+    """
+    try:
+        return date.fromisoformat(path.parent.name).isoformat()
+    except ValueError:
+        return datetime.fromtimestamp(path.stat().st_mtime).date().isoformat()
+
+
+def find_restock_raw_files(raw_dir: Path = DEFAULT_RAW_DIR) -> list[Path]:
+    # Sorted by (date folder, name): when a day has several reports, the last one wins,
+    # matching pull_restock_inventory_raw's existing[-1]
+    return sorted(p for p in raw_dir.glob(RAW_GLOB) if p.is_file())
+
+
+def parse_restock_snapshot(path: Path) -> pd.DataFrame:
+    return normalize_restock_rows(read_restock_raw(path).df)
+
+
+def ingest_restock_file(
+    db_path: Path,
+    path: Path,
+    *,
+    known_hashes: Optional[set[str]] = None,
+) -> Optional[int]:
+    """
+    Parse one raw Restock report into restock_snapshots unless its hash was already
+    ingested. Returns rows written, or None when skipped.
+    """
+    path = Path(path)
+    sha = file_sha256(path)
+    if known_hashes is None:
+        known_hashes = ingested_file_hashes(db_path)
+    if sha in known_hashes:
+        return None
+
+    rows = parse_restock_snapshot(path)
+    n = put_restock_snapshot(
+        db_path,
+        snapshot_date=snapshot_date_for(path),
+        rows=rows,
+        file_sha256=sha,
+        source_path=path.as_posix(),
+    )
+    known_hashes.add(sha)
+    return n
+
+
+def ingest_restock_archive(
+    db_path: Path,
+    *,
+    raw_dir: Path = DEFAULT_RAW_DIR,
+) -> RestockIngestSummary:
+    """
+    Ingest every archived raw Restock report not seen before (by file hash).
+    """
+    known = ingested_file_hashes(db_path)
+    ingested: list[Path] = []
+    skipped: list[Path] = []
+    rows_written = 0
+
+    for path in find_restock_raw_files(raw_dir):
+        n = ingest_restock_file(db_path, path, known_hashes=known)
+        if n is None:
+            skipped.append(path)
+        else:
+            ingested.append(path)
+            rows_written += n
+
+    if ingested:
+        print(f"Restock snapshots: ingested {len(ingested)} new file(s), {rows_written} rows")
+
+    return RestockIngestSummary(ingested=ingested, skipped=skipped, rows_written=rows_written)
+
+
+def restock_history_by_asin(
+    db_path: Path,
+    *,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    asins: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """
+    One row per (snapshot_date, asin), merchant SKUs summed, with the same
+    current_stock definition as normalize_restock_inventory and
+    inbound_pipeline = working + shipped + receiving.
+    """
+    snaps = load_restock_snapshots(db_path, start_date=start_date, end_date=end_date, asins=asins)
+    qty_cols = list(SNAPSHOT_QTY_COLS)
+
+    df = snaps.groupby(["snapshot_date", "asin"], as_index=False, sort=True)[qty_cols].sum()
+    df["current_stock"] = df["available"] + df["fc_transfer"] + df["fc_processing"] + df["inbound"]
+    df["inbound_pipeline"] = df["working"] + df["shipped"] + df["receiving"]
+    return df
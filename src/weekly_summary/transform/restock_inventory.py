@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import codecs
+import io
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Literal
@@ -12,12 +14,19 @@ class RestockInventoryNormalized:
     df: pd.DataFrame
     source_path: Path
     delimiter: Literal[",", "\t"]
+    encoding: str = "cp1252"
 
 
 # We now require ASIN because we want to key everything by ASIN (more stable than SKU).
 REQUIRED_INPUT_COLS = ["ASIN", "Merchant SKU", "Available", "FC transfer", "FC Processing", "Inbound"]
 OPTIONAL_INBOUND_COLS = ["Working", "Shipped", "Receiving"]
 
+_ID_INPUT_COLS = ["ASIN", "Merchant SKU"]
+_NUMERIC_INPUT_COLS = [c for c in REQUIRED_INPUT_COLS + OPTIONAL_INBOUND_COLS if c not in _ID_INPUT_COLS]
+
+# Encoding + delimiter are sniffed from this much of the file, not the whole thing
+_SNIFF_BYTES = 64 * 1024
+
 
 def _detect_delimiter(sample: str) -> Literal[",", "\t"]:
     # Restock exports can be CSV or TSV depending on how Seller Central generated it.
@@ -26,33 +35,76 @@ def _detect_delimiter(sample: str) -> Literal[",", "\t"]:
     return ","
 
 
-def read_restock_raw(path: str | Path) -> RestockInventoryNormalized:
-    path = Path(path)
+def _sniff_encoding(prefix: bytes) -> str:
+    """
+    Seller Central exports are UTF-8 (sometimes with BOM) or cp1252.
+    A multi-byte character cut off at the end of the prefix is not an error.
+    """
+    if prefix.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "cp1252"
 
-    raw_bytes = path.read_bytes()
 
-    # Try common encodings for Seller Central exports
-    decoded_text: str | None = None
-    for enc in ("utf-8-sig", "cp1252", "utf-8"):
-        try:
-            decoded_text = raw_bytes.decode(enc)
-            break
-        except UnicodeDecodeError:
-            continue
+def read_restock_raw(path: str | Path) -> RestockInventoryNormalized:
+    """
+    Read a raw Restock report in a single parse.
 
-    if decoded_text is None:
-        decoded_text = raw_bytes.decode("utf-8", errors="replace")
+    Encoding and delimiter come from the first _SNIFF_BYTES; the file is then
+    parsed once from the in-memory buffer, loading only the columns
+    normalize_restock_inventory uses, with quantities read as integers.
+    """
+    path = Path(path)
+    raw_bytes = path.read_bytes()
 
-    first_lines = "\n".join([ln for ln in decoded_text.splitlines() if ln.strip()][:5])
+    prefix = raw_bytes[:_SNIFF_BYTES]
+    encoding = _sniff_encoding(prefix)
+    sample = prefix.decode(encoding, errors="replace")
+    first_lines = "\n".join([ln for ln in sample.splitlines() if ln.strip()][:5])
     delim = _detect_delimiter(first_lines)
 
-    # Keep everything as string initially, then coerce numeric columns after renaming
-    df = pd.read_csv(path, sep=delim, dtype=str, encoding="cp1252", low_memory=False)
-
-    return RestockInventoryNormalized(df=df, source_path=path, delimiter=delim)
-
+    wanted = set(REQUIRED_INPUT_COLS + OPTIONAL_INBOUND_COLS)
+    read_kwargs = dict(
+        sep=delim,
+        encoding=encoding,
+        encoding_errors="replace",
+        usecols=lambda c: c in wanted,
+    )
 
-def normalize_restock_inventory(df_raw: pd.DataFrame) -> pd.DataFrame:
+    id_dtypes = {c: str for c in _ID_INPUT_COLS}
+    try:
+        df = pd.read_csv(
+            io.BytesIO(raw_bytes),
+            dtype={**id_dtypes, **{c: "int64" for c in _NUMERIC_INPUT_COLS}},
+            **read_kwargs,
+        )
+    except ValueError:
+        # Blank or non-integer quantities: let the parser infer (float64 / object) and
+        # normalize_restock_inventory coerces them
+        df = pd.read_csv(io.BytesIO(raw_bytes), dtype=id_dtypes, **read_kwargs)
+
+    return RestockInventoryNormalized(df=df, source_path=path, delimiter=delim, encoding=encoding)
+
+
+RESTOCK_QTY_COLS = [
+    "inventory_available",
+    "fc_transfer",
+    "fc_processing",
+    "inbound",
+    "inbound_working",
+    "inbound_shipped",
+    "inbound_receiving",
+]
+
+
+def normalize_restock_rows(df_raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Row-level normalization: one row per report line (asin, merchant_sku, RESTOCK_QTY_COLS),
+    with identifiers stripped and quantities as int. No aggregation.
+    """
     missing = [c for c in REQUIRED_INPUT_COLS if c not in df_raw.columns]
     if missing:
         raise ValueError(
@@ -84,17 +136,17 @@ def normalize_restock_inventory(df_raw: pd.DataFrame) -> pd.DataFrame:
     df["asin"] = df["asin"].astype(str).str.strip()
     df["merchant_sku"] = df["merchant_sku"].astype(str).str.strip()
 
-    numeric_cols = [
-        "inventory_available",
-        "fc_transfer",
-        "fc_processing",
-        "inbound",
-        "inbound_working",
-        "inbound_shipped",
-        "inbound_receiving",
-    ]
-    for c in numeric_cols:
-        df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0).astype(int)
+    for c in RESTOCK_QTY_COLS:
+        if not pd.api.types.is_integer_dtype(df[c]):
+            df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
+        df[c] = df[c].astype(int)
+
+    return df
+
+
+def normalize_restock_inventory(df_raw: pd.DataFrame) -> pd.DataFrame:
+    df = normalize_restock_rows(df_raw)
+    numeric_cols = RESTOCK_QTY_COLS
 
     # Your sheet’s “current stock” definition (matches what you described):
     # inventory_available + fc_transfer + fc_processing + inbound
@@ -4,10 +4,15 @@ from dataclasses import dataclass
 from datetime import date, timedelta
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from sp_api.base import Marketplaces
 
 from weekly_summary.extract.amazon.sales_traffic_by_window import get_sales_traffic_rows_cached
+from weekly_summary.transform.loc_keys import LocKeyResolver, build_loc_key_resolver
+
+
+WINDOW_COLS = ["1 Day", "7 Days", "8-14", "15-21", "22-28", "1-28", "29-56", "57-84"]
 
 
 @dataclass(frozen=True)
@@ -30,45 +35,113 @@ def build_windows(*, end_date: date) -> list[Window]:
     ]
 
 
-def _normalize_mapping(asin_sku_map: pd.DataFrame) -> pd.DataFrame:
+def _stack_window_rows(
+    rows_by_window: list[pd.DataFrame],
+    resolver: LocKeyResolver,
+) -> pd.DataFrame:
     """
-    Gross & Net sheet mapping (ASIN -> base SKU).
-    We strip any -loc suffixes in the mapping so we can apply them ourselves.
+    Stack per-window report rows into one long frame of (window, code, Units).
+
+    `window` is the position of the window in `build_windows` order and `code`
+    is the resolver's output-key code. Rows whose child ASIN is not in the
+    mapping are dropped.
     """
-    m = asin_sku_map.rename(columns={"ASIN": "child_asin", "SKU": "mapped_sku"}).copy()
-    m["child_asin"] = (
-        m["child_asin"].astype(str).str.strip().str.replace(r"(?i)-loc$", "", regex=True)
-    )
-    m["mapped_sku"] = (
-        m["mapped_sku"].astype(str).str.strip().str.replace(r"(?i)-loc$", "", regex=True)
+    parts = [
+        df_rows[["child_asin", "amazon_sku", "Units"]].assign(window=i)
+        for i, df_rows in enumerate(rows_by_window)
+        if not df_rows.empty
+    ]
+    if not parts:
+        return pd.DataFrame(
+            {
+                "window": np.array([], dtype=np.int64),
+                "code": np.array([], dtype=np.int64),
+                "Units": np.array([], dtype="float64"),
+            }
+        )
+
+    df = pd.concat(parts, ignore_index=True)
+    codes = resolver.encode(df["child_asin"], df["amazon_sku"])
+    keep = codes >= 0
+
+    return pd.DataFrame(
+        {
+            "window": df["window"].to_numpy(dtype=np.int64)[keep],
+            "code": codes[keep],
+            "Units": pd.to_numeric(df["Units"], errors="coerce").fillna(0.0).to_numpy(dtype="float64")[keep],
+        }
     )
-    m = m[(m["child_asin"].str.len() > 0) & (m["mapped_sku"].str.len() > 0)]
-    return m.drop_duplicates(subset=["child_asin"], keep="first")
 
 
-def _apply_loc_output_keys(df: pd.DataFrame) -> pd.DataFrame:
+def _pivot_window_units(
+    long: pd.DataFrame,
+    window_names: list[str],
+    resolver: LocKeyResolver,
+) -> pd.DataFrame:
     """
-    Input columns: child_asin, amazon_sku, Units, mapped_sku
-    Output columns:
-      asin_out  - child_asin or child_asin+'-loc'
-      sku_out   - mapped_sku or mapped_sku+'-LOC'
-      Units
+    Pivot long (window, code, Units) rows to one row per output (sku, asin).
+
+    Window totals are summed with a single bincount over (key, window) integer
+    codes; strings are only attached at the end from the resolver's dictionary.
+    Output is sorted by (sku, asin), matching the old chained outer merge.
     """
-    out = df.copy()
-    out["child_asin"] = out["child_asin"].astype(str).str.strip()
-    out["mapped_sku"] = out["mapped_sku"].astype(str).str.strip()
-    out["amazon_sku"] = out["amazon_sku"].astype(str).str.strip()
-    out["Units"] = pd.to_numeric(out["Units"], errors="coerce").fillna(0.0)
+    n_win = len(window_names)
+    key_codes, key_uniques = pd.factorize(long["code"].to_numpy(dtype=np.int64))
+
+    totals = np.bincount(
+        key_codes * n_win + long["window"].to_numpy(dtype=np.int64),
+        weights=long["Units"].to_numpy(dtype="float64"),
+        minlength=len(key_uniques) * n_win,
+    ).reshape(len(key_uniques), n_win)
+
+    order = resolver.sort_order(key_uniques)
+    totals = totals[order]
+
+    out = resolver.decode(key_uniques[order])
+    for i, name in enumerate(window_names):
+        out[name] = totals[:, i]
+    return out
 
-    loc_mask = out["amazon_sku"].str.upper().str.endswith("-LOC")
 
-    out["asin"] = out["child_asin"]
-    out["sku"] = out["mapped_sku"]
+def _finalize_window_columns(out: pd.DataFrame) -> pd.DataFrame:
+    """Add the 4-week / 3-month averages and apply output rounding."""
+    out = out.fillna(0)
+
+    # Averages
+    if all(c in out.columns for c in ["7 Days", "8-14", "15-21", "22-28"]):
+        out["4 Week Avg"] = (out["7 Days"] + out["8-14"] + out["15-21"] + out["22-28"]) / 4.0
+    else:
+        out["4 Week Avg"] = 0.0
+
+    if all(c in out.columns for c in ["1-28", "29-56", "57-84"]):
+        out["3 Month Avg"] = (out["1-28"] + out["29-56"] + out["57-84"]) / 3.0
+    else:
+        out["3 Month Avg"] = 0.0
+
+    # Formatting: integer windows, 1-decimal averages
+    for c in WINDOW_COLS:
+        if c in out.columns:
+            out[c] = pd.to_numeric(out[c], errors="coerce").fillna(0).round(0).astype("int64")
+
+    for c in ["4 Week Avg", "3 Month Avg"]:
+        if c in out.columns:
+            out[c] = pd.to_numeric(out[c], errors="coerce").fillna(0).round(1)
+
+    return out
 
-    out.loc[loc_mask, "asin"] = out.loc[loc_mask, "asin"] + "-loc"
-    out.loc[loc_mask, "sku"] = out.loc[loc_mask, "sku"] + "-LOC"
 
-    return out[["asin", "sku", "Units"]]
+def assemble_sku_windows(
+    rows_by_window: list[pd.DataFrame],
+    *,
+    resolver: LocKeyResolver,
+    window_names: list[str],
+) -> pd.DataFrame:
+    """
+    Build the SKU-level window table from per-window report rows
+    (child_asin, amazon_sku, Units), one frame per entry in `window_names`.
+    """
+    long = _stack_window_rows(rows_by_window, resolver)
+    return _finalize_window_columns(_pivot_window_units(long, window_names, resolver))
 
 
 def compute_sku_sales_windows(
@@ -78,6 +151,7 @@ def compute_sku_sales_windows(
     db_path: Path = Path("data") / "cache" / "spapi_reports.sqlite",
     marketplace_id: str = Marketplaces.US.marketplace_id,
     reuse_cache: bool = True,
+    resolver: LocKeyResolver | None = None,
 ) -> pd.DataFrame:
     """
     Output is like the original (SKU-level window totals), but with MORE ROWS:
@@ -88,66 +162,26 @@ def compute_sku_sales_windows(
     IMPORTANT:
     - We DO NOT use Amazon's SKU for naming.
       Amazon SKU is used ONLY to detect whether the row is a -LOC variant.
+
+    Pass `resolver` to reuse a LocKeyResolver already built from the same mapping.
     """
     windows = build_windows(end_date=end_date)
-    mapping = _normalize_mapping(asin_sku_map)
+    resolver = resolver or build_loc_key_resolver(asin_sku_map)
 
-    out: pd.DataFrame | None = None
-
-    for win in windows:
-        df_rows = get_sales_traffic_rows_cached(
+    # get_sales_traffic_rows_cached already returns stripped keys and numeric Units
+    rows_by_window = [
+        get_sales_traffic_rows_cached(
             start_date=win.start,
             end_date=win.end,
             marketplace_id=marketplace_id,
             db_path=db_path,
             reuse_cache=reuse_cache,
         )
+        for win in windows
+    ]
 
-        if df_rows.empty:
-            df_win = pd.DataFrame({"sku": [], "asin": [], win.name: []})
-        else:
-            df_rows["child_asin"] = df_rows["child_asin"].astype(str).str.strip()
-            df_rows["amazon_sku"] = df_rows["amazon_sku"].astype(str).str.strip()
-            df_rows["Units"] = pd.to_numeric(df_rows["Units"], errors="coerce").fillna(0.0)
-
-            df = df_rows.merge(mapping, on="child_asin", how="left")
-            df = df[df["mapped_sku"].notna() & (df["mapped_sku"].astype(str).str.len() > 0)].copy()
-
-            df_prod = _apply_loc_output_keys(df)
-
-            # Group by output sku+asin so LOC stays a distinct row
-            df_win = (
-                df_prod.groupby(["sku", "asin"], as_index=False)["Units"]
-                .sum()
-                .rename(columns={"Units": win.name})
-            )
-
-        out = df_win if out is None else out.merge(df_win, on=["sku", "asin"], how="outer")
-
-    if out is None:
-        out = pd.DataFrame({"sku": [], "asin": []})
-
-    out = out.fillna(0)
-
-    # Averages
-    if all(c in out.columns for c in ["7 Days", "8-14", "15-21", "22-28"]):
-        out["4 Week Avg"] = (out["7 Days"] + out["8-14"] + out["15-21"] + out["22-28"]) / 4.0
-    else:
-        out["4 Week Avg"] = 0.0
-
-    if all(c in out.columns for c in ["1-28", "29-56", "57-84"]):
-        out["3 Month Avg"] = (out["1-28"] + out["29-56"] + out["57-84"]) / 3.0
-    else:
-        out["3 Month Avg"] = 0.0
-
-    # Formatting: integer windows, 1-decimal averages
-    window_cols = ["1 Day", "7 Days", "8-14", "15-21", "22-28", "1-28", "29-56", "57-84"]
-    for c in window_cols:
-        if c in out.columns:
-            out[c] = pd.to_numeric(out[c], errors="coerce").fillna(0).round(0).astype("int64")
-
-    for c in ["4 Week Avg", "3 Month Avg"]:
-        if c in out.columns:
-            out[c] = pd.to_numeric(out[c], errors="coerce").fillna(0).round(1)
-
-    return out
\ No newline at end of file
+    return assemble_sku_windows(
+        rows_by_window,
+        resolver=resolver,
+        window_names=[win.name for win in windows],
+    )
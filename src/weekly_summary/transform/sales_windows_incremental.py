@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+from sp_api.base import Marketplaces
+
+from weekly_summary.cache.ttl_policy import policy_for
+from weekly_summary.cache.window_state import WindowStateRecord, get_window_state, put_window_state
+from weekly_summary.extract.amazon.sales_traffic_by_window import (
+    REPORT_TYPE,
+    get_sales_traffic_rows_cached,
+    has_settled_rows_cached,
+)
+from weekly_summary.transform.sales_windows import (
+    WINDOW_COLS,
+    Window,
+    _finalize_window_columns,
+    _pivot_window_units,
+    _stack_window_rows,
+    build_windows,
+)
+from weekly_summary.transform.loc_keys import LocKeyResolver, build_loc_key_resolver
+
+_KEY_COLS = ["sku", "asin"]
+# Days of the 84-day span with a report row for the pair. The full computation
+# keeps every pair its range reports list, zero units included; the pair
+# leaves the table once this count (plus its unsettled days) drops to 0.
+_SEEN_COL = "days_seen"
+_TOTAL_COLS = WINDOW_COLS + [_SEEN_COL]
+
+
+def _sha256_json(obj: object) -> str:
+    return hashlib.sha256(json.dumps(obj, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def _mapping_fingerprint(resolver: LocKeyResolver) -> str:
+    pairs = [[str(a), str(s)] for a, s in zip(resolver.child_asins, resolver.mapped_skus)]
+    return _sha256_json(pairs)
+
+
+def _window_spec_fingerprint(windows: list[Window], end_date: date) -> str:
+    """Fingerprint window names + offsets relative to end_date (stable day to day)."""
+    spec = [[w.name, (end_date - w.start).days, (end_date - w.end).days] for w in windows]
+    return _sha256_json(spec)
+
+
+def _window_days(win: Window, *, through: date | None = None) -> set[date]:
+    """Days of `win`, optionally only those on or before `through`."""
+    last = win.end if through is None else min(win.end, through)
+    return {win.start + timedelta(days=i) for i in range((last - win.start).days + 1)}
+
+
+def _days_by_column(windows: list[Window], *, through: date | None = None) -> list[set[date]]:
+    """Days per entry of _TOTAL_COLS: each window's days, then the whole span's."""
+    days = [_window_days(w, through=through) for w in windows]
+    return days + [set().union(*days)]
+
+
+def _settled_through(end_date: date, today: date) -> date:
+    """Last day whose Sales & Traffic numbers no longer change (see cache/ttl_policy.py)."""
+    return min(end_date, today - timedelta(days=policy_for(REPORT_TYPE).settle_days))
+
+
+def _add_totals(*frames: pd.DataFrame) -> pd.DataFrame:
+    frames = [f for f in frames if not f.empty] or [frames[0]]
+    out = pd.concat(frames, ignore_index=True).groupby(_KEY_COLS, as_index=False)[_TOTAL_COLS].sum()
+    # Pairs with no report row left anywhere in the span are gone from the full computation too
+    return out[out[_SEEN_COL] > 0.5].reset_index(drop=True)
+
+
+def _range_totals(
+    *,
+    windows: list[Window],
+    resolver: LocKeyResolver,
+    db_path: Path,
+    marketplace_id: str,
+    reuse_cache: bool,
+) -> pd.DataFrame:
+    """One range report per window, as compute_sku_sales_windows pulls them."""
+    rows_by_window = [
+        get_sales_traffic_rows_cached(
+            start_date=win.start,
+            end_date=win.end,
+            marketplace_id=marketplace_id,
+            db_path=db_path,
+            reuse_cache=reuse_cache,
+        )
+        for win in windows
+    ]
+    return _pivot_window_units(_stack_window_rows(rows_by_window, resolver), WINDOW_COLS, resolver)
+
+
+def _day_delta_totals(
+    *,
+    add_days: list[set[date]],
+    sub_days: list[set[date]],
+    resolver: LocKeyResolver,
+    db_path: Path,
+    marketplace_id: str,
+    reuse_cache: bool,
+) -> pd.DataFrame:
+    """
+    Per entry of _TOTAL_COLS: the one-day rows of add_days[i] minus those of
+    sub_days[i] (Units for the windows, one per row for days_seen). Each day
+    is pulled once, however many columns use it.
+    """
+    day_rows: dict[date, pd.DataFrame] = {}
+
+    def _rows_for(day: date, sign: float, *, count: bool) -> pd.DataFrame:
+        if day not in day_rows:
+            day_rows[day] = get_sales_traffic_rows_cached(
+                start_date=day,
+                end_date=day,
+                marketplace_id=marketplace_id,
+                db_path=db_path,
+                reuse_cache=reuse_cache,
+            )
+        df = day_rows[day]
+        units = 1.0 if count else df["Units"]
+        return df.assign(Units=sign * units)
+
+    empty = pd.DataFrame(columns=["child_asin", "amazon_sku", "Units"])
+    delta_rows: list[pd.DataFrame] = []
+    for i, (added, removed) in enumerate(zip(add_days, sub_days)):
+        count = _TOTAL_COLS[i] == _SEEN_COL
+        parts = [_rows_for(d, +1.0, count=count) for d in sorted(added)]
+        parts += [_rows_for(d, -1.0, count=count) for d in sorted(removed)]
+        parts = [p for p in parts if not p.empty]
+        delta_rows.append(pd.concat(parts, ignore_index=True) if parts else empty)
+
+    return _pivot_window_units(_stack_window_rows(delta_rows, resolver), _TOTAL_COLS, resolver)
+
+
+def compute_sku_sales_windows_incremental(
+    *,
+    end_date: date,
+    asin_sku_map: pd.DataFrame,  # columns: ASIN, SKU (gross & net)
+    db_path: Path = Path("data") / "cache" / "spapi_reports.sqlite",
+    marketplace_id: str = Marketplaces.US.marketplace_id,
+    reuse_cache: bool = True,
+    max_incremental_days: int = 7,
+    max_seed_pulls: int = 28,
+    resolver: LocKeyResolver | None = None,
+    today: date | None = None,
+) -> pd.DataFrame:
+    """
+    Same output as compute_sku_sales_windows, but advanced from the persisted
+    window state of the previous run instead of re-aggregating all 84 days.
+
+    The state only ever holds settled days (older than the report type's
+    settle_days), so like settled cache entries it is used whatever
+    reuse_cache says. Each run slides it by the one-day reports of days that
+    entered or left the settled part of a window, then adds the unsettled
+    tail (at most settle_days days) from one-day pulls that go through the
+    cache's recheck TTLs and reuse_cache, so late revisions are picked up.
+
+    The state is (re)seeded from the one-day reports of every settled day in
+    the span when:
+      - no state exists for this marketplace
+      - the ASIN -> SKU mapping or the window definitions changed
+      - the state is older than max_incremental_days, or newer than end_date
+    Settled days are cached for good, so a reseed costs no pulls once they
+    are. When more than max_seed_pulls of them are missing (first runs), that
+    many are pulled to warm the cache and this run's windows come from range
+    reports instead, like compute_sku_sales_windows.
+    """
+    today = today or date.today()
+    windows = build_windows(end_date=end_date)
+    resolver = resolver or build_loc_key_resolver(asin_sku_map)
+    mapping_sha = _mapping_fingerprint(resolver)
+    spec_sha = _window_spec_fingerprint(windows, end_date)
+    settled_through = _settled_through(end_date, today)
+    new_days = _days_by_column(windows, through=settled_through)
+    pulls = dict(
+        resolver=resolver, db_path=db_path, marketplace_id=marketplace_id, reuse_cache=reuse_cache
+    )
+
+    state = get_window_state(db_path, marketplace_id=marketplace_id)
+    old_days: list[set[date]] | None = None
+    state_rows = pd.DataFrame(columns=_KEY_COLS + _TOTAL_COLS)
+    if state is not None and state.mapping_sha256 == mapping_sha and state.spec_sha256 == spec_sha:
+        state_end = date.fromisoformat(state.end_date)
+        if 0 <= (end_date - state_end).days <= max_incremental_days:
+            state_through = date.fromisoformat(state.settled_through)
+            print(f"Sales windows: sliding settled state {state_through} -> {settled_through}")
+            old_days = _days_by_column(build_windows(end_date=state_end), through=state_through)
+            state_rows = pd.DataFrame(state.rows, columns=_KEY_COLS + _TOTAL_COLS)
+
+    if old_days is None:
+        missing = [
+            d
+            for d in sorted(new_days[-1], reverse=True)
+            if not has_settled_rows_cached(
+                start_date=d, end_date=d, marketplace_id=marketplace_id, db_path=db_path
+            )
+        ]
+        if len(missing) > max_seed_pulls:
+            print(
+                f"Sales windows: {len(missing)} settled days not cached yet; pulling "
+                f"{max_seed_pulls} and using range reports for {end_date}"
+            )
+            for d in missing[:max_seed_pulls]:
+                get_sales_traffic_rows_cached(
+                    start_date=d,
+                    end_date=d,
+                    marketplace_id=marketplace_id,
+                    db_path=db_path,
+                    reuse_cache=reuse_cache,
+                )
+            return _finalize_window_columns(_range_totals(windows=windows, **pulls))
+
+        print(f"Sales windows: seeding state from one-day reports through {settled_through}")
+        old_days = [set() for _ in _TOTAL_COLS]
+
+    delta = _day_delta_totals(
+        add_days=[new - old for old, new in zip(old_days, new_days)],
+        sub_days=[old - new for old, new in zip(old_days, new_days)],
+        **pulls,
+    )
+    settled = _add_totals(state_rows, delta)
+
+    put_window_state(
+        db_path,
+        state=WindowStateRecord(
+            marketplace_id=marketplace_id,
+            end_date=end_date.isoformat(),
+            mapping_sha256=mapping_sha,
+            spec_sha256=spec_sha,
+            rows=settled[_KEY_COLS + _TOTAL_COLS].to_dict(orient="records"),
+            settled_through=settled_through.isoformat(),
+        ),
+    )
+
+    # Unsettled tail: never persisted, re-read every run
+    all_days = _days_by_column(windows)
+    tail_days = [days - settled_days for days, settled_days in zip(all_days, new_days)]
+    totals = settled
+    if any(tail_days):
+        tail = _day_delta_totals(add_days=tail_days, sub_days=[set() for _ in _TOTAL_COLS], **pulls)
+        totals = _add_totals(settled, tail)
+
+    return _finalize_window_columns(totals.drop(columns=[_SEEN_COL]))
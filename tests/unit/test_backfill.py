@@ -0,0 +1,92 @@
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from weekly_summary.backfill import run_backfill
+from weekly_summary.cache.restock_snapshots import load_restock_snapshots
+from weekly_summary.cache.sqlite_cache import CacheKey, _connect, get_cached_parsed, put_cached_parsed
+
+KEY = CacheKey(
+    report_type="GET_SALES_AND_TRAFFIC_REPORT",
+    marketplace_id="ATVPDKIKX0DER",
+    data_start_date="2026-02-01",
+    data_end_date="2026-02-07",
+    report_options_json='{"asinGranularity":"SKU","dateGranularity":"DAY"}',
+)
+ST_FILE = Path("sales_traffic_daily") / "2026-02-24" / "sales_traffic_daily_raw_2026-02-01_to_2026-02-07.txt"
+
+
+def _write_archive(root: Path) -> None:
+    restock = root / "restock_inventory" / "2026-02-12"
+    restock.mkdir(parents=True)
+    (restock / "restock_inventory_raw_1.txt").write_text(
+        "Merchant SKU\tASIN\tInbound\tAvailable\tFC transfer\tFC Processing\nA-1\tB001\t1\t5\t0\t2\n",
+        encoding="cp1252",
+    )
+
+    st = root / "sales_traffic_daily" / "2026-02-24"
+    st.mkdir(parents=True)
+    payload = {
+        "reportSpecification": {
+            "reportType": "GET_SALES_AND_TRAFFIC_REPORT",
+            "reportOptions": {"dateGranularity": "DAY", "asinGranularity": "SKU"},
+            "dataStartTime": "2026-02-01",
+            "dataEndTime": "2026-02-07",
+            "marketplaceIds": ["ATVPDKIKX0DER"],
+        },
+        "salesAndTrafficByDate": [],
+        "salesAndTrafficByAsin": [
+            {"parentAsin": "P1", "childAsin": "B001", "sku": "A-1", "salesByAsin": {"unitsOrdered": 3}},
+            {"parentAsin": "P1", "childAsin": "B001", "sku": "A-1-LOC", "salesByAsin": {"unitsOrdered": 1}},
+        ],
+    }
+    (st / "sales_traffic_daily_raw_2026-02-01_to_2026-02-07.txt").write_text(json.dumps(payload))
+
+
+def test_backfill_parses_archive_once(tmp_path: Path):
+    root = tmp_path / "raw"
+    db = tmp_path / "cache.sqlite"
+    _write_archive(root)
+
+    stats = run_backfill(db_path=db, raw_root=root, workers=1)
+    assert (stats.written, stats.skipped, stats.failed) == (2, 0, 0)
+
+    snaps = load_restock_snapshots(db)
+    assert list(snaps["available"]) == [5]
+
+    cached = get_cached_parsed(db, key=KEY, final_after_days=3)
+    assert cached is not None
+    assert sorted(r["amazon_sku"] for r in cached["rows"]) == ["A-1", "A-1-LOC"]
+
+    again = run_backfill(db_path=db, raw_root=root, workers=1)
+    assert (again.written, again.skipped) == (0, 2)
+
+
+def _set_mtime(path: Path, when: datetime) -> None:
+    ts = when.timestamp()
+    os.utime(path, (ts, ts))
+
+
+def test_backfill_finality_follows_pull_time_and_keeps_newer_pulls(tmp_path: Path):
+    root = tmp_path / "raw"
+    _write_archive(root)
+
+    # Pulled the day after the range ended: provisional data, expired long ago.
+    # It replaces an older entry without being logged as a revision check.
+    db = tmp_path / "a.sqlite"
+    put_cached_parsed(db, key=KEY, parsed_obj={"rows": []}, pulled_at_utc="2026-02-07T12:00:00+00:00")
+    _set_mtime(root / ST_FILE, datetime(2026, 2, 8, tzinfo=timezone.utc))
+    stats = run_backfill(db_path=db, raw_root=root, kinds=("sales_traffic",), workers=1)
+    assert stats.written == 1
+    assert get_cached_parsed(db, key=KEY, final_after_days=3) is None
+    with _connect(db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM spapi_revision_log").fetchone()[0] == 0
+
+    # A newer live pull of the same key wins over the archived document
+    db = tmp_path / "b.sqlite"
+    _set_mtime(root / ST_FILE, datetime(2026, 2, 24, tzinfo=timezone.utc))
+    put_cached_parsed(db, key=KEY, parsed_obj={"rows": []}, pulled_at_utc="2026-03-01T00:00:00+00:00")
+    stats = run_backfill(db_path=db, raw_root=root, kinds=("sales_traffic",), workers=1)
+    assert (stats.written, stats.skipped) == (0, 1)
+    assert get_cached_parsed(db, key=KEY) == {"rows": []}
@@ -1,4 +1,18 @@
-from weekly_summary.extract.google_sheets import read_range
+from weekly_summary.extract import google_sheets
+import re
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from weekly_summary.extract.google_sheets import (
+    ProjectedRange,
+    SheetRange,
+    column_letter,
+    read_projected_ranges,
+    read_range,
+    read_range_chunked,
+    read_sheet_ranges,
+)
 
 
 class DummyService:
@@ -19,3 +33,242 @@ def test_read_range_returns_values():
     service = DummyService()
     values = read_range(service, "dummy_sheet_id", "AMZ US!A1:B2")
     assert values == [["SKU", "Price"], ["ABC", "10.00"]]
+
+
+class BatchService:
+    """Records batchGet calls; serves each range's name back as its only cell."""
+
+    def __init__(self):
+        self.calls = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def batchGet(self, spreadsheetId, ranges, **kwargs):
+        self.calls.append((spreadsheetId, list(ranges)))
+        self._ranges = list(ranges)
+        return self
+
+    def execute(self):
+        return {"valueRanges": [{"range": f"'{r}'", "values": [[r]]} for r in self._ranges]}
+
+
+def test_read_sheet_ranges_batches_per_spreadsheet():
+    service = BatchService()
+    ranges = [SheetRange("s1", "A!A1:B"), SheetRange("s2", "X!A1:Z"), SheetRange("s1", "B!A1:C")]
+
+    out = read_sheet_ranges(ranges, service=service)
+
+    assert service.calls == [("s1", ["A!A1:B", "B!A1:C"]), ("s2", ["X!A1:Z"])]
+    assert {r: v[0][0] for r, v in out.items()} == {r: r.range_name for r in ranges}
+
+
+def test_sheets_service_is_built_once_per_process(monkeypatch):
+    built = []
+    monkeypatch.setattr(google_sheets, "build_sheets_service", lambda path: built.append(path) or object())
+    monkeypatch.setattr(google_sheets, "_SERVICES", {})
+
+    first = google_sheets.get_sheets_service("sa.json")
+    second = google_sheets.get_sheets_service("sa.json")
+
+    assert first is second
+    assert built == ["sa.json"]
+
+
+class GridService:
+    """batchGet over an in-memory grid; understands 'Tab'!1:N and 'Tab'!B2:B[N] ranges."""
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.calls = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def batchGet(self, spreadsheetId, ranges, **kwargs):
+        self.calls.append((list(ranges), kwargs))
+        self._ranges = list(ranges)
+        self._kwargs = kwargs
+        return self
+
+    def _one(self, a1):
+        rows_only = re.fullmatch(r"'[^']+'!(\d+):(\d+)", a1)
+        if rows_only:
+            return self.grid[: int(rows_only.group(2))]
+        col, start, end = re.fullmatch(r"'[^']+'!([A-Z]+)(\d+):[A-Z]+(\d*)", a1).groups()
+        idx = ord(col) - ord("A")
+        rows = self.grid[int(start) - 1 : int(end) if end else None]
+        cells = [r[idx] if idx < len(r) else "" for r in rows]
+        while cells and cells[-1] == "":
+            cells.pop()
+        return [cells] if cells else []
+
+    def execute(self):
+        return {"valueRanges": [{"values": self._one(a1)} if self._one(a1) else {} for a1 in self._ranges]}
+
+
+def test_column_letter():
+    assert [column_letter(i) for i in (0, 15, 25, 26, 27)] == ["A", "P", "Z", "AA", "AB"]
+
+
+def _master_carton_grid():
+    return [
+        ["Weights & Dims"],
+        [],
+        ["Notes", "Mini SKU: ", "Width", "Qty per Master:"],
+        ["x", "m1", 3.5, 12],
+        ["", "m2", 1, ""],
+        ["", "m3", 2, 6],
+    ]
+
+
+MASTER = ProjectedRange("s1", "Master Carton", header="Mini SKU:", columns=("Mini SKU:", "Qty per Master:"))
+
+
+def test_projected_read_fetches_only_used_columns_key_as_text():
+    service = GridService(_master_carton_grid())
+
+    out = read_projected_ranges([MASTER], service=service)[MASTER]
+
+    assert out == [["Mini SKU:", "Qty per Master:"], ["m1", 12], ["m2", ""], ["m3", 6]]
+    (scan, _), (text_cols, text_kwargs), (num_cols, num_kwargs) = service.calls
+    assert scan == ["'Master Carton'!1:20"]
+    assert text_cols == ["'Master Carton'!B3:B"]
+    assert text_kwargs["valueRenderOption"] == "FORMATTED_VALUE"
+    assert num_cols == ["'Master Carton'!D3:D"]
+    assert num_kwargs["valueRenderOption"] == "UNFORMATTED_VALUE"
+    assert num_kwargs["majorDimension"] == "COLUMNS"
+    assert num_kwargs["fields"] == "valueRanges(values)"
+
+
+def test_cached_header_positions_skip_the_scan_until_columns_move(tmp_path):
+    db = tmp_path / "gs.sqlite"
+    grid = _master_carton_grid()
+    ids = ProjectedRange("s1", "AMZ US", header="SKU", columns=("SKU", "ASIN"), text_columns=("ASIN",))
+    service = GridService([["SKU", "ASIN"], ["00123", "B001"]])
+
+    read_projected_ranges([ids], service=service, header_cache_path=db)
+    service.calls.clear()
+    out = read_projected_ranges([ids], service=service, header_cache_path=db)[ids]
+    assert out == [["SKU", "ASIN"], ["00123", "B001"]]
+    assert len(service.calls) == 1  # steady state: one column read, no header scan
+
+    service = GridService(grid)
+    read_projected_ranges([MASTER], service=service, header_cache_path=db)
+
+    # A column is inserted before Mini SKU: the cached positions are detected as stale
+    service.grid = [row[:1] + [""] + row[1:] if len(row) > 1 else row for row in grid]
+    service.calls.clear()
+    out = read_projected_ranges([MASTER], service=service, header_cache_path=db)[MASTER]
+    assert out == [["Mini SKU:", "Qty per Master:"], ["m1", 12], ["m2", ""], ["m3", 6]]
+    assert any(ranges == ["'Master Carton'!1:20"] for ranges, _ in service.calls)
+
+
+def test_projected_read_of_large_tab_is_split_by_last_row_count(tmp_path):
+    db = tmp_path / "gs.sqlite"
+    ids = ProjectedRange("s1", "AMZ US", header="SKU", columns=("SKU", "ASIN"), text_columns=("ASIN",))
+    grid = [["SKU", "ASIN"]] + [[f"S{i}", f"A{i}" if i != 5 else ""] for i in range(1, 8)]
+    service = GridService(grid)
+
+    read_projected_ranges([ids], service=service, header_cache_path=db, chunk_rows=3)
+    assert [ranges for ranges, _ in service.calls][1:] == [["'AMZ US'!A1:A", "'AMZ US'!B1:B"]]
+
+    # 8 rows last time: blocks 1-3, 4-6 and an open-ended 7-, which picks up the new row
+    service.grid = grid + [["S8", "A8"]]
+    service.calls.clear()
+    out = read_projected_ranges([ids], service=service, header_cache_path=db, chunk_rows=3)[ids]
+
+    assert out == service.grid
+    assert [ranges for ranges, _ in service.calls] == [
+        ["'AMZ US'!A1:A3", "'AMZ US'!B1:B3"],
+        ["'AMZ US'!A4:A6", "'AMZ US'!B4:B6"],
+        ["'AMZ US'!A7:A", "'AMZ US'!B7:B"],
+    ]
+
+
+def test_service_pool_keeps_one_service_per_concurrent_worker(monkeypatch):
+    built = []
+    monkeypatch.setattr(google_sheets, "build_sheets_service", lambda path: built.append(path) or object())
+    monkeypatch.setattr(google_sheets, "_SERVICE_POOLS", {})
+
+    pool = google_sheets._sheets_service_pool("sa.json")
+    with pool.lease() as first:
+        with pool.lease() as second:
+            assert first is not second
+    with google_sheets._sheets_service_pool("sa.json").lease() as again:
+        assert again in (first, second)
+
+    assert built == ["sa.json", "sa.json"]
+
+
+class ChunkService:
+    """values().get over an in-memory tab of row_count grid rows; `flaky` fails once with a 503."""
+
+    def __init__(self, grid, row_count, flaky=None):
+        self.grid = grid + [[] for _ in range(row_count - len(grid))]
+        self.flaky = flaky
+        self.requested = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, spreadsheetId, range, majorDimension="ROWS"):
+        self._range, self._major = range, majorDimension
+        return self
+
+    def execute(self):
+        self.requested.append(self._range)
+        if self._range == self.flaky:
+            self.flaky = None
+            raise HttpError(httplib2.Response({"status": 503}), b"busy")
+        a1 = re.fullmatch(r"'[^']+'!([A-Z]+)(\d+):([A-Z]+)(\d*)", self._range)
+        c1, start, c2, end = a1.groups()
+        rows = self.grid[int(start) - 1 : int(end) if end else len(self.grid)]
+        if self._major == "COLUMNS":
+            assert c1 == c2 == "A"
+            cells = [row[0] if row else "" for row in rows]
+            while cells and cells[-1] == "":
+                cells.pop()
+            return {"values": [cells]}
+        while rows and not rows[-1]:
+            rows = rows[:-1]
+        return {"values": rows}
+
+
+def test_chunked_read_stitches_blocks_in_order_and_retries_failed_block():
+    grid = [["SKU", "ASIN"]] + [[f"S{i}", f"A{i}"] for i in range(1, 10)]
+    grid += [[], ["S11"], [], ["", "A13"]]
+    service = ChunkService(grid, row_count=len(grid), flaky="'AMZ US'!A4:P6")
+
+    values = read_range_chunked(
+        "sheet", "AMZ US!A1:P", chunk_rows=3, max_workers=3, base_backoff_s=0, service_factory=lambda: service
+    )
+
+    assert values == grid
+    # Split by column A's used rows (12); the open last block still reaches row 14
+    blocks = {"'AMZ US'!A1:P3", "'AMZ US'!A4:P6", "'AMZ US'!A7:P9", "'AMZ US'!A10:P"}
+    assert set(service.requested) == blocks | {"'AMZ US'!A1:A"}
+    assert service.requested.count("'AMZ US'!A4:P6") == 2
+
+
+def test_chunked_read_is_sized_by_used_rows_not_the_grid():
+    grid = [["SKU", "ASIN"]] + [[f"S{i}", f"A{i}"] for i in range(1, 5)]
+    service = ChunkService(grid, row_count=50000)
+
+    values = read_range_chunked(
+        "sheet", "AMZ US!A1:P", chunk_rows=2, service_factory=lambda: service
+    )
+
+    assert values == grid
+    blocks = {"'AMZ US'!A1:P2", "'AMZ US'!A3:P4", "'AMZ US'!A5:P"}
+    assert set(service.requested) == blocks | {"'AMZ US'!A1:A"}
+    assert len(service.requested) == 4
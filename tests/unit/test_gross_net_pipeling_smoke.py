@@ -30,3 +30,35 @@ def test_gross_net_mapping_smoke():
     # Selling Price should be numeric after cleaning 
     assert pd.api.types.is_numeric_dtype(mapping["Selling Price"])
 
+
+
+def test_money_parsing_handles_formatting_and_typed_values():
+    from weekly_summary.transform.gross_net_clean import _to_numeric_money
+
+    parsed = _to_numeric_money(pd.Series(["$1,234.50", " 20.5 ", "(5.00)", "$(1,000)", "", None, "n/a"]))
+    assert parsed.tolist()[:4] == [1234.5, 20.5, -5.0, -1000.0]
+    assert parsed.isna().tolist()[4:] == [True, True, True]
+
+    unbalanced = _to_numeric_money(pd.Series(["(5.00", "5.00)", "((5))", "()"]))
+    assert unbalanced.isna().all()
+
+    typed = _to_numeric_money(pd.Series([10.5, 3]))
+    assert str(typed.dtype) == "Float64"
+    assert typed.tolist() == [10.5, 3.0]
+
+
+def test_clean_projects_before_cleaning():
+    df = pd.DataFrame(
+        {
+            "SKU": [" A "],
+            "Selling Price": ["$10.00"],
+            "Cost": ["$4.00"],
+            "Notes": [" untouched "],
+        }
+    )
+
+    cleaned = clean_gross_net_df(df, columns=["SKU", "Selling Price"])
+
+    assert list(cleaned.columns) == ["SKU", "Selling Price"]
+    assert cleaned.iloc[0].tolist() == ["A", 10.0]
+    assert df["Notes"].iloc[0] == " untouched "
@@ -1,7 +1,9 @@
 import pandas as pd
 import pytest
 
-from weekly_summary.transform.gsheets_to_df import GSheetsParseError, values_to_dataframe
+from weekly_summary.transform.gsheets_to_df import GSheetsParseError, slice_values_from_header, values_to_dataframe
+
+
 def test_empty_values_raises():
     with pytest.raises(GSheetsParseError):
         values_to_dataframe([])
@@ -52,4 +54,44 @@ def test_empty_header_cell_is_dropped():
     assert df.shape == (1, 2)
 
 
-        
\ No newline at end of file
+        
+
+def test_none_rows_and_typed_cells_are_kept():
+    values = [
+        ["SKU", "Qty", "Price"],
+        None,
+        ["A", 12, 3.5],
+        ["B"],
+    ]
+
+    df = values_to_dataframe(values)
+
+    assert df.values.tolist() == [["", "", ""], ["A", 12, 3.5], ["B", "", ""]]
+
+
+def test_slice_values_from_header_skips_preamble_rows():
+    values = [
+        ["Weights & Dims", None, 7],
+        [],
+        ["Notes", " mini sku: ", "Qty per Master:"],
+        ["x", "m1", 6],
+    ]
+
+    assert slice_values_from_header(values, "Mini SKU:") == values[2:]
+    with pytest.raises(GSheetsParseError):
+        slice_values_from_header(values[:2], "Mini SKU:")
+
+
+def test_numeric_cells_get_numeric_dtypes_like_row_wise_construction():
+    values = [
+        ["SKU", "Qty", "Price", "Mixed"],
+        ["A", 12, 3.5, 1],
+        ["B", 6, 2, ""],
+    ]
+    df = values_to_dataframe(values)
+
+    expected = pd.DataFrame([row for row in values[1:]], columns=values[0])
+    pd.testing.assert_frame_equal(df, expected)
+    assert df["Qty"].dtype == "int64"
+    assert df["Price"].dtype == "float64"
+    assert df["Mixed"].dtype == object
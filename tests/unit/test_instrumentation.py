@@ -0,0 +1,86 @@
+import json
+import threading
+from collections import Counter
+
+import pandas as pd
+import pytest
+
+from weekly_summary.instrumentation import (
+    format_run_summary,
+    instrumented_run,
+    record,
+    record_throttle,
+    write_run_report,
+)
+from weekly_summary.pipeline import PipelineStage, run_pipeline
+
+
+def test_record_is_a_no_op_outside_a_run_and_sums_across_threads():
+    record("spapi", api_calls=1)  # nothing active: ignored
+
+    with instrumented_run("t") as rec:
+        threads = [
+            threading.Thread(target=lambda: record("sellercloud", api_calls=1, bytes_downloaded=100))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        record_throttle("sellercloud", 1.5)
+        record("sheets", cache_hits=1)
+    record("sheets", cache_hits=1)  # after the run: ignored
+
+    report = rec.report()
+    assert report["extractors"]["sellercloud"] == {
+        "api_calls": 8,
+        "bytes_downloaded": 800,
+        "throttle_waits": 1,
+        "throttle_wait_s": 1.5,
+        "cache_hits": 0,
+        "cache_misses": 0,
+    }
+    assert report["extractors"]["sheets"]["cache_hits"] == 1
+    assert "spapi" not in report["extractors"]
+
+    with pytest.raises(ValueError):
+        rec.count("spapi", retries=1)
+
+
+def test_pipeline_stages_report_rows_and_store_hits(tmp_path):
+    db = tmp_path / "artifacts.sqlite"
+    calls = Counter()
+
+    def source():
+        calls["source"] += 1
+        return pd.DataFrame({"sku": ["S1", "S2", "S3"]})
+
+    stages = [
+        PipelineStage("source", source, fingerprint=lambda: "v1"),
+        PipelineStage("report", lambda df: df.head(2), inputs=("source",)),
+    ]
+    run_pipeline(stages, artifacts_path=db)
+    with instrumented_run("second") as rec:
+        run_pipeline(stages, artifacts_path=db)
+
+    by_name = {s["name"]: s for s in rec.report()["stages"]}
+    assert by_name["source"]["rows_out"] == 3 and by_name["source"]["from_store"]
+    assert by_name["report"]["rows_in"] == 3 and by_name["report"]["rows_out"] == 2
+    assert calls["source"] == 1
+
+
+def test_run_report_is_written_and_appended_to_history(tmp_path):
+    with instrumented_run("weekly_summary.run") as rec:
+        record("spapi", api_calls=2, bytes_downloaded=2_000_000, cache_misses=1)
+    report = rec.report()
+
+    history = tmp_path / "history.jsonl"
+    write_run_report(report, tmp_path / "a.run.json", history_path=history)
+    write_run_report(report, tmp_path / "b.run.json", history_path=history)
+
+    assert json.loads((tmp_path / "a.run.json").read_text())["extractors"]["spapi"]["api_calls"] == 2
+    lines = [json.loads(line) for line in history.read_text().splitlines()]
+    assert [line["report_path"] for line in lines] == [str(tmp_path / "a.run.json"), str(tmp_path / "b.run.json")]
+
+    summary = format_run_summary(report)
+    assert "weekly_summary.run" in summary and "spapi" in summary and "2.00" in summary
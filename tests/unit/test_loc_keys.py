@@ -0,0 +1,34 @@
+import pandas as pd
+
+from weekly_summary.transform.loc_keys import build_loc_key_resolver, loc_mask
+
+
+def test_mapping_loc_suffixes_are_stripped_and_first_asin_wins():
+    mapping = pd.DataFrame(
+        {
+            "ASIN": [" B001 ", "B002-LOC", "B001", "", "B003"],
+            "SKU": ["SKU-1", "SKU-2-loc", "OTHER", "SKU-X", ""],
+        }
+    )
+    resolver = build_loc_key_resolver(mapping)
+
+    assert list(resolver.child_asins) == ["B001", "B002"]
+    assert list(resolver.mapped_skus) == ["SKU-1", "SKU-2"]
+
+
+def test_encode_decode_applies_loc_naming_from_mapping():
+    resolver = build_loc_key_resolver(pd.DataFrame({"ASIN": ["B001", "B002"], "SKU": ["SKU-1", "SKU-2"]}))
+
+    codes = resolver.encode(
+        pd.Series(["B002", "B001", "B999", "B001"]),
+        pd.Series(["amz-2-loc", "amz-1", "amz-9", "amz-1-LOC"]),
+    )
+    assert codes.tolist() == [3, 0, -1, 1]
+
+    out = resolver.decode(codes[codes >= 0])
+    assert out.values.tolist() == [["SKU-2-LOC", "B002-loc"], ["SKU-1", "B001"], ["SKU-1-LOC", "B001-loc"]]
+
+
+def test_loc_mask_is_case_insensitive_and_handles_missing():
+    mask = loc_mask(pd.Series(["A-LOC", "b-loc", "C", None, "A-LOC"]))
+    assert mask.tolist() == [True, True, False, False, True]
@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import pandas as pd
+
+from weekly_summary.transform.restock_inventory import load_and_normalize_restock, read_restock_raw
+
+HEADER = ["Country", "Product Name", "Merchant SKU", "ASIN", "Inbound", "Available", "FC transfer", "FC Processing"]
+
+
+def _write(tmp_path: Path, rows: list[list[str]], *, sep: str, encoding: str, bom: bool = False) -> Path:
+    text = "\n".join(sep.join(r) for r in [HEADER] + rows) + "\n"
+    data = text.encode(encoding)
+    if bom:
+        data = b"\xef\xbb\xbf" + data
+    path = tmp_path / "restock_inventory_raw_1.txt"
+    path.write_bytes(data)
+    return path
+
+
+def test_reader_projects_columns_and_reads_integers(tmp_path: Path):
+    path = _write(
+        tmp_path,
+        [["US", "Bag – 20 CuFt", "SKU-1", "B000000001", "1", "5", "2", "0"]],
+        sep="\t",
+        encoding="cp1252",
+    )
+
+    raw = read_restock_raw(path)
+
+    assert raw.delimiter == "\t"
+    assert raw.encoding == "cp1252"
+    assert "Product Name" not in raw.df.columns
+    assert set(raw.df.columns) == {"Merchant SKU", "ASIN", "Inbound", "Available", "FC transfer", "FC Processing"}
+    assert pd.api.types.is_integer_dtype(raw.df["Available"])
+
+
+def test_reader_handles_bom_csv_and_blank_quantities(tmp_path: Path):
+    path = _write(
+        tmp_path,
+        [
+            ["US", '"Bag, édition"', "SKU-1", "B000000001", "", "5", "2", "0"],
+            ["US", "Bag", "SKU-2", "B000000001", "3", "1", "", "1"],
+        ],
+        sep=",",
+        encoding="utf-8",
+        bom=True,
+    )
+    raw = read_restock_raw(path)
+    assert raw.delimiter == ","
+    assert raw.encoding == "utf-8-sig"
+    assert list(raw.df.columns)[0] == "Merchant SKU"
+
+    df = load_and_normalize_restock(path)
+    row = df.set_index("asin").loc["B000000001"]
+    assert row["inventory_available"] == 6
+    assert row["inbound"] == 3
+    assert row["current_stock"] == 6 + 2 + 1 + 3
+    assert row["inbound_working"] == 0
@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from weekly_summary.cache.restock_snapshots import list_ingested_files, load_restock_snapshots
+from weekly_summary.transform.restock_history import ingest_restock_archive, restock_history_by_asin
+
+HEADER = "Merchant SKU\tASIN\tInbound\tAvailable\tFC transfer\tFC Processing\tWorking\tShipped\tReceiving"
+
+
+def _write_report(raw_dir: Path, day: str, name: str, lines: list[str]) -> Path:
+    d = raw_dir / day
+    d.mkdir(parents=True, exist_ok=True)
+    path = d / f"restock_inventory_raw_{name}.txt"
+    path.write_text("\n".join([HEADER] + lines) + "\n", encoding="cp1252")
+    return path
+
+
+def test_ingest_is_incremental_and_queryable(tmp_path: Path):
+    raw_dir = tmp_path / "raw"
+    db = tmp_path / "cache.sqlite"
+
+    _write_report(raw_dir, "2026-02-12", "1", ["A-1\tB001\t2\t5\t1\t0\t1\t1\t0", "A-1-LOC\tB001\t0\t3\t0\t0\t0\t0\t0"])
+    _write_report(raw_dir, "2026-02-13", "2", ["A-1\tB001\t0\t4\t0\t1\t0\t0\t0", "B-2\tB002\t7\t0\t0\t0\t0\t0\t7"])
+
+    first = ingest_restock_archive(db, raw_dir=raw_dir)
+    assert len(first.ingested) == 2
+    assert first.rows_written == 4
+
+    second = ingest_restock_archive(db, raw_dir=raw_dir)
+    assert second.ingested == []
+    assert len(second.skipped) == 2
+
+    snaps = load_restock_snapshots(db, start_date="2026-02-13")
+    assert list(snaps["merchant_sku"]) == ["A-1", "B-2"]
+    assert list(snaps["receiving"]) == [0, 7]
+
+    hist = restock_history_by_asin(db, asins=["B001"])
+    assert list(hist["snapshot_date"]) == ["2026-02-12", "2026-02-13"]
+    assert list(hist["available"]) == [8, 4]
+    assert list(hist["current_stock"]) == [5 + 3 + 1 + 2, 4 + 1]
+    assert list(hist["inbound_pipeline"]) == [2, 0]
+
+
+def test_newer_file_for_same_day_replaces_snapshot(tmp_path: Path):
+    raw_dir = tmp_path / "raw"
+    db = tmp_path / "cache.sqlite"
+
+    _write_report(raw_dir, "2026-02-12", "1", ["A-1\tB001\t0\t5\t0\t0\t0\t0\t0"])
+    ingest_restock_archive(db, raw_dir=raw_dir)
+
+    _write_report(raw_dir, "2026-02-12", "2", ["A-1\tB001\t0\t9\t0\t0\t0\t0\t0"])
+    summary = ingest_restock_archive(db, raw_dir=raw_dir)
+
+    assert [p.name for p in summary.ingested] == ["restock_inventory_raw_2.txt"]
+    snaps = load_restock_snapshots(db)
+    assert list(snaps["available"]) == [9]
+    assert len(list_ingested_files(db)) == 2
@@ -0,0 +1,104 @@
+import json
+from datetime import date
+from pathlib import Path
+from types import SimpleNamespace
+
+import weekly_summary.extract.amazon.sales_traffic_backfill as bf
+from weekly_summary.cache.backfill_checkpoint import BackfillCheckpoint, get_checkpoints, put_checkpoint
+from weekly_summary.cache.sqlite_cache import get_cache_status
+from weekly_summary.extract.amazon.rate_limit import TokenBucket
+
+MARKETPLACE = "ATVPDKIKX0DER"
+
+
+class FakeReports:
+    """create_report -> reportId 'r-<start>'; documents carry one SKU row per day."""
+
+    def __init__(self, calls: dict, fail_days: set[str]):
+        self.calls = calls
+        self.fail_days = fail_days
+
+    def create_report(self, **kw):
+        day = kw["dataStartTime"][:10]
+        self.calls.setdefault("create", []).append(day)
+        if day in self.fail_days:
+            self.fail_days.discard(day)
+            raise RuntimeError("boom")
+        return SimpleNamespace(payload={"reportId": f"r-{day}"})
+
+    def get_report(self, reportId):
+        return SimpleNamespace(payload={"processingStatus": "DONE", "reportDocumentId": f"d-{reportId[2:]}"})
+
+    def get_report_document(self, reportDocumentId):
+        return SimpleNamespace(payload={"day": reportDocumentId[2:]})
+
+
+def _fake_download(doc):
+    row = {"parentAsin": "P1", "childAsin": "B001", "sku": "A-1", "salesByAsin": {"unitsOrdered": 2}}
+    return json.dumps({"salesAndTrafficByAsin": [row]}).encode()
+
+
+def _fast_buckets():
+    return {op: TokenBucket(1000.0, 100) for op in ("create_report", "get_report", "get_report_document")}
+
+
+def test_plan_week_slices_align_to_end_and_clip():
+    keys = bf.plan_history_jobs(start_date=date(2025, 1, 1), end_date=date(2025, 1, 20), step_days=7)
+    ranges = [(k.data_start_date, k.data_end_date) for k in keys]
+    assert ranges == [
+        ("2025-01-14", "2025-01-20"),
+        ("2025-01-07", "2025-01-13"),
+        ("2025-01-01", "2025-01-06"),
+    ]
+
+
+def test_backfill_checkpoints_and_resumes(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(bf, "download_report_document", _fake_download)
+    db = tmp_path / "cache.sqlite"
+    calls: dict = {}
+    fail_days = {"2025-01-02"}
+
+    kwargs = dict(
+        db_path=db,
+        start_date=date(2025, 1, 1),
+        end_date=date(2025, 1, 3),
+        workers=2,
+        reports_factory=lambda: FakeReports(calls, fail_days),
+        buckets=_fast_buckets(),
+    )
+
+    first = bf.run_history_backfill(**kwargs)
+    assert (first.planned, first.done, first.failed) == (3, 2, 1)
+
+    key = bf.history_key(date(2025, 1, 1), date(2025, 1, 1), marketplace_id=MARKETPLACE)
+    status = get_cache_status(db, key=key)
+    assert status is not None and status["expires_at_utc"] is None
+
+    calls.clear()
+    second = bf.run_history_backfill(**kwargs)
+    assert (second.skipped, second.done, second.failed) == (2, 1, 0)
+    assert calls["create"] == ["2025-01-02"]
+
+    hist = bf.load_daily_sku_history(db, start_date=date(2025, 1, 1), end_date=date(2025, 1, 3))
+    assert list(hist["day"]) == ["2025-01-01", "2025-01-02", "2025-01-03"]
+    assert hist["Units"].sum() == 6
+
+
+def test_requested_job_is_polled_not_recreated(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(bf, "download_report_document", _fake_download)
+    db = tmp_path / "cache.sqlite"
+    key = bf.history_key(date(2025, 1, 5), date(2025, 1, 5), marketplace_id=MARKETPLACE)
+    put_checkpoint(db, checkpoint=BackfillCheckpoint(key=key, status="REQUESTED", attempts=1, report_id="r-2025-01-05"))
+
+    calls: dict = {}
+    result = bf.run_history_backfill(
+        db_path=db,
+        start_date=date(2025, 1, 5),
+        end_date=date(2025, 1, 5),
+        reports_factory=lambda: FakeReports(calls, set()),
+        buckets=_fast_buckets(),
+    )
+
+    assert result.done == 1
+    assert "create" not in calls
+    assert get_checkpoints(db, report_type=key.report_type, marketplace_id=MARKETPLACE)[key].status == "DONE"
@@ -0,0 +1,64 @@
+import json
+from datetime import date
+
+import pytest
+
+from weekly_summary.cache.sqlite_cache import CacheKey, put_cached_parsed
+from weekly_summary.extract.amazon import sales_traffic_units
+from weekly_summary.extract.amazon.sales_traffic_rollup import finer_granularities, rollup_rows
+
+SKU_ROWS = [
+    {"child_asin": "C1", "amazon_sku": "s1", "parent_asin": "P1", "Units": 2.0},
+    {"child_asin": "C1", "amazon_sku": "s1-LOC", "parent_asin": "P1", "Units": 3.0},
+    {"child_asin": "C2", "amazon_sku": "s2", "parent_asin": "P1", "Units": 4.0},
+]
+
+
+def test_finer_granularities():
+    assert finer_granularities("PARENT") == ["SKU", "CHILD", "ASIN"]
+    assert finer_granularities("ASIN") == ["SKU"]
+    assert finer_granularities("SKU") == []
+
+
+def test_rollup_sku_rows_to_child_and_parent():
+    child = rollup_rows(SKU_ROWS, from_granularity="SKU", to_granularity="CHILD")
+    assert child.set_index("childAsin")["Units"].to_dict() == {"C1": 5.0, "C2": 4.0}
+
+    parent = rollup_rows(SKU_ROWS, from_granularity="SKU", to_granularity="PARENT")
+    assert parent["Units"].tolist() == [9.0]
+
+    # Rows cached before parent_asin was kept cannot answer any coarser level
+    legacy = [{k: v for k, v in r.items() if k != "parent_asin"} for r in SKU_ROWS]
+    for to in ("PARENT", "CHILD", "ASIN"):
+        assert rollup_rows(legacy, from_granularity="SKU", to_granularity=to) is None
+    one_missing = [*SKU_ROWS[:2], {**SKU_ROWS[2], "parent_asin": None}]
+    assert rollup_rows(one_missing, from_granularity="SKU", to_granularity="CHILD") is None
+
+
+def test_asin_request_is_answered_from_cached_sku_entry(monkeypatch, tmp_path):
+    db = tmp_path / "c.sqlite"
+    d = date(2026, 1, 10)
+    put_cached_parsed(
+        db,
+        key=CacheKey(
+            report_type=sales_traffic_units.REPORT_TYPE,
+            marketplace_id="ATVPDKIKX0DER",
+            data_start_date=d.isoformat(),
+            data_end_date=d.isoformat(),
+            report_options_json=json.dumps(
+                {"asinGranularity": "SKU", "dateGranularity": "DAY"}, separators=(",", ":"), sort_keys=True
+            ),
+        ),
+        parsed_obj={"rows": SKU_ROWS},
+    )
+
+    def _no_api():
+        pytest.fail("should not create a new report")
+
+    monkeypatch.setattr(sales_traffic_units, "_build_reports_client", _no_api)
+
+    df = sales_traffic_units.get_units_rows_cached(
+        start_date=d, end_date=d, marketplace_id="ATVPDKIKX0DER", db_path=db
+    )
+    assert df.set_index("childAsin")["Units"].to_dict() == {"C1": 5.0, "C2": 4.0}
+    assert {"parentAsin", "childAsin", "sku", "Units"} <= set(df.columns)
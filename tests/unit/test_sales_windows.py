@@ -0,0 +1,55 @@
+from datetime import date
+
+import pandas as pd
+
+from weekly_summary.transform import sales_windows
+from weekly_summary.transform.sales_windows import WINDOW_COLS, compute_sku_sales_windows
+
+
+def _fake_rows(**kwargs):
+    # 1 Day window only has a LOC sale; every other window has one base sale
+    if kwargs["start_date"] == kwargs["end_date"]:
+        return pd.DataFrame(
+            {"child_asin": ["B001"], "amazon_sku": ["amz-1-LOC"], "Units": [2.0]}
+        )
+    return pd.DataFrame(
+        {
+            "child_asin": ["B001", "B001", "B999"],
+            "amazon_sku": ["amz-1", "amz-1", "unmapped"],
+            "Units": [3.0, 1.0, 50.0],
+        }
+    )
+
+
+def test_windows_are_pivoted_per_sku_and_loc_rows_stay_separate(monkeypatch):
+    monkeypatch.setattr(sales_windows, "get_sales_traffic_rows_cached", _fake_rows)
+    mapping = pd.DataFrame({"ASIN": ["B001"], "SKU": ["SKU-1"]})
+
+    out = compute_sku_sales_windows(end_date=date(2026, 2, 25), asin_sku_map=mapping)
+
+    assert out[["sku", "asin"]].values.tolist() == [["SKU-1", "B001"], ["SKU-1-LOC", "B001-loc"]]
+    assert list(out.columns) == ["sku", "asin"] + WINDOW_COLS + ["4 Week Avg", "3 Month Avg"]
+
+    base = out.iloc[0]
+    assert base["1 Day"] == 0
+    assert base["7 Days"] == 4
+    assert base["57-84"] == 4
+    assert base["4 Week Avg"] == 4.0
+
+    loc = out.iloc[1]
+    assert loc["1 Day"] == 2
+    assert loc["7 Days"] == 0
+
+
+def test_empty_reports_give_all_window_columns(monkeypatch):
+    monkeypatch.setattr(
+        sales_windows,
+        "get_sales_traffic_rows_cached",
+        lambda **_: pd.DataFrame(columns=["child_asin", "amazon_sku", "Units"]),
+    )
+    out = compute_sku_sales_windows(
+        end_date=date(2026, 2, 25),
+        asin_sku_map=pd.DataFrame({"ASIN": ["B001"], "SKU": ["SKU-1"]}),
+    )
+    assert out.empty
+    assert all(c in out.columns for c in WINDOW_COLS + ["4 Week Avg", "3 Month Avg"])
@@ -0,0 +1,142 @@
+from datetime import date, timedelta
+
+import pandas as pd
+
+from weekly_summary.transform import sales_windows
+from weekly_summary.transform import sales_windows_incremental as inc
+from weekly_summary.transform.sales_windows import WINDOW_COLS
+
+MAPPING = pd.DataFrame(
+    {"ASIN": ["B001", "B002", "B003", "B004"], "SKU": ["SKU-1", "SKU-2", "SKU-3", "SKU-4"]}
+)
+D0 = date(2026, 2, 20)
+
+
+class FakeReports:
+    """Range report = sum of deterministic one-day rows; records every call and cached day."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[date, date]] = []
+        self.cached: set[date] = set()
+        self.revised: dict[date, float] = {}  # day -> B001 units reported after a late revision
+
+    def _day(self, d: date) -> list[dict]:
+        if d in self.revised:
+            return [{"child_asin": "B001", "amazon_sku": "a1", "Units": self.revised[d]}]
+        n = d.toordinal()
+        rows = [{"child_asin": "B001", "amazon_sku": "a1", "Units": float(n % 5)}]
+        if n % 3 == 0:
+            rows.append({"child_asin": "B002", "amazon_sku": "a2-LOC", "Units": float(n % 7)})
+        if d < D0 - timedelta(days=70):  # discontinued: rolls out of the span while sliding
+            rows.append({"child_asin": "B003", "amazon_sku": "a3", "Units": 2.0})
+        if n % 10 == 0:  # traffic but no orders: a row with zero units
+            rows.append({"child_asin": "B004", "amazon_sku": "a4", "Units": 0.0})
+        return rows
+
+    def __call__(self, *, start_date, end_date, **_):
+        self.calls.append((start_date, end_date))
+        if start_date == end_date:
+            self.cached.add(start_date)
+        rows = []
+        d = start_date
+        while d <= end_date:
+            rows.extend(self._day(d))
+            d += timedelta(days=1)
+        df = pd.DataFrame(rows, columns=["child_asin", "amazon_sku", "Units"])
+        return df.groupby(["child_asin", "amazon_sku"], as_index=False)["Units"].sum()
+
+    def is_cached(self, *, start_date, end_date, **_):
+        return start_date == end_date and start_date in self.cached
+
+
+def _run(monkeypatch, fake, db_path, end_date, mapping=MAPPING, **kwargs):
+    monkeypatch.setattr(inc, "get_sales_traffic_rows_cached", fake)
+    monkeypatch.setattr(inc, "has_settled_rows_cached", fake.is_cached)
+    kwargs.setdefault("max_seed_pulls", 100)
+    return inc.compute_sku_sales_windows_incremental(
+        end_date=end_date, asin_sku_map=mapping, db_path=db_path, **kwargs
+    )
+
+
+def _full(monkeypatch, fake, end_date):
+    monkeypatch.setattr(sales_windows, "get_sales_traffic_rows_cached", fake)
+    return sales_windows.compute_sku_sales_windows(end_date=end_date, asin_sku_map=MAPPING)
+
+
+def test_incremental_matches_full_computation_over_sliding_days(monkeypatch, tmp_path):
+    fake = FakeReports()
+    db = tmp_path / "a.sqlite"
+    first = _run(monkeypatch, fake, db, D0)
+    pd.testing.assert_frame_equal(first, _full(monkeypatch, FakeReports(), D0), check_dtype=False)
+    assert {"SKU-3", "SKU-4"} <= set(first["sku"])
+
+    for offset in [*range(1, 16), 20]:
+        end = D0 + timedelta(days=offset)
+        fake.calls.clear()
+        sliding = _run(monkeypatch, fake, db, end)
+        assert all(start == stop for start, stop in fake.calls)
+        pd.testing.assert_frame_equal(sliding, _full(monkeypatch, FakeReports(), end), check_dtype=False)
+
+    assert "SKU-3" not in set(sliding["sku"])  # its last day left the 84-day span
+
+
+def test_cold_start_uses_range_reports_until_the_day_cache_is_warm(monkeypatch, tmp_path):
+    fake = FakeReports()
+    db = tmp_path / "a.sqlite"
+
+    for _ in range(2):  # 84 uncached days, 40 pulled per run
+        fake.calls.clear()
+        out = _run(monkeypatch, fake, db, D0, max_seed_pulls=40)
+        assert len(fake.calls) == 40 + len(WINDOW_COLS)
+        pd.testing.assert_frame_equal(out, _full(monkeypatch, FakeReports(), D0), check_dtype=False)
+    assert len(fake.cached) == 80
+
+    fake.calls.clear()
+    out = _run(monkeypatch, fake, db, D0, max_seed_pulls=40)
+    assert all(start == stop for start, stop in fake.calls)
+    pd.testing.assert_frame_equal(out, _full(monkeypatch, FakeReports(), D0), check_dtype=False)
+
+
+def test_mapping_change_reseeds_from_cached_days(monkeypatch, tmp_path):
+    fake = FakeReports()
+    _run(monkeypatch, fake, tmp_path / "a.sqlite", D0)
+
+    fake.calls.clear()
+    new_mapping = pd.DataFrame({"ASIN": ["B001"], "SKU": ["SKU-1-NEW"]})
+    out = _run(monkeypatch, fake, tmp_path / "a.sqlite", D0 + timedelta(days=1), new_mapping)
+
+    # Every day of the new span is re-read (from the day cache), none as a range report
+    assert {start for start, _ in fake.calls} == {D0 + timedelta(days=1 - i) for i in range(84)}
+    assert all(start == stop for start, stop in fake.calls)
+    assert out["sku"].tolist() == ["SKU-1-NEW"]
+
+
+def test_day_revised_after_entering_window_is_picked_up(monkeypatch, tmp_path):
+    fake = FakeReports()
+    # D0 is yesterday: still unsettled, so it must not be folded into the state
+    _run(monkeypatch, fake, tmp_path / "a.sqlite", D0, today=D0 + timedelta(days=1))
+
+    fake.revised[D0] = 40.0
+    for offset in (1, 2, 3):
+        end = D0 + timedelta(days=offset)
+        sliding = _run(monkeypatch, fake, tmp_path / "a.sqlite", end, today=end + timedelta(days=1))
+        pd.testing.assert_frame_equal(sliding, _full(monkeypatch, fake, end), check_dtype=False)
+
+
+def test_same_end_date_rereads_unsettled_tail_and_reuse_cache_false_keeps_settled_state(
+    monkeypatch, tmp_path
+):
+    fake = FakeReports()
+    kwargs = {"today": D0 + timedelta(days=1)}
+    _run(monkeypatch, fake, tmp_path / "a.sqlite", D0, **kwargs)
+
+    fake.revised[D0] = 40.0
+    fake.calls.clear()
+    again = _run(monkeypatch, fake, tmp_path / "a.sqlite", D0, **kwargs)
+    assert again.loc[again["sku"] == "SKU-1", "1 Day"].item() == 40
+    assert all(start == end for start, end in fake.calls)
+
+    # Settled days are final: reuse_cache=False only re-reads the unsettled tail
+    fake.calls.clear()
+    _run(monkeypatch, fake, tmp_path / "a.sqlite", D0, reuse_cache=False, **kwargs)
+    assert sorted(start for start, _ in fake.calls) == [D0 - timedelta(days=1), D0]
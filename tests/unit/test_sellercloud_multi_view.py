@@ -0,0 +1,47 @@
+import threading
+
+import pandas as pd
+import pytest
+
+import weekly_summary.extract.sellercloud.multi_view as mv
+
+
+def test_parse_view_specs():
+    specs = mv.parse_view_specs("190-welles inventory=187@142; overflow=201 ;")
+
+    assert specs == [
+        mv.SellerCloudViewSpec(column="190-welles inventory", view_id=187, warehouse_id="142"),
+        mv.SellerCloudViewSpec(column="overflow", view_id=201),
+    ]
+    with pytest.raises(ValueError):
+        mv.parse_view_specs("a=1;a=2")
+    with pytest.raises(ValueError):
+        mv.parse_view_specs("a=abc")
+
+
+def test_views_are_pulled_concurrently_and_joined_on_sku(monkeypatch):
+    views = {
+        187: pd.DataFrame({"SKU": ["A", "B"], "Welles190Qty": [5, 2]}),
+        201: pd.DataFrame({"SKU": ["B ", "C"], "Welles190Qty": [7, 1]}),
+    }
+    # Each pull waits for the other; a sequential implementation would time out here
+    barrier = threading.Barrier(len(views), timeout=5)
+
+    def fake_cached(server_id, username, password, view_id, warehouse_id, db_path):
+        barrier.wait()
+        df = views[view_id].copy()
+        df.attrs["sellercloud_cache"] = {"from_cache": False, "view_id": view_id}
+        return df
+
+    monkeypatch.setattr(mv, "pull_view_inventory_cached", fake_cached)
+    specs = mv.parse_view_specs("welles=187@142;overflow=201@150")
+
+    out = mv.pull_views_wide("srv", "u", "p", specs=specs)
+
+    assert list(out.columns) == ["sku", "welles", "overflow"]
+    assert out.set_index("sku").to_dict("index") == {
+        "A": {"welles": 5.0, "overflow": 0.0},
+        "B": {"welles": 2.0, "overflow": 7.0},
+        "C": {"welles": 0.0, "overflow": 1.0},
+    }
+    assert out.attrs["sellercloud_cache"]["overflow"]["view_id"] == 201
@@ -0,0 +1,95 @@
+import threading
+
+import pytest
+import requests
+
+import weekly_summary.extract.sellercloud.pull_inventory_by_view as pv
+
+
+class FakeResponse:
+    def __init__(self, data, status=200):
+        self._data = data
+        self.status_code = status
+        self.headers = {"Retry-After": "0"}
+
+    def json(self):
+        return self._data
+
+
+class FakeClient:
+    def __init__(self, n_items, *, page_size, with_total=True, rate_limit_pages=()):
+        self.items = [{"ShadowOf": f"SKU-{i:04d}", "InventoryAvailableQty": i + 1} for i in range(n_items)]
+        self.page_size = page_size
+        self.with_total = with_total
+        self.rate_limit_pages = set(rate_limit_pages)
+        self.requested = []
+        self._lock = threading.Lock()
+
+    def get(self, endpoint, params):
+        page = params["pageNumber"]
+        with self._lock:
+            self.requested.append(page)
+            if page in self.rate_limit_pages:
+                self.rate_limit_pages.discard(page)
+                raise requests.HTTPError(response=FakeResponse({}, status=429))
+        start = (page - 1) * self.page_size
+        data = {"Items": self.items[start : start + self.page_size]}
+        if self.with_total:
+            data["TotalResults"] = len(self.items)
+        return FakeResponse(data)
+
+
+@pytest.mark.parametrize("with_total", [True, False])
+def test_pages_reassembled_in_order_without_empty_terminator(with_total):
+    client = FakeClient(120, page_size=50, with_total=with_total)
+
+    acc = pv._reduce_view(client, view_id=187, page_size=50, max_workers=4)
+
+    assert acc.skus == [f"SKU-{i:04d}" for i in range(120)]
+    assert list(acc.qtys) == list(range(1, 121))
+    assert sorted(client.requested) == [1, 2, 3]
+
+
+def test_rate_limited_page_is_retried():
+    client = FakeClient(200, page_size=50, rate_limit_pages={3})
+
+    acc = pv._reduce_view(client, view_id=187, page_size=50, max_workers=3)
+
+    assert acc.items == 200
+    assert client.requested.count(3) == 2
+
+
+def test_first_positive_occurrence_wins_across_pages():
+    client = FakeClient(0, page_size=2)
+    client.items = [
+        {"ShadowOf": "B", "InventoryAvailableQty": 0},
+        {"ShadowOf": "A", "InventoryAvailableQty": 4},
+        {"ManufacturerSKU": " B ", "InventoryAvailableQty": 3},
+        {"ShadowOf": "A", "InventoryAvailableQty": 9},
+        {"ShadowOf": "", "InventoryAvailableQty": 2},
+    ]
+
+    acc = pv._reduce_view(client, view_id=187, page_size=2, max_workers=2)
+    df = acc.to_frame()
+
+    assert df.to_dict("records") == [{"SKU": "A", "Welles190Qty": 4}, {"SKU": "B", "Welles190Qty": 3}]
+    assert (acc.duplicates, acc.zero_qty, acc.empty_sku) == (1, 1, 1)
+
+
+def test_paging_client_leaves_429_to_the_shared_backoff():
+    from weekly_summary.extract.sellercloud.sellercloud_client import SellerCloudClient
+
+    client = SellerCloudClient("srv", "u", "p", token_cache_path=None, retry_rate_limited=False)
+    retry = client.session.get_adapter("https://").max_retries
+
+    assert not retry.is_retry("GET", 429, has_retry_after=True)
+    assert retry.is_retry("GET", 503)
+
+
+def test_retry_after_header_sets_the_shared_pause():
+    response = FakeResponse({}, status=429)
+    response.headers = {"Retry-After": "7"}
+    assert pv._retry_after_seconds(requests.HTTPError(response=response), attempt=1) == 7.0
+
+    response.headers = {}
+    assert pv._retry_after_seconds(requests.HTTPError(response=response), attempt=3) == 8.0
@@ -0,0 +1,87 @@
+from pathlib import Path
+
+import pandas as pd
+
+import weekly_summary.extract.sellercloud.inventory_sync as sync
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class FakeClient:
+    """Serves the whole saved view on every request."""
+
+    server_id = "srv"
+
+    def __init__(self, items):
+        self.items = items
+        self.requests = []
+
+    def get(self, endpoint, params):
+        self.requests.append(dict(params))
+        return FakeResponse({"Items": self.items, "TotalResults": len(self.items)})
+
+
+def _item(sku, qty):
+    return {"ShadowOf": sku, "InventoryAvailableQty": qty}
+
+
+def _snapshot(db):
+    df = sync.load_snapshot(db, server_id="srv", view_id=187)
+    return dict(zip(df["SKU"], df["Welles190Qty"]))
+
+
+def test_sync_replaces_the_snapshot_with_the_whole_view(tmp_path: Path):
+    db = tmp_path / "sc.sqlite"
+    client = FakeClient([_item("A", 5), _item("B", 2), _item("C", 1)])
+
+    first = sync.sync_view_inventory(client, db_path=db)
+    assert (first.items_fetched, first.snapshot_rows, first.removed) == (3, 3, 0)
+    assert _snapshot(db) == {"A": 5, "B": 2, "C": 1}
+    assert sync.get_sync_state(db, server_id="srv", view_id=187) is not None
+
+    # B dropped to zero and left the view, C moved out of it: neither stays stale
+    client.items = [_item("A", 7), _item("B", 0), _item("D", 3)]
+    client.requests.clear()
+    second = sync.sync_view_inventory(client, db_path=db)
+
+    assert client.requests == [{"viewID": 187, "pageNumber": 1, "pageSize": 50}]
+    assert (second.snapshot_rows, second.removed) == (2, 2)
+    assert _snapshot(db) == {"A": 7, "D": 3}
+
+
+def test_snapshot_keeps_the_first_positive_row_per_sku(tmp_path: Path):
+    db = tmp_path / "sc.sqlite"
+    sync.sync_view_inventory(FakeClient([_item("A", 0), _item("A", 5), _item("A", 8)]), db_path=db)
+    assert _snapshot(db) == {"A": 5}
+
+
+def test_cached_pull_serves_repeat_runs_without_syncing(tmp_path: Path, monkeypatch):
+    db = tmp_path / "sc.sqlite"
+    calls = []
+
+    def fake_synced(server_id, username, password, view_id, db_path):
+        calls.append(view_id)
+        return pd.DataFrame({"SKU": ["A", "B"], "Welles190Qty": [5, 2]})
+
+    monkeypatch.setattr(sync, "pull_view_inventory_synced", fake_synced)
+    monkeypatch.delenv("SELLERCLOUD_FORCE_REFRESH", raising=False)
+
+    first = sync.pull_view_inventory_cached("srv", "u", "p", db_path=db, ttl_minutes=10)
+    second = sync.pull_view_inventory_cached("srv", "u", "p", db_path=db, ttl_minutes=10)
+
+    assert calls == [187]
+    assert first.attrs["sellercloud_cache"]["from_cache"] is False
+    assert second.attrs["sellercloud_cache"]["from_cache"] is True
+    assert second.attrs["sellercloud_cache"]["fetched_at_utc"] == first.attrs["sellercloud_cache"]["fetched_at_utc"]
+    pd.testing.assert_frame_equal(first, second)
+
+    sync.pull_view_inventory_cached("srv", "u", "p", db_path=db, ttl_minutes=10, force_refresh=True)
+    sync.pull_view_inventory_cached("srv", "u", "p", db_path=db, ttl_minutes=0)
+    sync.pull_view_inventory_cached("srv", "u", "p", view_id=188, db_path=db, ttl_minutes=10)
+    assert calls == [187, 187, 187, 188]
@@ -0,0 +1,142 @@
+import json
+import os
+import stat
+import sys
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+from weekly_summary.extract.sellercloud.sellercloud_client import SellerCloudClient
+from weekly_summary.extract.sellercloud.token_cache import (
+    CachedToken,
+    file_lock,
+    read_token,
+    token_cache_key,
+    write_token,
+)
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, data=None):
+        self.status_code = status_code
+        self._data = data or {}
+        self.content = json.dumps(self._data).encode()
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}", response=self)
+
+
+class FakeSession:
+    """/token hands out tok-1, tok-2, ...; API calls 401 once for each token in `reject`."""
+
+    def __init__(self, expires_in=3600, reject=()):
+        self.expires_in = expires_in
+        self.reject = set(reject)
+        self.token_calls = 0
+        self.api_calls = []
+
+    def post(self, url, json, timeout, verify):
+        self.token_calls += 1
+        return FakeResponse(data={"access_token": f"tok-{self.token_calls}", "expires_in": self.expires_in})
+
+    def request(self, method, url, headers, **kwargs):
+        token = headers["Authorization"].split()[-1]
+        self.api_calls.append(token)
+        if token in self.reject:
+            return FakeResponse(status_code=401)
+        return FakeResponse(data={"ok": True})
+
+
+def _client(cache: Path, session: FakeSession) -> SellerCloudClient:
+    c = SellerCloudClient("srv", "user", "pw", token_cache_path=cache)
+    c.session = session
+    return c
+
+
+def test_token_shared_through_disk_cache(tmp_path: Path):
+    cache = tmp_path / "token.json"
+    session = FakeSession()
+
+    _client(cache, session).get("Inventory/GetAllByView")
+    _client(cache, session).get("Inventory/GetAllByView")
+
+    assert session.token_calls == 1
+    assert session.api_calls == ["tok-1", "tok-1"]
+    cached = read_token(cache, token_cache_key("srv", "user"))
+    assert cached is not None and cached.access_token == "tok-1"
+    assert cached.expires_at > time.time() + 3000
+
+
+def test_refresh_ahead_of_expiry(tmp_path: Path):
+    session = FakeSession(expires_in=200)  # inside the default 300s refresh margin
+    client = _client(tmp_path / "token.json", session)
+
+    client.get("a")
+    client.get("b")
+
+    assert session.token_calls == 2
+
+
+def test_401_refreshes_and_retries_once(tmp_path: Path):
+    cache = tmp_path / "token.json"
+    session = FakeSession(reject={"tok-1"})
+    client = _client(cache, session)
+
+    resp = client.get("Inventory/GetAllByView")
+
+    assert resp.status_code == 200
+    assert session.api_calls == ["tok-1", "tok-2"]
+    assert read_token(cache, token_cache_key("srv", "user")).access_token == "tok-2"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX file modes")
+def test_token_file_is_owner_only(tmp_path: Path):
+    path = tmp_path / "token.json"
+    old_umask = os.umask(0o022)
+    try:
+        write_token(path, "k", CachedToken(access_token="t", expires_at=time.time() + 60))
+    finally:
+        os.umask(old_umask)
+
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+
+def test_lock_waits_for_holder_and_is_freed_when_it_dies(tmp_path: Path):
+    import subprocess
+
+    cache = tmp_path / "token.json"
+    holder = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "import sys, time\n"
+            "from pathlib import Path\n"
+            "from weekly_summary.extract.sellercloud.token_cache import file_lock\n"
+            "with file_lock(Path(sys.argv[1])):\n"
+            "    print('locked', flush=True)\n"
+            "    time.sleep(60)\n",
+            str(cache),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    )
+    try:
+        assert holder.stdout.readline().strip() == "locked"
+        with pytest.raises(TimeoutError):
+            with file_lock(cache, timeout_s=0.2):
+                pass
+    finally:
+        holder.kill()  # no cleanup runs: the OS drops the lock
+        holder.wait()
+
+    start = time.monotonic()
+    with file_lock(cache, timeout_s=5):
+        pass
+    assert time.monotonic() - start < 1
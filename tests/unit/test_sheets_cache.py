@@ -0,0 +1,106 @@
+from pathlib import Path
+
+import pandas as pd
+
+import weekly_summary.helpers.asin_sku_mapping as m
+from weekly_summary.extract.google_sheets import SheetRange
+from weekly_summary.transform.gross_net_clean import clean_gross_net_df
+from weekly_summary.transform.gross_net_select import select_gross_net_mapping
+from weekly_summary.transform.gsheets_to_df import values_to_dataframe
+
+RANGE = SheetRange("sheet-1", "AMZ US!A1:P")
+VALUES = [["SKU", "ASIN", "Mini SKU", "Selling Price"], [" A ", "X1", "mA", "$10.00"], ["B", "Y1", "mB", "5"]]
+
+
+def _patch(monkeypatch, *, mtime, values):
+    state = {"mtime": mtime, "values": values, "reads": 0, "parses": 0}
+
+    def fake_read(ranges, service=None):
+        state["reads"] += 1
+        return {r: state["values"] for r in ranges}
+
+    def parse(vals):
+        state["parses"] += 1
+        return m.asin_sku_mapping_from_values(vals)
+
+    monkeypatch.setattr(m, "get_spreadsheet_modified_time", lambda sid: state["mtime"])
+    monkeypatch.setattr(m, "read_sheet_ranges", fake_read)
+    return state, {RANGE: ("asin_sku", parse)}
+
+
+def test_unchanged_spreadsheet_is_served_without_download(tmp_path: Path, monkeypatch):
+    db = tmp_path / "gs.sqlite"
+    state, parsers = _patch(monkeypatch, mtime="2026-01-01T00:00:00Z", values=VALUES)
+
+    first = m.load_parsed_ranges(parsers, db_path=db)[RANGE]
+    second = m.load_parsed_ranges(parsers, db_path=db)[RANGE]
+
+    assert (state["reads"], state["parses"]) == (1, 1)
+    pd.testing.assert_frame_equal(first, second)
+    assert second.to_dict("records") == [{"ASIN": "X1", "SKU": "A"}, {"ASIN": "Y1", "SKU": "B"}]
+
+
+def test_touched_but_identical_sheet_is_downloaded_not_reparsed(tmp_path: Path, monkeypatch):
+    db = tmp_path / "gs.sqlite"
+    state, parsers = _patch(monkeypatch, mtime="t1", values=VALUES)
+    m.load_parsed_ranges(parsers, db_path=db)
+
+    state["mtime"] = "t2"
+    m.load_parsed_ranges(parsers, db_path=db)
+    assert (state["reads"], state["parses"]) == (2, 1)
+
+    state["mtime"] = "t3"
+    state["values"] = VALUES + [["C", "Z1", "mC", "1"]]
+    out = m.load_parsed_ranges(parsers, db_path=db)[RANGE]
+    assert (state["reads"], state["parses"]) == (3, 2)
+    assert list(out["SKU"]) == ["A", "B", "C"]
+
+
+def test_parser_version_bump_reparses_unchanged_sheet(tmp_path: Path, monkeypatch):
+    db = tmp_path / "gs.sqlite"
+    state, parsers = _patch(monkeypatch, mtime="t1", values=VALUES)
+    m.load_parsed_ranges(parsers, db_path=db)
+
+    monkeypatch.setitem(m.PARSER_VERSIONS, "asin_sku", "test-next")
+    m.load_parsed_ranges(parsers, db_path=db)
+    m.load_parsed_ranges(parsers, db_path=db)
+
+    assert (state["reads"], state["parses"]) == (2, 2)
+
+
+def test_without_modified_time_falls_back_to_content_hash(tmp_path: Path, monkeypatch):
+    db = tmp_path / "gs.sqlite"
+    state, parsers = _patch(monkeypatch, mtime=None, values=VALUES)
+
+    m.load_parsed_ranges(parsers, db_path=db)
+    m.load_parsed_ranges(parsers, db_path=db)
+
+    assert (state["reads"], state["parses"]) == (2, 1)
+
+
+def test_cleaned_gross_net_frame_round_trips_through_cache(tmp_path: Path, monkeypatch):
+    db = tmp_path / "gs.sqlite"
+    values = [["SKU", "Selling Price"], ["A", "$10.00"], ["B", ""], ["A", "$3.00"]]
+    reads = []
+
+    def fake_projected(ranges, service=None, **kwargs):
+        reads.append(list(ranges))
+        return {r: values for r in ranges}
+
+    def parse(vals):
+        cols = ["SKU", "Selling Price"]
+        return select_gross_net_mapping(clean_gross_net_df(values_to_dataframe(vals), columns=cols), columns=cols)
+
+    monkeypatch.setattr(m, "get_spreadsheet_modified_time", lambda sid: "t1")
+    monkeypatch.setattr(m, "read_projected_ranges", fake_projected)
+    sheet_range = m.gross_net_projection(columns=("SKU", "Selling Price"))
+    parsers = {sheet_range: ("gross_net", parse)}
+
+    first = m.load_parsed_ranges(parsers, db_path=db)[sheet_range]
+    second = m.load_parsed_ranges(parsers, db_path=db)[sheet_range]
+
+    assert len(reads) == 1
+    pd.testing.assert_frame_equal(first, second)
+    assert str(second["Selling Price"].dtype) == "Float64"
+    assert second["SKU"].tolist() == ["A", "B"]
+    assert second["Selling Price"].isna().tolist() == [False, True]
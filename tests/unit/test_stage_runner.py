@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+
+from weekly_summary.stage_runner import Stage, run_stages
+
+
+def test_independent_stages_overlap_and_dependents_get_inputs():
+    started = threading.Barrier(3, timeout=2)  # only passes if all three sources run at once
+
+    def source(value):
+        def _fn():
+            started.wait()
+            time.sleep(0.05)
+            return value
+        return _fn
+
+    run = run_stages(
+        [
+            Stage("restock", source("r")),
+            Stage("mapping", source("m")),
+            Stage("sellercloud", source("s")),
+            Stage("sales", lambda mapping: mapping + "+sales", inputs=("mapping",)),
+        ]
+    )
+
+    assert run.results == {"restock": "r", "mapping": "m", "sellercloud": "s", "sales": "m+sales"}
+    assert run.order.index("sales") > run.order.index("mapping")
+    assert set(run.elapsed_s) == set(run.results)
+
+
+def test_dependent_starts_before_unrelated_slow_stage_finishes():
+    events = []
+
+    def slow():
+        time.sleep(0.2)
+        events.append("slow")
+
+    def fast():
+        events.append("fast")
+        return 1
+
+    run_stages(
+        [
+            Stage("slow", slow),
+            Stage("fast", fast),
+            Stage("after_fast", lambda _: events.append("after_fast"), inputs=("fast",)),
+        ]
+    )
+
+    assert events.index("after_fast") < events.index("slow")
+
+
+def test_failure_is_reraised_and_downstream_is_skipped():
+    ran = []
+
+    def boom():
+        raise RuntimeError("sheet unavailable")
+
+    with pytest.raises(RuntimeError, match="sheet unavailable"):
+        run_stages([Stage("mapping", boom), Stage("sales", lambda m: ran.append(m), inputs=("mapping",))])
+    assert ran == []
+
+
+@pytest.mark.parametrize(
+    "stages, message",
+    [
+        ([Stage("a", lambda: 1), Stage("a", lambda: 2)], "Duplicate"),
+        ([Stage("a", lambda x: x, inputs=("missing",))], "unknown"),
+        ([Stage("a", lambda b: b, inputs=("b",)), Stage("b", lambda a: a, inputs=("a",))], "cycle"),
+    ],
+)
+def test_invalid_graphs_are_rejected(stages, message):
+    with pytest.raises(ValueError, match=message):
+        run_stages(stages)
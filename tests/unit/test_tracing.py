@@ -0,0 +1,82 @@
+import json
+
+import httplib2
+import pytest
+from google.auth.credentials import AnonymousCredentials
+from sp_api.base.exceptions import SellingApiRequestThrottledException
+
+from weekly_summary import tracing
+from weekly_summary.extract.google_sheets import _trace_endpoint, _TracedHttp
+from weekly_summary.tracing import TracedClient, span, start_tracing, stop_tracing, summarize_trace
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    path = start_tracing(tmp_path / "trace.jsonl")
+    yield path
+    stop_tracing()
+
+
+def _spans(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_span_is_a_shared_no_op_when_tracing_is_off(tmp_path):
+    assert not tracing.tracing_enabled()
+    assert span("sellercloud", "a") is span("sheets", "b")
+    with span("sellercloud", "a") as sp:
+        sp.set_response(200, bytes=1)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_traced_client_records_calls_throttles_and_rate_limit_headers(trace_file):
+    class Response:
+        headers = {"x-amzn-RateLimit-Limit": "0.0167", "Content-Type": "application/json"}
+
+    class FakeReports:
+        def get_report(self, **kwargs):
+            return Response()
+
+        def create_report(self, **kwargs):
+            raise SellingApiRequestThrottledException([{"message": "slow down"}], headers={"x-amzn-RateLimit-Limit": "0.0167"})
+
+    reports = TracedClient("spapi", FakeReports())
+    reports.get_report(reportId="1")
+    with pytest.raises(SellingApiRequestThrottledException):
+        reports.create_report(reportType="X")
+
+    ok, throttled = _spans(trace_file)
+    assert ok["system"] == "spapi" and ok["endpoint"] == "get_report" and ok["status"] == 200
+    assert ok["rate_limit"] == {"x-amzn-ratelimit-limit": "0.0167"}
+    assert throttled["endpoint"] == "create_report" and throttled["status"] == 429
+    assert throttled["error"] == "SellingApiRequestThrottledException"
+    assert throttled["rate_limit"] == {"x-amzn-ratelimit-limit": "0.0167"}
+
+
+def test_sheets_http_spans_group_by_endpoint(trace_file):
+    class FakeHttp:
+        def request(self, uri, method="GET", **kwargs):
+            return httplib2.Response({"status": 200, "retry-after": "3"}), b'{"values": []}'
+
+    http = _TracedHttp(AnonymousCredentials(), http=FakeHttp())
+    http.request("https://sheets.googleapis.com/v4/spreadsheets/abc123/values:batchGet?ranges=A1", method="GET")
+    http.request("https://sheets.googleapis.com/v4/spreadsheets/zzz/values/AMZ%20US!A1:P10?alt=json")
+
+    first, second = _spans(trace_file)
+    assert first["endpoint"] == "/v4/spreadsheets/{id}/values:batchGet"
+    assert first["bytes"] == 14 and first["rate_limit"] == {"retry-after": "3"}
+    assert second["endpoint"] == "/v4/spreadsheets/{id}/values/{range}"
+    assert _trace_endpoint("https://www.googleapis.com/drive/v3/files/abc?fields=x") == "/drive/v3/files/{id}"
+
+
+def test_summary_percentiles_per_endpoint():
+    spans = [
+        {"system": "sellercloud", "endpoint": "Inventory/GetAllByView", "latency_ms": float(ms), "bytes": 10, "status": 200}
+        for ms in range(1, 101)
+    ]
+    spans.append({"system": "s3", "endpoint": "reportDocument", "latency_ms": 5.0, "bytes": 100, "status": 503})
+
+    slow, s3 = summarize_trace(spans)
+    assert (slow.count, slow.p50_ms, slow.p95_ms, slow.p99_ms, slow.max_ms) == (100, 50.5, 95.05, 99.01, 100.0)
+    assert slow.bytes == 1000 and slow.errors == 0
+    assert s3.errors == 1
@@ -0,0 +1,132 @@
+from datetime import date, timedelta
+
+from weekly_summary.cache.sqlite_cache import CacheKey, get_cache_status, get_cached_parsed, put_cached_parsed
+from weekly_summary.cache import ttl_policy
+from weekly_summary.extract.amazon import sales_traffic_by_window
+from weekly_summary.cache.ttl_policy import (
+    get_servable_parsed,
+    policy_for,
+    revision_stats,
+    suggest_settle_days,
+    ttl_seconds_for_range,
+)
+
+REPORT_TYPE = "GET_SALES_AND_TRAFFIC_REPORT"
+TODAY = date(2026, 3, 10)
+
+
+def _key(end: date) -> CacheKey:
+    return CacheKey(
+        report_type=REPORT_TYPE,
+        marketplace_id="ATVPDKIKX0DER",
+        data_start_date=end.isoformat(),
+        data_end_date=end.isoformat(),
+        report_options_json='{"asinGranularity":"SKU","dateGranularity":"DAY"}',
+    )
+
+
+def test_recent_days_are_rechecked_and_settled_days_never_expire():
+    settle = policy_for(REPORT_TYPE).settle_days
+    yesterday = TODAY - timedelta(days=1)
+
+    assert ttl_seconds_for_range(REPORT_TYPE, start_date=yesterday, end_date=yesterday, today=TODAY) == 6 * 3600
+    settled = TODAY - timedelta(days=settle)
+    assert ttl_seconds_for_range(REPORT_TYPE, start_date=settled, end_date=settled, today=TODAY) is None
+
+    # A window is only as settled as its last day
+    assert ttl_seconds_for_range(
+        REPORT_TYPE, start_date=TODAY - timedelta(days=60), end_date=yesterday, today=TODAY
+    ) is not None
+
+
+def test_expired_entry_pulled_after_settle_horizon_is_still_served(tmp_path):
+    db = tmp_path / "c.sqlite"
+    end = date(2026, 1, 1)
+    put_cached_parsed(
+        db,
+        key=_key(end),
+        parsed_obj={"rows": [{"Units": 1}]},
+        ttl_seconds=-1,
+        pulled_at_utc="2026-01-20T00:00:00+00:00",
+    )
+
+    assert get_cached_parsed(db, key=_key(end)) is None
+    assert get_cached_parsed(db, key=_key(end), final_after_days=3) == {"rows": [{"Units": 1}]}
+
+
+def test_repulls_are_logged_and_drive_settle_suggestion(tmp_path):
+    db = tmp_path / "c.sqlite"
+    today = date.today()
+
+    # age 1: value changes on every re-pull; age 4: value is stable
+    for i in range(5):
+        put_cached_parsed(db, key=_key(today - timedelta(days=1)), parsed_obj={"rows": [{"Units": i}]})
+        put_cached_parsed(db, key=_key(today - timedelta(days=4)), parsed_obj={"rows": [{"Units": 7}]})
+
+    stats = {s["age_days"]: s for s in revision_stats(db, report_type=REPORT_TYPE)}
+    assert stats[1]["checks"] == 4 and stats[1]["changes"] == 4
+    assert stats[4]["checks"] == 4 and stats[4]["changes"] == 0
+
+    assert suggest_settle_days(db, report_type=REPORT_TYPE, min_checks=4) == 4
+
+
+def test_settled_entries_are_served_without_reuse_cache_except_sampled_checks(tmp_path, monkeypatch):
+    db = tmp_path / "c.sqlite"
+    today = date.today()
+    settled, recent = _key(today - timedelta(days=30)), _key(today - timedelta(days=1))
+    put_cached_parsed(db, key=settled, parsed_obj={"rows": [{"Units": 1}]}, pulled_at_utc=f"{today}T00:00:00+00:00")
+    put_cached_parsed(
+        db, key=recent, parsed_obj={"rows": [{"Units": 2}]}, ttl_seconds=3600, pulled_at_utc=f"{today}T00:00:00+00:00"
+    )
+
+    monkeypatch.setattr(ttl_policy, "sampled_for_revision_check", lambda key, today=None: False)
+    assert get_servable_parsed(db, key=settled, reuse_cache=False) == {"rows": [{"Units": 1}]}
+    assert get_servable_parsed(db, key=recent, reuse_cache=False) is None
+    assert get_servable_parsed(db, key=recent, reuse_cache=True) == {"rows": [{"Units": 2}]}
+
+    monkeypatch.setattr(ttl_policy, "sampled_for_revision_check", lambda key, today=None: True)
+    assert get_servable_parsed(db, key=settled, reuse_cache=True) is None
+
+
+def test_revision_sampling_is_a_small_stable_fraction():
+    keys = [_key(TODAY - timedelta(days=d)) for d in range(10, 2010)]
+    picked = [ttl_policy.sampled_for_revision_check(k, today=TODAY) for k in keys]
+    assert picked == [ttl_policy.sampled_for_revision_check(k, today=TODAY) for k in keys]
+    assert 0 < sum(picked) < 0.05 * len(keys)
+
+
+def test_revision_log_compares_metric_values_not_the_stored_json(tmp_path):
+    db = tmp_path / "c.sqlite"
+    key = _key(date.today() - timedelta(days=5))
+    rows = [
+        {"child_asin": "B1", "amazon_sku": "s1", "Units": 3.0},
+        {"child_asin": "B2", "amazon_sku": "s2", "Units": 1.0},
+    ]
+
+    put_cached_parsed(db, key=key, parsed_obj={"rows": rows})
+    # Parser now also emits parent_asin, and rows come back in another order: not a revision
+    put_cached_parsed(db, key=key, parsed_obj={"rows": [{**r, "parent_asin": "P"} for r in reversed(rows)]})
+    put_cached_parsed(db, key=key, parsed_obj={"rows": [{**rows[0], "Units": 4.0}, rows[1]]})
+
+    (stats,) = revision_stats(db, report_type=REPORT_TYPE)
+    assert stats["checks"] == 2 and stats["changes"] == 1
+
+
+def test_failed_revision_check_keeps_the_settled_entry(tmp_path, monkeypatch):
+    db = tmp_path / "c.sqlite"
+    day = date.today() - timedelta(days=30)
+    rows = [{"child_asin": "B1", "amazon_sku": "s1", "Units": 3.0}]
+    pulled_at = f"{date.today()}T00:00:00+00:00"
+    put_cached_parsed(db, key=_key(day), parsed_obj={"rows": rows}, pulled_at_utc=pulled_at)
+
+    def _fail(*args, **kwargs):
+        raise RuntimeError("createReport failed")
+
+    monkeypatch.setattr(ttl_policy, "sampled_for_revision_check", lambda key, today=None: True)
+    monkeypatch.setattr(sales_traffic_by_window, "_build_reports_client", lambda: None)
+    monkeypatch.setattr(sales_traffic_by_window, "_create_report_with_backoff", _fail)
+
+    out = sales_traffic_by_window.get_sales_traffic_rows_cached(start_date=day, end_date=day, db_path=db)
+
+    assert out.to_dict(orient="records") == rows
+    assert get_cache_status(db, key=_key(day))["status"] == "OK"